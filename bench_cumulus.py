@@ -0,0 +1,604 @@
+#!/usr/bin/python3
+#
+# bench_cumulus.py
+#
+###############################################################################
+# Throughput and latency benchmarks for every create_update, get, and delete
+# function in cumulus_v05.py, run against fake_arm.py instead of a live
+# subscription.
+#
+# Every resource type is created, read back, and deleted at 1, 8, 64, and 256
+# concurrent workers. For each function and worker count the run reports
+# ops/sec, p50 and p99 latency, and the client-side overhead per call: the
+# mean latency less the time fake_arm spent answering. The one worker runs
+# also split the cost of a call between the wrapper, the SDK (serialization,
+# the msrest pipeline, and requests), the LRO poller, and the server.
+#
+# Transports:
+#     loopback  fake_arm answers in-process through a requests adapter, so
+#               the numbers are client-side cost only.
+#     http      requests go over local sockets to a FakeArmServer through a
+#               pooled cumulus_transport.Transport.
+#
+# Baselines:
+#     python3 bench_cumulus.py --save-baseline bench_baseline.json
+#     python3 bench_cumulus.py --baseline bench_baseline.json
+# The second run exits with status 1 and lists every result whose ops/sec
+# fell or whose p99 grew by more than --tolerance since the baseline.
+###############################################################################
+
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import sys
+import time
+from concurrent import futures
+from http import client as http_client
+from urllib import parse
+
+from azure.mgmt.network import models
+from azure.mgmt.resource.resources.models import ResourceGroup
+from msrestazure import azure_cloud
+from requests import adapters
+from requests import structures
+from requests.models import Response
+
+import cumulus_metrics
+import cumulus_polling
+import cumulus_tracing
+import cumulus_transport
+import cumulus_v05
+import fake_arm
+
+RESOURCE_GROUP = 'bench'
+LOCATION = 'eastus'
+_PREFIX = '/subscriptions/{}/resourceGroups/{}/providers/Microsoft.Network/' \
+    .format(fake_arm.DEFAULT_SUBSCRIPTION, RESOURCE_GROUP)
+
+
+def _prefix(i):
+    return '10.{}.{}.0/24'.format(i // 256 % 256, i % 256)
+
+
+# Parents the child resource types are created under, in creation order.
+_PARENTS = [
+    ('virtual_networks', ('bench-vnet',), models.VirtualNetwork(
+        location=LOCATION,
+        address_space=models.AddressSpace(address_prefixes=['10.0.0.0/8']))),
+    ('route_tables', ('bench-rt',), models.RouteTable(location=LOCATION)),
+    ('express_route_circuits', ('bench-erc',),
+     models.ExpressRouteCircuit(location=LOCATION)),
+]
+
+# Per resource type: the names of the parent resource and a function
+# building the parameters of the i-th resource.
+_SPECS = {
+    'resource_groups': (
+        None, lambda i: ResourceGroup(location=LOCATION)),
+    'virtual_networks': ((), lambda i: models.VirtualNetwork(
+        location=LOCATION,
+        address_space=models.AddressSpace(address_prefixes=[_prefix(i)]))),
+    'subnets': (('bench-vnet',), lambda i: models.Subnet(
+        address_prefix=_prefix(i),
+        route_table=models.RouteTable(id=_PREFIX + 'routeTables/bench-rt'))),
+    'route_tables': ((), lambda i: models.RouteTable(location=LOCATION)),
+    'routes': (('bench-rt',), lambda i: models.Route(
+        address_prefix=_prefix(i), next_hop_type='VirtualAppliance',
+        next_hop_ip_address='10.0.0.4')),
+    'virtual_network_peerings': (('bench-vnet',), lambda i:
+        models.VirtualNetworkPeering(
+            allow_virtual_network_access=True,
+            remote_virtual_network=models.SubResource(
+                id=_PREFIX + 'virtualNetworks/remote{}'.format(i)))),
+    'local_network_gateways': ((), lambda i: models.LocalNetworkGateway(
+        location=LOCATION, gateway_ip_address='192.0.2.{}'.format(i % 256),
+        local_network_address_space=models.AddressSpace(
+            address_prefixes=['172.16.0.0/16']))),
+    'public_ip_addresses': ((), lambda i: models.PublicIPAddress(
+        location=LOCATION, public_ip_allocation_method='Dynamic')),
+    'virtual_network_gateways': ((), lambda i: models.VirtualNetworkGateway(
+        location=LOCATION, gateway_type='Vpn', vpn_type='RouteBased',
+        ip_configurations=[models.VirtualNetworkGatewayIPConfiguration(
+            name='default',
+            subnet=models.SubResource(
+                id=_PREFIX + 'virtualNetworks/bench-vnet/subnets/'
+                             'GatewaySubnet'),
+            public_ip_address=models.SubResource(
+                id=_PREFIX + 'publicIPAddresses/gw{}'.format(i)))])),
+    'virtual_network_gateway_connections': ((), lambda i:
+        models.VirtualNetworkGatewayConnection(
+            location=LOCATION, connection_type='IPsec',
+            virtual_network_gateway1=models.VirtualNetworkGateway(
+                id=_PREFIX + 'virtualNetworkGateways/gw{}'.format(i)),
+            local_network_gateway2=models.LocalNetworkGateway(
+                id=_PREFIX + 'localNetworkGateways/lng{}'.format(i)))),
+    'network_interfaces': ((), lambda i: models.NetworkInterface(
+        location=LOCATION,
+        ip_configurations=[models.NetworkInterfaceIPConfiguration(
+            name='ipconfig1',
+            subnet=models.Subnet(
+                id=_PREFIX + 'virtualNetworks/bench-vnet/subnets/default'))])),
+    'network_security_groups': ((), lambda i: models.NetworkSecurityGroup(
+        location=LOCATION,
+        security_rules=[models.SecurityRule(
+            name='allow-https', protocol='Tcp', access='Allow',
+            direction='Inbound', priority=100, source_port_range='*',
+            destination_port_range='443', source_address_prefix='*',
+            destination_address_prefix='*')])),
+    'express_route_circuits': ((), lambda i: models.ExpressRouteCircuit(
+        location=LOCATION,
+        sku=models.ExpressRouteCircuitSku(
+            name='Standard_MeteredData', tier='Standard',
+            family='MeteredData'))),
+    'express_route_circuit_authorizations': (('bench-erc',), lambda i:
+        models.ExpressRouteCircuitAuthorization()),
+    'express_route_circuit_peerings': (('bench-erc',), lambda i:
+        models.ExpressRouteCircuitPeering(
+            peering_type='AzurePrivatePeering', peer_asn=65000 + i,
+            vlan_id=100 + i % 3900)),
+}
+
+
+class _LoopbackAdapter(adapters.BaseAdapter):
+    """
+    requests adapter that answers from a FakeArm in the same process.
+
+    :param arm: (FakeArm) – state to answer from.
+    """
+
+    def __init__(self, arm):
+        adapters.BaseAdapter.__init__(self)
+        self.arm = arm
+        self.max_retries = adapters.Retry(0, read=False)
+
+    def send(self, request, **kwargs):
+        url = parse.urlsplit(request.url)
+        body = request.body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        status, headers, out = self.arm.handle(
+            request.method,
+            url.path + ('?' + url.query if url.query else ''),
+            {k.lower(): v for k, v in request.headers.items()},
+            body
+        )
+        response = Response()
+        response.status_code = status
+        response.reason = http_client.responses.get(status, '')
+        response.headers = structures.CaseInsensitiveDict(headers)
+        response._content = b''
+        if out is not None:
+            response._content = json.dumps(out).encode('utf-8')
+            response.headers['Content-Type'] = \
+                'application/json; charset=utf-8'
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = datetime.timedelta(0)
+        return response
+
+    def close(self):
+        pass
+
+    def shutdown(self):
+        pass
+
+
+def wrappers():
+    """
+    Finds every create_update, get, and delete function in cumulus_v05.
+
+    :return: dict of resource type to {'create': f, 'get': f, 'delete': f}
+    :raises: ValueError if a resource type has no benchmark spec
+    """
+    found = {}
+    for name, value in sorted(vars(cumulus_v05).items()):
+        if not callable(value) or not name.startswith(
+                ('create_update_', 'get_', 'delete_')):
+            continue
+        resource_type = cumulus_v05._resource_type(value)
+        if resource_type not in cumulus_v05._RESOURCE_PATHS:
+            continue
+        kind = 'create' if name.startswith('create_') else name.split('_')[0]
+        found.setdefault(resource_type, {})[kind] = value
+    missing = sorted(set(found) - set(_SPECS))
+    if missing:
+        raise ValueError('No benchmark spec for ' + ', '.join(missing))
+    return found
+
+
+def percentile(latencies, p):
+    """
+    Nearest-rank percentile of a sorted list.
+    """
+    if not latencies:
+        return 0.0
+    return latencies[max(0, int(math.ceil(p / 100.0 * len(latencies))) - 1)]
+
+
+class Bench(object):
+    """
+    One fake ARM and the client handle that drives it.
+
+    :param transport: (str) – 'loopback' or 'http'.
+    :param lro_seconds: (float) – duration of each long running operation.
+    :param latency: (float) – seconds fake_arm adds to every response.
+    """
+
+    def __init__(self, transport, lro_seconds=0.0, latency=0.0):
+        options = dict(
+            lro_seconds=lro_seconds,
+            latency=latency,
+            read_limit=10 ** 9,
+            write_limit=10 ** 9,
+            parent_conflicts=False
+        )
+        self.server = None
+        self.transport = cumulus_transport.Transport(pool_maxsize=256)
+        if transport == 'http':
+            self.server = fake_arm.FakeArmServer(**options)
+            self.server.start()
+            self.arm = self.server.arm
+            base_url = self.server.base_url
+        else:
+            self.arm = fake_arm.FakeArm(**options)
+            base_url = self.arm.base_url = 'http://fake-arm.loopback'
+            self.transport.adapter = _LoopbackAdapter(self.arm)
+        self.client = cumulus_v05.ClientHandle(
+            fake_arm.FakeArmServer.credentials(),
+            fake_arm.DEFAULT_SUBSCRIPTION,
+            azure_cloud.Cloud(
+                'FakeArm',
+                endpoints=azure_cloud.CloudEndpoints(
+                    resource_manager=base_url)
+            ),
+            self.transport
+        )
+
+    def close(self):
+        self.transport.close()
+        if self.server is not None:
+            self.server.stop()
+
+    def setup(self):
+        """
+        Creates the resource group and the parents of the child types.
+        """
+        funcs = wrappers()
+        funcs['resource_groups']['create'](
+            RESOURCE_GROUP, ResourceGroup(location=LOCATION),
+            client=self.client)
+        for resource_type, names, parameters in _PARENTS:
+            funcs[resource_type]['create'](
+                RESOURCE_GROUP, *(names + (parameters,)), client=self.client)
+
+    @staticmethod
+    def names(resource_type, tag, i):
+        """
+        Positional name arguments of the i-th resource of a run.
+        """
+        parents = _SPECS[resource_type][0]
+        if parents is None:
+            return ('{}-{}-{}'.format(RESOURCE_GROUP, tag, i),)
+        return (RESOURCE_GROUP,) + parents + ('{}{}'.format(tag, i),)
+
+    def run(self, calls, workers):
+        """
+        Runs calls on a pool of workers and times each one.
+
+        :param calls: (list) – (function, args, kwargs) tuples.
+        :param workers: (int) – number of concurrent workers.
+        :return: dict of ops_per_sec, latencies (sorted, seconds), errors,
+            and server_seconds
+        """
+        def timed(call):
+            start = time.perf_counter()
+            result = call[0](*call[1], **call[2])
+            if hasattr(result, 'result'):
+                result.result()
+            # The wrappers log and swallow CloudError, returning None.
+            return time.perf_counter() - start, result is None
+
+        handled = self.arm.handle_seconds
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            start = time.perf_counter()
+            outcomes = list(executor.map(timed, calls))
+            wall = time.perf_counter() - start
+        return {
+            'ops_per_sec': len(calls) / wall if wall else 0.0,
+            'latencies': sorted(o[0] for o in outcomes),
+            'errors': sum(1 for o in outcomes if o[1]),
+            'server_seconds': self.arm.handle_seconds - handled,
+        }
+
+    def bench_type(self, resource_type, funcs, count, workers):
+        """
+        Creates, reads, and deletes count resources of one type at each
+        worker count.
+
+        :return: list of result dicts
+        """
+        make = _SPECS[resource_type][1]
+        rows = []
+        for n in workers:
+            tag = 'w{}-'.format(n)
+            names = [self.names(resource_type, tag, i) for i in range(count)]
+            phases = [
+                ('create', [
+                    (funcs['create'], names[i] + (make(i),),
+                     {'client': self.client})
+                    for i in range(count)
+                ]),
+                ('get', [
+                    (funcs['get'], names[i], {'client': self.client})
+                    for i in range(count)
+                ]),
+                ('delete', [
+                    (funcs['delete'], names[i], {'client': self.client})
+                    for i in range(count)
+                ]),
+            ]
+            for kind, calls in phases:
+                run = self.run(calls, n)
+                rows.append(_row(funcs[kind].__name__, n, run))
+        return rows
+
+    def breakdown(self, resource_type, funcs, count):
+        """
+        Splits the per-call cost of a type's functions between the wrapper,
+        the SDK, the LRO poller, and the server.
+
+        Each resource is written three ways in turn, so drift over the run
+        hits all three alike: through the wrapper, through the SDK method
+        directly, and through the SDK method with raw=True, which sends the
+        initial request without starting a poller. Reads have no poller,
+        so their poller part is None.
+
+        :return: list of dicts with the median milliseconds of each part
+        """
+        if resource_type == 'resource_groups':
+            operations = self.client.resource.resource_groups
+        else:
+            operations = getattr(self.client.network, resource_type)
+        make = _SPECS[resource_type][1]
+        kinds = (
+            ('create', operations.create_or_update, True),
+            ('get', operations.get, False),
+            ('delete', operations.delete, False),
+        )
+
+        def timed(method, args, kwargs):
+            handled = self.arm.handle_seconds
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            if hasattr(result, 'result'):
+                result.result()
+            return time.perf_counter() - start, \
+                self.arm.handle_seconds - handled
+
+        rows = []
+        samples = {}
+        for kind, method, with_parameters in kinds:
+            samples[kind] = {'wrapper': [], 'sdk': [], 'raw': [],
+                             'server': []}
+            # The first 10 calls warm caches and are not counted.
+            for i in range(count + 10):
+                for label, tag in (('wrapper', 'b-'), ('sdk', 's-'),
+                                   ('raw', 'r-')):
+                    args = self.names(resource_type, tag, i)
+                    if with_parameters:
+                        args += (make(i),)
+                    if label == 'wrapper':
+                        call = (funcs[kind], args, {'client': self.client})
+                    elif label == 'sdk' or kind == 'get':
+                        call = (method, args, {})
+                    else:
+                        call = (method, args, {'raw': True})
+                    elapsed, server = timed(*call)
+                    if i >= 10:
+                        samples[kind][label].append(elapsed)
+                        if label == 'raw':
+                            samples[kind]['server'].append(server)
+
+        for kind, _, _ in kinds:
+            median = {label: _median(sorted(values))
+                      for label, values in samples[kind].items()}
+            poller = None
+            if kind != 'get':
+                poller = (median['sdk'] - median['raw']) * 1000
+            rows.append({
+                'operation': funcs[kind].__name__,
+                'wrapper_ms': (median['wrapper'] - median['sdk']) * 1000,
+                'poller_ms': poller,
+                'sdk_ms': (median['raw'] - median['server']) * 1000,
+                'server_ms': median['server'] * 1000,
+                'total_ms': median['wrapper'] * 1000,
+            })
+        return rows
+
+
+def _mean(run):
+    return sum(run['latencies']) / len(run['latencies'])
+
+
+def _median(latencies):
+    return percentile(latencies, 50)
+
+
+def _row(operation, workers, run):
+    latencies = run['latencies']
+    return {
+        'operation': operation,
+        'workers': workers,
+        'calls': len(latencies),
+        'errors': run['errors'],
+        'ops_per_sec': run['ops_per_sec'],
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'overhead_ms':
+            (_mean(run) - run['server_seconds'] / len(latencies)) * 1000,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Lists the results that regressed against a baseline.
+
+    :param results: (dict) – key to result dict, as saved in baselines.
+    :param baseline: (dict) – the same for the baseline run.
+    :param tolerance: (float) – fraction ops/sec may fall and p99 may grow.
+    :return: list of messages
+    """
+    regressions = []
+    for key, result in sorted(results.items()):
+        base = baseline.get(key)
+        # Percentiles of different sample sizes are not comparable.
+        if base is None or base['calls'] != result['calls']:
+            continue
+        if result['ops_per_sec'] < base['ops_per_sec'] * (1 - tolerance):
+            regressions.append('{}: {:.0f} ops/sec, baseline {:.0f}'.format(
+                key, result['ops_per_sec'], base['ops_per_sec']))
+        if result['p99_ms'] > base['p99_ms'] * (1 + tolerance):
+            regressions.append('{}: p99 {:.2f} ms, baseline {:.2f} ms'.format(
+                key, result['p99_ms'], base['p99_ms']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the cumulus_v05 functions against fake_arm.')
+    parser.add_argument('--transport', default='loopback,http',
+                        help='comma separated: loopback, http')
+    parser.add_argument('--workers', default='1,8,64,256',
+                        help='comma separated worker counts')
+    parser.add_argument('--calls', type=int, default=256,
+                        help='calls per function and worker count')
+    parser.add_argument('--types', default=None,
+                        help='comma separated resource types, default all')
+    parser.add_argument('--lro-seconds', type=float, default=0.0)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--poll-loop', action='store_true',
+                        help='poll under a cap of 1000 status requests a '
+                        'second instead of 20')
+    parser.add_argument('--breakdown-calls', type=int, default=100,
+                        help='calls per part of the breakdown, 0 to skip')
+    parser.add_argument('--metrics', default=None,
+                        help='record cumulus_v05 metrics and write them to '
+                             'this file as JSON')
+    parser.add_argument('--trace', default=None,
+                        help='trace cumulus_v05 calls into this file')
+    parser.add_argument('--json', default=None,
+                        help='write every result to this file')
+    parser.add_argument('--baseline', default=None,
+                        help='compare against this baseline file')
+    parser.add_argument('--save-baseline', default=None,
+                        help='write the results to this baseline file')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    funcs = wrappers()
+    types = args.types.split(',') if args.types else sorted(funcs)
+    workers = [int(n) for n in args.workers.split(',')]
+    for policy_type in cumulus_polling.POLLING_PROFILES:
+        cumulus_polling.POLLING_PROFILES[policy_type] = \
+            cumulus_polling.PollingPolicy(0.05, 0.5)
+    cumulus_polling.DEFAULT_POLLING_POLICY = \
+        cumulus_polling.PollingPolicy(0.05, 0.5)
+    if args.poll_loop:
+        cumulus_v05.poll_loop = cumulus_polling.PollLoop(
+            max_polls_per_second=1000)
+    if args.metrics:
+        cumulus_v05.metrics = cumulus_metrics.Metrics()
+    if args.trace:
+        cumulus_v05.tracer = cumulus_tracing.Tracer(args.trace)
+
+    results = {}
+    breakdowns = {}
+    # Log what the functions do as usual, but to nowhere.
+    cumulus_v05.log_sink = cumulus_v05.LogSink(stream=open(os.devnull, 'w'))
+    for transport in args.transport.split(','):
+        bench = Bench(transport, args.lro_seconds, args.latency)
+        try:
+            bench.setup()
+            print('\n{} ({} calls per row)'.format(transport, args.calls))
+            print('{:<52} {:>7} {:>9} {:>8} {:>8} {:>9} {:>6}'.format(
+                'function', 'workers', 'ops/sec', 'p50 ms', 'p99 ms',
+                'client ms', 'errors'))
+            for resource_type in types:
+                rows = bench.bench_type(
+                    resource_type, funcs[resource_type], args.calls, workers)
+                for row in rows:
+                    print('{operation:<52} {workers:>7} {ops_per_sec:>9.0f} '
+                          '{p50_ms:>8.2f} {p99_ms:>8.2f} {overhead_ms:>9.2f} '
+                          '{errors:>6}'.format(**row))
+                    results['{} {} {}'.format(
+                        transport, row['operation'], row['workers'])] = row
+
+            if args.breakdown_calls:
+                print('\n{} per-call breakdown, median ms at 1 worker'.format(
+                    transport))
+                print('{:<52} {:>8} {:>8} {:>8} {:>8} {:>8}'.format(
+                    'function', 'wrapper', 'sdk', 'poller', 'server',
+                    'total'))
+                for resource_type in types:
+                    rows = bench.breakdown(
+                        resource_type, funcs[resource_type],
+                        args.breakdown_calls)
+                    for row in rows:
+                        poller = '-'
+                        if row['poller_ms'] is not None:
+                            poller = '{:.3f}'.format(row['poller_ms'])
+                        print('{operation:<52} {wrapper_ms:>8.3f} '
+                              '{sdk_ms:>8.3f} {poller:>8} '
+                              '{server_ms:>8.3f} {total_ms:>8.3f}'.format(
+                                  poller=poller, **row))
+                        breakdowns['{} {}'.format(
+                            transport, row['operation'])] = row
+        finally:
+            bench.close()
+    if cumulus_v05.poll_loop is not None:
+        cumulus_v05.poll_loop.stop()
+
+    meta = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'calls': args.calls,
+        'lro_seconds': args.lro_seconds,
+        'latency': args.latency,
+        'date': datetime.datetime.now().isoformat(),
+    }
+    if args.trace:
+        cumulus_v05.tracer.flush()
+    if args.metrics:
+        with open(args.metrics, 'w') as f:
+            f.write(cumulus_v05.metrics.to_json(indent=2))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'meta': meta, 'results': results,
+                       'breakdown': breakdowns}, f, indent=2, sort_keys=True)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2,
+                      sort_keys=True)
+        print('\nBaseline saved to ' + args.save_baseline)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], args.tolerance)
+        if regressions:
+            print('\n{} regressions against {}:'.format(
+                len(regressions), args.baseline))
+            for message in regressions:
+                print('  ' + message)
+            sys.exit(1)
+        print('\nNo regressions against ' + args.baseline)
+
+
+if __name__ == '__main__':
+    main()
+
+# END OF BENCH_CUMULUS.PY
@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+#
+# bench_import.py
+#
+###############################################################################
+# Cold start benchmark for cumulus_v05.py: how long a short-lived script
+# spends importing the module and building the management clients before
+# its first call.
+#
+# Every stage runs in a fresh interpreter, --runs times, after one run that
+# is discarded so the bytecode caches are written, and reports the median
+# and fastest time and the number of modules loaded:
+#     import           import cumulus_v05
+#     resource_client  ... and build the ResourceManagementClient
+#     network_client   ... and build the NetworkManagementClient too
+#
+# Comparing against an older copy of the module:
+#     git show HEAD~1:cumulus_v05.py > /tmp/old/cumulus_v05.py
+#     python3 bench_import.py --compare /tmp/old/cumulus_v05.py
+###############################################################################
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+_STAGES = (
+    ('import', ''),
+    ('resource_client', 'handle.resource'),
+    ('network_client', 'handle.resource\nhandle.network'),
+)
+
+_SCRIPT = '''
+import sys
+import time
+sys.path.insert(0, {directory!r})
+started = time.perf_counter()
+import {module}
+handle = {module}.ClientHandle(object(), 'subscription')
+{stage}
+elapsed = time.perf_counter() - started
+sys.stdout.write('{{}} {{}}'.format(elapsed, len(sys.modules)))
+'''
+
+
+def time_stage(path, stage, runs):
+    """
+    Times one stage in fresh interpreters.
+
+    :param path: (str) – cumulus_v05.py file to import.
+    :param stage: (str) – code to run after the import.
+    :param runs: (int) – number of interpreters to time.
+    :return: dict with the median and fastest seconds and modules loaded
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    script = _SCRIPT.format(
+        directory=directory, module=os.path.splitext(name)[0], stage=stage
+    )
+    times = []
+    modules = 0
+    for run in range(runs + 1):
+        output = subprocess.check_output([sys.executable, '-c', script])
+        elapsed, modules = output.decode('ascii').split()
+        if run:
+            times.append(float(elapsed))
+    times.sort()
+    return {
+        'median_ms': times[len(times) // 2] * 1000,
+        'min_ms': times[0] * 1000,
+        'modules': int(modules),
+    }
+
+
+def bench(path, runs):
+    """
+    Times every stage for one copy of the module.
+
+    :param path: (str) – cumulus_v05.py file to import.
+    :param runs: (int) – number of interpreters to time per stage.
+    :return: dict of stage name to result dict
+    """
+    return {name: time_stage(path, stage, runs) for name, stage in _STAGES}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the cold start of cumulus_v05.')
+    parser.add_argument('--module', default=os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'cumulus_v05.py'),
+                        help='cumulus_v05.py file to time')
+    parser.add_argument('--compare', default=None,
+                        help='another cumulus_v05.py to time the same way')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--json', default=None,
+                        help='write the results to this file')
+    args = parser.parse_args()
+
+    results = {'module': bench(args.module, args.runs)}
+    if args.compare:
+        results['compare'] = bench(args.compare, args.runs)
+
+    print('{} runs per stage, ms'.format(args.runs))
+    print('{:<16} {:>9} {:>9} {:>8}'.format(
+        'stage', 'median', 'min', 'modules'), end='')
+    print(' {:>9} {:>9} {:>8} {:>8}'.format(
+        'base med', 'base min', 'modules', 'speedup') if args.compare else '')
+    for name, _ in _STAGES:
+        row = results['module'][name]
+        print('{:<16} {median_ms:>9.1f} {min_ms:>9.1f} {modules:>8}'.format(
+            name, **row), end='')
+        if args.compare:
+            base = results['compare'][name]
+            print(' {median_ms:>9.1f} {min_ms:>9.1f} {modules:>8}'.format(
+                **base), end='')
+            print(' {:>7.2f}x'.format(base['median_ms'] / row['median_ms']),
+                  end='')
+        print()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
+
+# END OF BENCH_IMPORT.PY
\ No newline at end of file
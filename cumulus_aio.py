@@ -0,0 +1,2580 @@
+#!/usr/bin/python3
+#
+# cumulus_aio.py
+#
+###############################################################################
+# asyncio counterpart of cumulus_v05.py: one coroutine per create_update,
+# get, and delete function, with the same names, arguments, and results, for
+# services that run on an event loop.
+#
+# Requests are sent with aiohttp instead of msrest and requests, so a call
+# never holds a thread, and long running operations are polled with
+# asyncio.sleep on the same PollingPolicy schedule the blocking functions
+# use. The SDK clients of cumulus_v05 are still used, but only to build URLs
+# and to serialize and deserialize models; they send nothing.
+#
+# Every request of an AsyncClient waits on its semaphore, so however many
+# calls are started at once, at most max_requests are on the wire. Calls
+# that fail log the error and return None, like the blocking functions.
+#
+# The optional features of cumulus_v05 apply here too, through its
+# globals: requests take tokens from rate_limiter, calls are retried under
+# retry_policy and timed by metrics and traced by tracer, writes refresh
+# read_cache, and PUTs that would change nothing are skipped by
+# change_detector. Gets are always sent, never served from read_cache.
+#
+#     async with cumulus_aio.AsyncClient(handle, max_requests=256) as client:
+#         vnets = await asyncio.gather(*[
+#             cumulus_aio.get_virtual_networks('rg', name, client=client)
+#             for name in names
+#         ])
+#
+# Calls given no client share one per event loop, which asyncio.run closes
+# along with the loop.
+###############################################################################
+
+import asyncio
+import json
+import logging
+import time
+import weakref
+from urllib import parse
+
+import cumulus_polling
+import cumulus_tracing
+import cumulus_v05 as cumulus
+
+aiohttp = cumulus._LazyModule('aiohttp')
+
+# AsyncClient used by every coroutine that is not given one, if set.
+# Otherwise each event loop gets its own, created on first use for the
+# global clients of cumulus_v05 and closed when asyncio.run finishes.
+default_client = None
+_loop_clients = weakref.WeakKeyDictionary()
+
+_TERMINAL_STATES = ('succeeded', 'failed', 'canceled')
+
+
+def _authorization(credentials):
+    """
+    Reads the Authorization header msrest credentials sign requests with.
+    Blocking: the credentials may fetch a token.
+
+    :param credentials: msrestazure credentials object.
+    :return: str
+    """
+    session = credentials.signed_session()
+    try:
+        header = session.headers.get('Authorization')
+        if header is None:
+            # OAuth2Session adds the token when it sends, not to headers.
+            token = getattr(session, 'token', None) or credentials.token
+            header = '{} {}'.format(
+                token.get('token_type', 'Bearer'), token['access_token']
+            )
+        return header
+    finally:
+        session.close()
+
+
+def _cloud_error(response, message=None):
+    error = cumulus.azure_exceptions.CloudError(response, message)
+    error.request_id = response.headers.get('x-ms-request-id')
+    return error
+
+
+def _provisioning_state(response):
+    """
+    Reads the provisioning state from the resource in a response.
+
+    :param response: (requests.Response) – response to read.
+    :return: str, or None if the body has none
+    """
+    try:
+        body = json.loads(response.content.decode('utf-8'))
+    except ValueError:
+        return None
+    if not isinstance(body, dict):
+        return None
+    return body.get('properties', {}).get('provisioningState')
+
+
+class AsyncClient(object):
+    """
+    Sends the requests of the coroutines for one ClientHandle, or for the
+    global clients of cumulus_v05, over one aiohttp session.
+
+    Create and close it on the event loop that uses it.
+
+    :param handle: (ClientHandle) – clients and credentials to use, or None
+        for cumulus_v05's global clients.
+    :param max_requests: (int) – requests on the wire at once. Calls beyond
+        it wait their turn.
+    :param max_connections: (int) – connections kept open, 0 for no limit.
+    :param token_lifetime: (float) – seconds to reuse an Authorization
+        header before signing again.
+    """
+
+    def __init__(self, handle=None, max_requests=64, max_connections=64,
+                 token_lifetime=300):
+        self.handle = handle
+        self.max_requests = max_requests
+        self.max_connections = max_connections
+        self.token_lifetime = token_lifetime
+        self.requests = 0
+        self._semaphore = asyncio.Semaphore(max_requests)
+        self._session = None
+        self._tokens = {}
+        self._token_lock = asyncio.Lock()
+        # Task closing the client of an event loop at its end.
+        self._closer = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def operations(self, resource_type):
+        """
+        Returns the SDK operations group of a resource type.
+
+        :param resource_type: (str) – e.g. 'virtual_networks'.
+        :return: SDK operations group
+        """
+        return cumulus._operations(resource_type, self.handle)
+
+    async def close(self):
+        """
+        Closes the session and its connections.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def send(self, operations, method, url, body=None,
+                   custom_headers=None, expected=(200,), span=None):
+        """
+        Sends one request with the headers the SDK would add, after taking
+        a token from the global cumulus.rate_limiter if it is set.
+
+        :param operations: SDK operations group the request is for.
+        :param method: (str) – HTTP method.
+        :param url: (str) – absolute URL, with its query.
+        :param body: JSON-serializable body, or None.
+        :param custom_headers: (dict) – headers that will be added to the
+            request.
+        :param expected: (tuple) – statuses that are not errors.
+        :param span: (Span) – span of the call, to add a span for the
+            request under when the global cumulus.tracer is set.
+        :return: requests.Response
+        :raises: CloudError, ClientRequestError
+        """
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections)
+            )
+        headers = cumulus._request_headers(operations, custom_headers)
+        data = None if body is None else json.dumps(body)
+        credentials = operations.config.credentials
+        limiter = cumulus.rate_limiter
+        bucket = None
+        if limiter is not None:
+            bucket = await _acquire(limiter, method, url)
+        start = cumulus_tracing._now()
+        response = None
+
+        try:
+            async with self._semaphore:
+                for attempt in (0, 1):
+                    headers['Authorization'] = await self._authorization(
+                        credentials, renew=attempt > 0
+                    )
+                    try:
+                        async with self._session.request(
+                                method, url, headers=headers,
+                                data=data) as reply:
+                            content = await reply.read()
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        # Raised as msrest raises it, so retry_policy
+                        # treats it as a failed connection.
+                        raise cumulus.msrest_exceptions.ClientRequestError(
+                            'Error sending {} {}: {}'.format(method, url, e),
+                            inner_exception=e
+                        )
+                    self.requests += 1
+                    if reply.status != 401:
+                        break
+            response = cumulus._response(
+                method, url, reply.status, reply.reason, reply.headers,
+                content
+            )
+        finally:
+            if bucket is not None:
+                limiter.release(bucket, response)
+
+        if span is not None and cumulus.tracer is not None:
+            _request_span(cumulus.tracer, span, response, start)
+        if reply.status not in expected:
+            raise _cloud_error(response)
+        return response
+
+    async def _authorization(self, credentials, renew=False):
+        """
+        Returns the Authorization header for credentials, signing again in a
+        worker thread once the last one is older than token_lifetime.
+        """
+        entry = self._tokens.get(credentials)
+        if not renew and entry is not None \
+                and time.monotonic() - entry[1] < self.token_lifetime:
+            return entry[0]
+        async with self._token_lock:
+            current = self._tokens.get(credentials)
+            if current is not None and current is not entry \
+                    and time.monotonic() - current[1] < self.token_lifetime:
+                return current[0]
+            if renew and hasattr(credentials, 'refresh_session'):
+                sign = credentials.refresh_session
+                await asyncio.get_running_loop().run_in_executor(None, sign)
+            header = await asyncio.get_running_loop().run_in_executor(
+                None, _authorization, credentials
+            )
+            self._tokens[credentials] = (header, time.monotonic())
+            return header
+
+
+async def _acquire(limiter, method, url):
+    """
+    Takes a token from a RateLimiter, sleeping on the event loop while
+    none is available.
+
+    :param limiter: (RateLimiter) – the limiter.
+    :param method: (str) – HTTP method of the request.
+    :param url: (str) – request URL.
+    :return: the bucket to give back to release, or None
+    """
+    while True:
+        bucket, delay = limiter.try_acquire(method, url)
+        if delay == 0:
+            return bucket
+        await asyncio.sleep(delay)
+
+
+def _start_span(operations, operation, names):
+    """
+    Starts the span of a call when the global cumulus.tracer is set. The
+    span is not made active, since the tasks of a loop share its thread.
+
+    :param operations: SDK operations group of the call.
+    :param operation: (str) – SDK method, e.g. 'create_or_update'.
+    :param names: (tuple) – positional name arguments of the call.
+    :return: Span, or None
+    """
+    tracer = cumulus.tracer
+    if tracer is None:
+        return None
+    resource_type = cumulus._operations_type(operations)
+    return cumulus_tracing.Span(
+        '{}.{}'.format(resource_type, operation),
+        tracer.current(),
+        attributes={
+            'cumulus.resource_type': resource_type,
+            'cumulus.operation': operation,
+            'cumulus.resource_id': cumulus._resource_id(operations, names),
+        }
+    )
+
+
+def _end_span(span, error=None):
+    if span is not None and cumulus.tracer is not None:
+        cumulus.tracer.end(span, error)
+
+
+def _request_span(tracer, parent, response, start):
+    """
+    Adds the span of one request under the span of its call.
+    """
+    span = cumulus_tracing.Span(
+        'HTTP ' + response.request.method,
+        parent,
+        cumulus_tracing.Span.CLIENT,
+        {
+            'http.method': response.request.method,
+            'http.url': response.url,
+            'http.status_code': response.status_code,
+        },
+        start
+    )
+    error = None
+    if response.status_code >= 400:
+        error = '{} {}'.format(response.status_code, response.reason)
+    tracer.end(span, error)
+
+
+async def _retry(method, call, args, attempt=1, delay=None):
+    """
+    Runs a request coroutine, retrying it under the global
+    cumulus.retry_policy the way RetryPolicy does for the blocking
+    functions, but sleeping on the event loop.
+
+    :param method: (callable) – SDK method the request is for.
+    :param call: (coroutine function) – sends the request.
+    :param args: (tuple) – positional arguments for call.
+    :param attempt: (int) – tries made so far, plus one.
+    :param delay: (float) – the last wait, the policy's base when None.
+    :return: (result, tries made, last wait)
+    :raises: the last error
+    """
+    policy = cumulus.retry_policy
+    if delay is None:
+        delay = policy.base if policy is not None else 0
+    while True:
+        try:
+            return await call(*args), attempt, delay
+        except Exception as e:
+            if policy is None:
+                raise
+            wait = policy._delay(method, e, attempt, delay)
+            if wait is None:
+                raise
+        await asyncio.sleep(wait)
+        attempt += 1
+        delay = wait
+
+
+async def _read(client, operations, url, custom_headers, span):
+    """
+    Sends a GET under the global retry_policy and metrics.
+
+    :return: requests.Response
+    :raises: CloudError, ClientRequestError
+    """
+    method = operations.get
+    if cumulus.retry_policy is not None:
+        cumulus.retry_policy._earn()
+    started = time.perf_counter()
+    try:
+        response = (await _retry(
+            method,
+            client.send,
+            (operations, 'GET', url, None, custom_headers, (200,), span)
+        ))[0]
+    except Exception as e:
+        if cumulus.metrics is not None:
+            cumulus.metrics.request_done(method, started, e)
+        raise
+    if cumulus.metrics is not None:
+        cumulus.metrics.request_done(method, started)
+    return response
+
+
+async def _run_operation(client, operations, method, url, body,
+                         custom_headers, span):
+    """
+    Sends the initial request of a write and polls the operation to the
+    end, under the global retry_policy and metrics the way _start_operation
+    does: the initial request is retried, and an operation that ends in an
+    error worth retrying is started again.
+
+    :return: the final response
+    :raises: CloudError, ClientRequestError
+    """
+    sdk_method = getattr(
+        operations, 'create_or_update' if method == 'PUT' else 'delete'
+    )
+    expected = (200, 201, 202) if method == 'PUT' else (200, 202, 204)
+    policy = cumulus.retry_policy
+    metrics = cumulus.metrics
+    if policy is not None:
+        policy._earn()
+    started = time.perf_counter()
+    attempt, delay, polls = 1, None, 0
+    while True:
+        sent = time.perf_counter()
+        try:
+            response, attempt, delay = await _retry(
+                sdk_method,
+                client.send,
+                (operations, method, url, body, custom_headers, expected,
+                 span),
+                attempt,
+                delay
+            )
+        except Exception as e:
+            if metrics is not None:
+                metrics.request_done(sdk_method, sent, e)
+            raise
+        if metrics is not None:
+            metrics.request_done(sdk_method, sent)
+        try:
+            response, count = await _poll(
+                client, operations, method, url, response, custom_headers,
+                span
+            )
+            polls += count
+            break
+        except cumulus.azure_exceptions.CloudError as e:
+            wait = None
+            if policy is not None:
+                wait = policy._delay(sdk_method, e, attempt, delay)
+            if wait is None:
+                _operation_done(sdk_method, started, polls, e)
+                raise
+        await asyncio.sleep(wait)
+        attempt += 1
+        delay = wait
+    _operation_done(sdk_method, started, polls)
+    return response
+
+
+def _operation_done(method, started, polls, error=None):
+    """
+    Records a finished operation in the global cumulus.metrics, if set.
+    """
+    metrics = cumulus.metrics
+    if metrics is None:
+        return
+    resource_type, operation = metrics._key(method)
+    metrics.observe('operation_seconds', resource_type, operation,
+                    time.perf_counter() - started)
+    metrics.observe('polls', resource_type, operation, polls)
+    if error is not None:
+        metrics.error(resource_type, operation, error)
+
+
+def _client(client):
+    """
+    Returns the AsyncClient to use for a call.
+
+    :param client: (AsyncClient) – client given to the call, or None.
+    :return: AsyncClient
+    """
+    if client is not None:
+        return client
+    if default_client is not None:
+        return default_client
+    loop = asyncio.get_running_loop()
+    client = _loop_clients.get(loop)
+    if client is None:
+        client = AsyncClient()
+        _loop_clients[loop] = client
+        client._closer = loop.create_task(_close_at_shutdown(client))
+    return client
+
+
+async def _close_at_shutdown(client):
+    """
+    Closes the client of an event loop when asyncio.run cancels the tasks
+    left at its end. Loops run some other way should be given an
+    AsyncClient, used with async with, instead.
+
+    :param client: (AsyncClient) – the loop's client.
+    """
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await client.close()
+
+
+def _url(operations, resource_type, names, query=None):
+    """
+    Builds the URL of a resource.
+
+    :param operations: SDK operations group of the resource type.
+    :param resource_type: (str) – _RESOURCE_PATHS key.
+    :param names: (tuple) – positional name arguments of the call.
+    :param query: (dict) – query parameters besides api-version.
+    :return: str
+    """
+    path = cumulus._RESOURCE_PATHS[resource_type].format(
+        *[parse.quote(name, safe='') for name in names]
+    )
+    url = operations._client.format_url(
+        '/subscriptions/{}/{}'.format(
+            parse.quote(operations.config.subscription_id, safe=''), path
+        )
+    )
+    parameters = {'api-version': cumulus._api_version(operations)}
+    parameters.update(query or {})
+    return url + '?' + parse.urlencode(parameters)
+
+
+async def _poll(client, operations, method, url, response, custom_headers,
+                span=None):
+    """
+    Waits for a long running operation, the way AzureOperationPoller does,
+    sleeping between status checks on the resource type's PollingPolicy.
+
+    :param client: (AsyncClient) – client that sent the initial request.
+    :param operations: SDK operations group of the resource type.
+    :param method: (str) – 'PUT' or 'DELETE'.
+    :param url: (str) – URL of the resource.
+    :param response: (requests.Response) – the initial response.
+    :param custom_headers: (dict) – headers added to every status check.
+    :param span: (Span) – span of the call, for the status requests.
+    :return: (final response, status requests sent)
+    :raises: CloudError
+    """
+    async_url = response.headers.get('azure-asyncoperation')
+    location = response.headers.get('location')
+    if async_url or (response.status_code == 202 and location):
+        status = 'InProgress'
+    elif method == 'PUT':
+        status = _provisioning_state(response) or 'Succeeded'
+    else:
+        status = 'Succeeded'
+    # Latest response that carries the resource itself.
+    resource = response if response.status_code in (200, 201) else None
+
+    policy = cumulus_polling.polling_policy(operations)
+    attempt = 0
+    while status.lower() not in _TERMINAL_STATES:
+        await asyncio.sleep(
+            policy.delay(attempt, cumulus.retry_after(response))
+        )
+        attempt += 1
+        if async_url:
+            response = await client.send(
+                operations, 'GET', async_url,
+                custom_headers=custom_headers, span=span
+            )
+            status = json.loads(response.content.decode('utf-8')).get(
+                'status', 'InProgress'
+            )
+            resource = None
+        elif location:
+            response = await client.send(
+                operations, 'GET', location,
+                custom_headers=custom_headers, expected=(200, 201, 202, 204),
+                span=span
+            )
+            if response.status_code != 202:
+                status = 'Succeeded'
+                resource = response if response.status_code != 204 \
+                    else None
+        elif method == 'PUT':
+            response = await client.send(
+                operations, 'GET', url, custom_headers=custom_headers,
+                span=span
+            )
+            status = _provisioning_state(response) or 'Succeeded'
+            resource = response
+        else:
+            raise _cloud_error(
+                response,
+                'Location header is missing from long running operation.'
+            )
+        async_url = response.headers.get('azure-asyncoperation', async_url)
+        location = response.headers.get('location', location)
+
+    if status.lower() != 'succeeded':
+        raise _cloud_error(response)
+    if method == 'DELETE':
+        return response, attempt
+    if resource is None:
+        resource = await client.send(
+            operations, 'GET', url, custom_headers=custom_headers, span=span
+        )
+        attempt += 1
+    return resource, attempt
+
+
+def _output(operations, model, response, raw):
+    """
+    Deserializes a final response into what the coroutine returns.
+
+    :return: the resource, None for deletes, or ClientRawResponse if raw
+    """
+    resource = None
+    if model is not None and response.status_code in (200, 201):
+        resource = operations._deserialize(model, response)
+    if raw:
+        return cumulus.pipeline.ClientRawResponse(resource, response)
+    return resource
+
+
+async def _current(client, operations, url, model, body, custom_headers,
+                   span):
+    """
+    Reads the resource a PUT would write and returns it if the PUT would
+    not change it.
+
+    :return: the current resource, or None if the PUT is needed
+    """
+    try:
+        response = await _read(client, operations, url, custom_headers, span)
+    except cumulus.azure_exceptions.CloudError as e:
+        if e.status_code != 404:
+            raise
+        current = None
+    else:
+        current = _output(operations, model, response, False)
+    if cumulus.change_detector.unchanged(body, current):
+        return current
+    return None
+
+
+async def _operation(function, client, operations, method, url, model,
+                     body, custom_headers, raw, names):
+    """
+    Sends the initial request of a write, polls it to the end, and logs
+    the outcome the way the blocking function would. A PUT the global
+    cumulus.change_detector finds would change nothing is not sent.
+    Cached reads of the resource are dropped when it starts and refreshed
+    when it finishes, as they are for the blocking functions.
+    """
+    span = _start_span(
+        operations, 'create_or_update' if method == 'PUT' else 'delete', names
+    )
+    cache = cumulus.read_cache
+    try:
+        if method == 'PUT' and cumulus.change_detector is not None \
+                and not raw:
+            current = await _current(
+                client, operations, url, model, body, custom_headers, span
+            )
+            if current is not None:
+                _end_span(span)
+                cumulus._log_result(function, current)
+                return current
+        if cache is not None:
+            cache.invalidate(
+                operations, names, descendants=method == 'DELETE'
+            )
+        response = await _run_operation(
+            client, operations, method, url, body, custom_headers, span
+        )
+    except Exception as e:
+        if cache is not None:
+            cache.invalidate(
+                operations, names, descendants=method == 'DELETE'
+            )
+        _end_span(span, e)
+        if isinstance(e, cumulus.azure_exceptions.CloudError):
+            cumulus._log_error(function, e)
+        raise
+    result = _output(operations, model, response, raw)
+    if cache is not None:
+        if method == 'DELETE':
+            cache.invalidate(operations, names, descendants=True)
+        else:
+            cache.update(operations, names, result)
+    _end_span(span)
+    if method == 'PUT':
+        cumulus._log_result(function, result)
+    elif cumulus.log_sink is not None:
+        cumulus.log_sink.emit(
+            logging.INFO,
+            function.__name__,
+            path=cumulus._resource_path(function, names),
+            state='Succeeded'
+        )
+    return result
+
+
+async def _write(function, method, model, names, parameters=None,
+                 custom_headers=None, raw=False, wait=True, client=None):
+    """
+    Runs a create_update or delete coroutine.
+
+    :param function: (coroutine function) – the coroutine, for logging.
+    :param method: (str) – 'PUT' or 'DELETE'.
+    :param model: (str) – model name of the resource, None for deletes.
+    :param names: (tuple) – positional name arguments of the call.
+    :param parameters: (Model) – resource to PUT.
+    :param custom_headers: (dict) – headers that will be added to the
+        requests.
+    :param raw: (bool) – return a ClientRawResponse of the final response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of the operation instead.
+    :param client: (AsyncClient) – client to send with.
+    :return: the resource, None for deletes, ClientRawResponse if
+        raw=true, or an asyncio.Task of one of them if wait=False
+    """
+    client = _client(client)
+    resource_type = cumulus._resource_type(function)
+    operations = client.operations(resource_type)
+    body = None
+    if parameters is not None:
+        body = operations._serialize.body(parameters, model)
+    task = asyncio.ensure_future(_operation(
+        function, client, operations, method,
+        _url(operations, resource_type, names), model, body,
+        custom_headers, raw, names
+    ))
+    if not wait:
+        return task
+    try:
+        return await task
+    except cumulus.azure_exceptions.CloudError:
+        return None
+
+
+async def _get(function, model, names, expand=None, custom_headers=None,
+               raw=False, client=None):
+    """
+    Runs a get coroutine.
+
+    :param function: (coroutine function) – the coroutine, for logging.
+    :param model: (str) – model name of the resource.
+    :param names: (tuple) – positional name arguments of the call.
+    :param expand: (str) – Expands referenced resources.
+    :param custom_headers: (dict) – headers that will be added to the
+        request.
+    :param raw: (bool or str) – return a ClientRawResponse, or with 'json',
+        a RawResource that is never deserialized.
+    :param client: (AsyncClient) – client to send with.
+    :return: the resource, ClientRawResponse if raw=true, or RawResource if
+        raw='json'
+    """
+    client = _client(client)
+    resource_type = cumulus._resource_type(function)
+    operations = client.operations(resource_type)
+    query = {'$expand': expand} if expand is not None else None
+    span = _start_span(operations, 'get', names)
+    try:
+        response = await _read(
+            client,
+            operations,
+            _url(operations, resource_type, names, query),
+            custom_headers,
+            span
+        )
+    except Exception as e:
+        _end_span(span, e)
+        if not isinstance(e, cumulus.azure_exceptions.CloudError):
+            raise
+        cumulus._log_error(function, e)
+        return None
+    _end_span(span)
+    if raw == 'json':
+        result = cumulus.RawResource(
+            response.content,
+            parse.unquote(parse.urlsplit(response.url).path)
+        )
+    else:
+        result = _output(operations, model, response, raw)
+    cumulus._log_result(function, result)
+    return result
+
+
+# Resource Group Operations
+async def create_update_resource_group(
+        resource_group_name,
+        parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Creates or updates a resource group.
+
+    :param resource_group_name: (str) – The name of the resource group to
+        create or update.
+    :param parameters: (ResourceGroup) – Parameters supplied to the create or
+        update a resource group.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: ResourceGroup or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_resource_group,
+        'PUT',
+        'ResourceGroup',
+        (resource_group_name,),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_resource_group(
+        resource_group_name,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets a resource group.
+
+    :param resource_group_name: (str) – The name of the resource group to
+        create or update.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: ResourceGroup or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_resource_group,
+        'ResourceGroup',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_resource_group(
+        resource_group_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes a resource group.
+
+    :param resource_group_name: (str) – The name of the resource group to
+        delete. The name is case insensitive.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_resource_group,
+        'DELETE',
+        None,
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+# Virtual Networks Operations:
+async def create_update_virtual_networks(
+        resource_group_name,
+        virtual_network_name,
+        parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Creates or updates a virtual network in the specified resource group.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_name: (str) – The name of the virtual network.
+    :param parameters: (VirtualNetwork) – Parameters supplied to the create or
+        update virtual network operation.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: VirtualNetwork or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_virtual_networks,
+        'PUT',
+        'VirtualNetwork',
+        (
+            resource_group_name,
+            virtual_network_name
+        ),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_virtual_networks(
+        resource_group_name,
+        virtual_network_name,
+        expand=None,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets the specified virtual network by resource group.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_name: (str) – The name of the virtual network.
+    :param expand: (str) – Expands referenced resources.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: VirtualNetwork or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_virtual_networks,
+        'VirtualNetwork',
+        (
+            resource_group_name,
+            virtual_network_name
+        ),
+        expand=expand,
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_virtual_networks(
+        resource_group_name,
+        virtual_network_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes the specified virtual network.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_name: (str) – The name of the virtual network.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_virtual_networks,
+        'DELETE',
+        None,
+        (
+            resource_group_name,
+            virtual_network_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+# Subnets Operations:
+async def create_update_subnets(
+        resource_group_name,
+        virtual_network_name,
+        subnet_name,
+        subnet_parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Creates or updates a subnet in the specified virtual network.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_name: (str) – The name of the virtual network
+    :param subnet_name: (str) – The name of the subnet.
+    :param subnet_parameters: (Subnet) – Parameters supplied to the create
+        or update subnet operation.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: Subnet or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_subnets,
+        'PUT',
+        'Subnet',
+        (
+            resource_group_name,
+            virtual_network_name,
+            subnet_name
+        ),
+        subnet_parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_subnets(
+        resource_group_name,
+        virtual_network_name,
+        subnet_name,
+        expand=None,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets the specified subnet by virtual network and resource group.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_name: (str) – The name of the virtual network
+    :param subnet_name: (str) – The name of the subnet.
+    :param expand: (str) – Expands referenced resources.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: Subnet or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_subnets,
+        'Subnet',
+        (
+            resource_group_name,
+            virtual_network_name,
+            subnet_name
+        ),
+        expand=expand,
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_subnets(
+        resource_group_name,
+        virtual_network_name,
+        subnet_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes the specified subnet.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_name: (str) – The name of the virtual network.
+    :param subnet_name: (str) – The name of the subnet.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_subnets,
+        'DELETE',
+        None,
+        (
+            resource_group_name,
+            virtual_network_name,
+            subnet_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+# Route Tables Operations
+async def create_update_route_tables(
+        resource_group_name,
+        route_table_name,
+        parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Create or updates a route table in a specified resource group.
+
+    :param resource_group_name:  (str) – The name of the resource group
+    :param route_table_name: (str) – The name of the route table.
+    :param parameters: (RouteTable) – Parameters supplied to the create or
+        update route table operation.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: RouteTable or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_route_tables,
+        'PUT',
+        'RouteTable',
+        (
+            resource_group_name,
+            route_table_name
+        ),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_route_tables(
+        resource_group_name,
+        route_table_name,
+        expand=None,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets the specified route table.
+
+    :param resource_group_name:  (str) – The name of the resource group
+    :param route_table_name: (str) – The name of the route table.
+    :param expand: (str) – Expands referenced resources.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: RouteTable or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_route_tables,
+        'RouteTable',
+        (
+            resource_group_name,
+            route_table_name
+        ),
+        expand=expand,
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_route_tables(
+        resource_group_name,
+        route_table_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes the specified route table.
+
+    :param resource_group_name:  (str) – The name of the resource group
+    :param route_table_name: (str) – The name of the route table.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_route_tables,
+        'DELETE',
+        None,
+        (
+            resource_group_name,
+            route_table_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+# Routes Operations
+async def create_update_routes(
+        resource_group_name,
+        route_table_name,
+        route_name,
+        route_parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Creates or updates a route in the specified route table.
+
+    :param resource_group_name:  (str) – The name of the resource group
+    :param route_table_name: (str) – The name of the route table.
+    :param route_name: (str) – The name of the route.
+    :param route_parameters: (Route) – Parameters supplied to the create or
+        update route operation.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: Route or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_routes,
+        'PUT',
+        'Route',
+        (
+            resource_group_name,
+            route_table_name,
+            route_name
+        ),
+        route_parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_routes(
+        resource_group_name,
+        route_table_name,
+        route_name,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets the specified route from a route table.
+
+    :param resource_group_name:  (str) – The name of the resource group
+    :param route_table_name: (str) – The name of the route table.
+    :param route_name: (str) – The name of the route.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: Route or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_routes,
+        'Route',
+        (
+            resource_group_name,
+            route_table_name,
+            route_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_routes(
+        resource_group_name,
+        route_table_name,
+        route_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes the specified route from a route table.
+
+    :param resource_group_name:  (str) – The name of the resource group
+    :param route_table_name: (str) – The name of the route table.
+    :param route_name: (str) – The name of the route.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_routes,
+        'DELETE',
+        None,
+        (
+            resource_group_name,
+            route_table_name,
+            route_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+# Virtual Network Peerings Operations
+async def create_update_virtual_network_peerings(
+        resource_group_name,
+        virtual_network_name,
+        virtual_network_peering_name,
+        virtual_network_peering_parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Creates or updates a peering in the specified virtual network.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_name: (str) – The name of the virtual network.
+    :param virtual_network_peering_name: (str) – The name of the virtual
+        network peering.
+    :param virtual_network_peering_parameters:
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: VirtualNetworkPeering or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_virtual_network_peerings,
+        'PUT',
+        'VirtualNetworkPeering',
+        (
+            resource_group_name,
+            virtual_network_name,
+            virtual_network_peering_name
+        ),
+        virtual_network_peering_parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_virtual_network_peerings(
+        resource_group_name,
+        virtual_network_name,
+        virtual_network_peering_name,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets the specified virtual network peering.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_name: (str) – The name of the virtual network.
+    :param virtual_network_peering_name: (str) – The name of the virtual
+        network peering.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: VirtualNetworkPeering or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_virtual_network_peerings,
+        'VirtualNetworkPeering',
+        (
+            resource_group_name,
+            virtual_network_name,
+            virtual_network_peering_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_virtual_network_peerings(
+        resource_group_name,
+        virtual_network_name,
+        virtual_network_peering_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes the specified virtual network peering.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_name: (str) – The name of the virtual network.
+    :param virtual_network_peering_name: (str) – The name of the virtual
+        network peering.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_virtual_network_peerings,
+        'DELETE',
+        None,
+        (
+            resource_group_name,
+            virtual_network_name,
+            virtual_network_peering_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+# Local Network Gateway Operations
+async def create_update_local_network_gateways(
+        resource_group_name,
+        local_network_gateway_name,
+        parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Creates or updates a local network gateway in the specified resource group.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param local_network_gateway_name: (str) – The name of the local network
+        gateway.
+    :param parameters: (LocalNetworkGateway) – Parameters supplied to the
+        create or update local network gateway operation.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: LocalNetworkGateway or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_local_network_gateways,
+        'PUT',
+        'LocalNetworkGateway',
+        (
+            resource_group_name,
+            local_network_gateway_name
+        ),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_local_network_gateways(
+        resource_group_name,
+        local_network_gateway_name,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets the specified local network gateway in a resource group.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param local_network_gateway_name: (str) – The name of the local network
+        gateway.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: LocalNetworkGateway or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_local_network_gateways,
+        'LocalNetworkGateway',
+        (
+            resource_group_name,
+            local_network_gateway_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_local_network_gateways(
+        resource_group_name,
+        local_network_gateway_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes the specified local network gateway.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param local_network_gateway_name: (str) – The name of the local network
+        gateway.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_local_network_gateways,
+        'DELETE',
+        None,
+        (
+            resource_group_name,
+            local_network_gateway_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+# Public IP Addresses Operations
+async def create_update_public_ip_addresses(
+        resource_group_name,
+        public_ip_address_name,
+        parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Creates or updates a static or dynamic public IP address.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param public_ip_address_name: (str) – The name of the public IP address.
+    :param parameters: (PublicIPAddress) – Parameters supplied to the create
+        or update public IP address operation.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: PublicIPAddress or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_public_ip_addresses,
+        'PUT',
+        'PublicIPAddress',
+        (
+            resource_group_name,
+            public_ip_address_name
+        ),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_public_ip_addresses(
+        resource_group_name,
+        public_ip_address_name,
+        expand=None,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets the specified public IP address in a specified resource group.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param public_ip_address_name: (str) – The name of the public IP address.
+    :param expand: (str) – Expands referenced resources.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: PublicIPAddress or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_public_ip_addresses,
+        'PublicIPAddress',
+        (
+            resource_group_name,
+            public_ip_address_name
+        ),
+        expand=expand,
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_public_ip_addresses(
+        resource_group_name,
+        public_ip_address_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes the specified public IP address.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param public_ip_address_name: (str) – The name of the public IP address.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_public_ip_addresses,
+        'DELETE',
+        None,
+        (
+            resource_group_name,
+            public_ip_address_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+# Virtual Network Gateway Operations
+async def create_update_virtual_network_gateways(
+        resource_group_name,
+        virtual_network_gateway_name,
+        parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Creates or updates a virtual network gateway in the specified resource
+        group.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_gateway_name: (str) – The name of the virtual
+        network gateway.
+    :param parameters: (VirtualNetworkGateway) – Parameters supplied to
+        create or update virtual network gateway operation.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: VirtualNetworkGateway or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_virtual_network_gateways,
+        'PUT',
+        'VirtualNetworkGateway',
+        (
+            resource_group_name,
+            virtual_network_gateway_name
+        ),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_virtual_network_gateways(
+        resource_group_name,
+        virtual_network_gateway_name,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets the specified virtual network gateway by resource group.
+
+    :param resource_group_name: (str) – The name of the resource group to
+        create or update.
+    :param virtual_network_gateway_name: (str) – The name of the virtual
+        network gateway.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: VirtualNetworkGateway or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_virtual_network_gateways,
+        'VirtualNetworkGateway',
+        (
+            resource_group_name,
+            virtual_network_gateway_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_virtual_network_gateways(
+        resource_group_name,
+        virtual_network_gateway_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes the specified virtual network gateway.
+
+    :param resource_group_name: (str) – The name of the resource group to
+        create or update.
+    :param virtual_network_gateway_name: (str) – The name of the virtual
+        network gateway.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_virtual_network_gateways,
+        'DELETE',
+        None,
+        (
+            resource_group_name,
+            virtual_network_gateway_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+# Virtual Network Gateway Connections Operations
+async def create_update_virtual_network_gateway_connections(
+        resource_group_name,
+        virtual_network_gateway_connection_name,
+        parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Creates or updates a virtual network gateway connection in the specified
+        resource group.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_gateway_connection_name: (str) – The name of the
+        virtual network gateway connection.
+    :param parameters: (VirtualNetworkGatewayConnection) – Parameters
+        supplied to the create or update virtual network gateway connection
+        operation.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: VirtualNetworkGatewayConnection or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_virtual_network_gateway_connections,
+        'PUT',
+        'VirtualNetworkGatewayConnection',
+        (
+            resource_group_name,
+            virtual_network_gateway_connection_name
+        ),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_virtual_network_gateway_connections(
+        resource_group_name,
+        virtual_network_gateway_connection_name,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets the specified virtual network gateway connection by resource group.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_gateway_connection_name: (str) – The name of the
+        virtual network gateway connection.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: VirtualNetworkGatewayConnection or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_virtual_network_gateway_connections,
+        'VirtualNetworkGatewayConnection',
+        (
+            resource_group_name,
+            virtual_network_gateway_connection_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_virtual_network_gateway_connections(
+        resource_group_name,
+        virtual_network_gateway_connection_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes the specified virtual network Gateway connection.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_gateway_connection_name: (str) – The name of the
+        virtual network gateway connection.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_virtual_network_gateway_connections,
+        'DELETE',
+        None,
+        (
+            resource_group_name,
+            virtual_network_gateway_connection_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+# Network Interfaces Operations
+async def create_update_network_interfaces(
+        resource_group_name,
+        network_interface_name,
+        parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Creates or updates a network interface.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param network_interface_name: (str) – The name of the network interface.
+    :param parameters: (NetworkInterface) – Parameters supplied to the create
+        or update network interface operation.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: NetworkInterface or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_network_interfaces,
+        'PUT',
+        'NetworkInterface',
+        (
+            resource_group_name,
+            network_interface_name
+        ),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_network_interfaces(
+        resource_group_name,
+        network_interface_name,
+        expand=None,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets information about the specified network interface.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param network_interface_name: (str) – The name of the network interface
+    :param expand: (str) – Expands referenced resources.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: NetworkInterface or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_network_interfaces,
+        'NetworkInterface',
+        (
+            resource_group_name,
+            network_interface_name
+        ),
+        expand=expand,
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_network_interfaces(
+        resource_group_name,
+        network_interface_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes the specified network interface.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param network_interface_name: (str) – The name of the network interface.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_network_interfaces,
+        'DELETE',
+        None,
+        (
+            resource_group_name,
+            network_interface_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+# Network Security Groups Operations
+async def create_update_network_security_groups(
+        resource_group_name,
+        network_security_group_name,
+        parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Creates or updates a network interface.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param network_security_group_name: (str) – The name of the network
+        security group.
+    :param parameters: (NetworkSecurityGroup) – Parameters supplied to the
+        create or update network security group operation.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: NetworkSecurityGroup or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_network_security_groups,
+        'PUT',
+        'NetworkSecurityGroup',
+        (
+            resource_group_name,
+            network_security_group_name
+        ),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_network_security_groups(
+        resource_group_name,
+        network_security_group_name,
+        expand=None,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets information about the specified network interface.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param network_security_group_name: (str) – The name of the network
+        security group.
+    :param expand: (str) – Expands referenced resources.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: NetworkSecurityGroup or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_network_security_groups,
+        'NetworkSecurityGroup',
+        (
+            resource_group_name,
+            network_security_group_name
+        ),
+        expand=expand,
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_network_security_groups(
+        resource_group_name,
+        network_security_group_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes the specified network interface.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param network_security_group_name: (str) – The name of the network
+        security group.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_network_security_groups,
+        'DELETE',
+        None,
+        (
+            resource_group_name,
+            network_security_group_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+# Express Route Circuits Operations
+async def create_update_express_route_circuits(
+        resource_group_name,
+        circuit_name,
+        parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Creates or updates an express route circuit.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param circuit_name: (str) – The name of the circuit.
+    :param parameters:  (ExpressRouteCircuit) – Parameters supplied to the
+        create or update express route circuit operation.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: ExpressRouteCircuit or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_express_route_circuits,
+        'PUT',
+        'ExpressRouteCircuit',
+        (
+            resource_group_name,
+            circuit_name
+        ),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_express_route_circuits(
+        resource_group_name,
+        circuit_name,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets information about the specified express route circuit.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param circuit_name: (str) – The name of express route circuit.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: ExpressRouteCircuit or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_express_route_circuits,
+        'ExpressRouteCircuit',
+        (
+            resource_group_name,
+            circuit_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_express_route_circuits(
+        resource_group_name,
+        circuit_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes the specified express route circuit.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param circuit_name: (str) – The name of the express route circuit.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_express_route_circuits,
+        'DELETE',
+        None,
+        (
+            resource_group_name,
+            circuit_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+# Express Route Circuit Authorizations Operations
+async def create_update_express_route_circuit_authorizations(
+        resource_group_name,
+        circuit_name,
+        authorization_name,
+        authorization_parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Creates or updates an authorization in the specified express route circuit.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param circuit_name: (str) – The name of the express route circuit.
+    :param authorization_name: (str) – The name of the authorization.
+    :param authorization_parameters: (ExpressRouteCircuitAuthorization) –
+        Parameters supplied to the create or update express route circuit
+        authorization operation.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: ExpressRouteCircuitAuthorization or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_express_route_circuit_authorizations,
+        'PUT',
+        'ExpressRouteCircuitAuthorization',
+        (
+            resource_group_name,
+            circuit_name,
+            authorization_name
+        ),
+        authorization_parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_express_route_circuit_authorizations(
+        resource_group_name,
+        circuit_name,
+        authorization_name,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets the specified authorization from the specified express route circuit.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param circuit_name: (str) – The name of the express route circuit.
+    :param authorization_name: (str) – The name of the authorization.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: ExpressRouteCircuitAuthorization or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_express_route_circuit_authorizations,
+        'ExpressRouteCircuitAuthorization',
+        (
+            resource_group_name,
+            circuit_name,
+            authorization_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_express_route_circuits_authorizations(
+        resource_group_name,
+        circuit_name,
+        authorization_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes the specified authorization from the specified express route circuit.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param circuit_name: (str) – The name of the express route circuit.
+    :param authorization_name: (str) – The name of the authorization.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_express_route_circuits_authorizations,
+        'DELETE',
+        None,
+        (
+            resource_group_name,
+            circuit_name,
+            authorization_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def create_update_express_route_circuit_peerings(
+        resource_group_name,
+        circuit_name,
+        peering_name,
+        peering_parameters,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Creates or updates a peering in the specified express route circuits.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param circuit_name: (str) – The name of the express route circuit.
+    :param peering_name: (str) – The name of the peering.
+    :param peering_parameters: (ExpressRouteCircuitPeering) – Parameters
+        supplied to the create or update express route circuit peering
+        operation.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: ExpressRouteCircuitPeering or ClientRawResponse if raw=true,
+        or an asyncio.Task of it if wait=False
+    """
+    return await _write(
+        create_update_express_route_circuit_peerings,
+        'PUT',
+        'ExpressRouteCircuitPeering',
+        (
+            resource_group_name,
+            circuit_name,
+            peering_name
+        ),
+        peering_parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+async def get_express_route_circuit_peerings(
+        resource_group_name,
+        circuit_name,
+        peering_name,
+        custom_headers=None,
+        raw=False,
+        client=None
+):
+    """
+    Gets the specified authorization from the specified express route circuit.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param circuit_name: (str) – The name of the express route circuit.
+    :param peering_name: (str) – The name of the peering.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: ExpressRouteCircuitPeering or ClientRawResponse if raw=true
+        or RawResource if raw='json'
+    """
+    return await _get(
+        get_express_route_circuit_peerings,
+        'ExpressRouteCircuitPeering',
+        (
+            resource_group_name,
+            circuit_name,
+            peering_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        client=client)
+
+
+async def delete_express_route_circuit_peerings(
+        resource_group_name,
+        circuit_name,
+        peering_name,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None
+):
+    """
+    Deletes the specified peering from the specified express route circuit.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param circuit_name: (str) – The name of the express route circuit.
+    :param peering_name: (str) – The name of the peering.
+    :param custom_headers: (dict) – headers that will be added to the request.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an asyncio.Task of it as soon as it is started.
+    :param client: (AsyncClient) – client to use instead of
+        default_client.
+    :return: None or ClientRawResponse if raw=true, or an asyncio.Task
+        of it if wait=False
+    """
+    return await _write(
+        delete_express_route_circuit_peerings,
+        'DELETE',
+        None,
+        (
+            resource_group_name,
+            circuit_name,
+            peering_name
+        ),
+        custom_headers=custom_headers,
+        raw=raw,
+        wait=wait,
+        client=client)
+
+
+# Bulk Apply Operations
+async def _timed_call(operation, args, kwargs):
+    """
+    Runs one bulk item and wraps its outcome in a BulkResult.
+
+    :param operation: (coroutine function) – coroutine from this module.
+    :param args: (tuple) – positional arguments for the operation.
+    :param kwargs: (dict) – keyword arguments for the operation.
+    :return: BulkResult
+    """
+    start = time.monotonic()
+    try:
+        result = await operation(*args, **kwargs)
+        error = None
+    except Exception as e:
+        result = None
+        error = e
+    return cumulus.BulkResult(
+        operation.__name__,
+        args,
+        kwargs,
+        result,
+        error,
+        time.monotonic() - start
+    )
+
+
+async def bulk_apply(
+        items,
+        max_concurrency=256
+):
+    """
+    Runs many create_update, get, or delete coroutines concurrently.
+
+    At most max_concurrency items run at once. Writes under the same parent
+    resource, such as the subnets of one vnet, run one at a time in item
+    order, as they do under cumulus_v05.bulk_apply; an item made with
+    wait=False holds its parent until its task is done. Results come back
+    in the same order as items.
+
+    :param items: (list) – (operation, args) or (operation, args, kwargs)
+        tuples, where operation is one of the coroutines in this module.
+    :param max_concurrency: (int) – maximum number of items running at once.
+    :return: list of BulkResult(operation, args, kwargs, result, error,
+        elapsed)
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    parents = {}
+
+    async def run(operation, args, kwargs):
+        key = cumulus._parent_key(operation, args, kwargs)
+        if key is None:
+            async with semaphore:
+                return await _timed_call(operation, args, kwargs)
+        # Tasks reach the lock in item order, and asyncio.Lock is granted
+        # in the order it was asked for.
+        async with parents.setdefault(key, asyncio.Lock()):
+            async with semaphore:
+                result = await _timed_call(operation, args, kwargs)
+            if isinstance(result.result, asyncio.Future):
+                await asyncio.wait([result.result])
+            return result
+
+    return await asyncio.gather(*[
+        run(item[0], tuple(item[1]), dict(item[2]) if len(item) > 2 else {})
+        for item in items
+    ])
+
+# END OF CUMULUS_AIO.PY
\ No newline at end of file
@@ -0,0 +1,355 @@
+#!/usr/bin/python3
+#
+# cumulus_credentials.py
+#
+###############################################################################
+# Service principal credentials whose token is shared across processes.
+#
+# CachedServicePrincipalCredentials keeps the access token in an encrypted,
+# file-locked TokenCache shared by every process on the host, and renews it
+# in the background before it expires, so scripts started together get one
+# token between them.
+###############################################################################
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+import cumulus_v05 as cumulus
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, where msvcrt only has exclusive locks.
+    fcntl = None
+    import msvcrt
+
+authentication = cumulus._LazyModule('msrest.authentication')
+azure_active_directory = cumulus._LazyModule(
+    'msrestazure.azure_active_directory'
+)
+azure_cloud = cumulus._LazyModule('msrestazure.azure_cloud')
+fernet = cumulus._LazyModule('cryptography.fernet')
+
+
+# A token this close to expiry is refreshed before a request is signed.
+_MIN_TOKEN_TTL = 60
+
+
+def _token_ttl(token):
+    """
+    Returns the number of seconds an access token is still valid for.
+
+    :param token: (dict) – token as Azure AD returned it, or None.
+    :return: float, -inf without a token
+    """
+    expires = None
+    if token:
+        expires = token.get('expires_on') or token.get('expires_at')
+    if expires is None:
+        return float('-inf')
+    return float(expires) - time.time()
+
+
+class _FileLock(object):
+    """
+    Advisory lock held on a file, across processes and threads, for the
+    duration of a with block.
+
+    :param path: (str) – lock file, created if missing.
+    :param exclusive: (bool) – take an exclusive lock instead of a shared
+        one.
+    """
+
+    def __init__(self, path, exclusive=False):
+        self.path = path
+        self.exclusive = exclusive
+        self._fd = None
+
+    def __enter__(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if fcntl is not None:
+            fcntl.flock(
+                self._fd, fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH
+            )
+        else:
+            msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        os.close(self._fd)
+        self._fd = None
+
+
+class TokenCache(object):
+    """
+    Encrypted on-disk cache of access tokens, shared by every process that
+    uses the same directory.
+
+    Each token is kept in its own file, encrypted with Fernet under a key
+    derived from the secret it was issued for, so the file is of no use to
+    anyone who does not hold the secret already. Reads take a shared lock.
+    A process that finds the token stale takes an exclusive lock, then
+    reads the file again before asking Azure AD for a new token, so
+    processes that start together make one round trip between them.
+
+    :param directory: (str) – where the token files are kept.
+        ~/.cumulus/tokens when None.
+    """
+
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = os.path.join(
+                os.path.expanduser('~'), '.cumulus', 'tokens'
+            )
+        self.directory = directory
+        self.hits = 0
+        self.fetches = 0
+        self._lock = threading.Lock()
+
+    def get(self, name, secret, fetch, min_ttl=_MIN_TOKEN_TTL):
+        """
+        Returns a token from the cache, or from fetch if the cached one
+        expires within min_ttl seconds. A fetched token is stored.
+
+        :param name: (str) – identifies the token, e.g. the authority,
+            client ID, and resource it is for.
+        :param secret: (str) – secret the token is issued for.
+        :param fetch: (callable) – returns a new token dict.
+        :param min_ttl: (float) – seconds the token must still be valid.
+        :return: dict
+        """
+        cipher = self._cipher(name, secret)
+        path = os.path.join(
+            self.directory,
+            hashlib.sha256(name.encode('utf-8')).hexdigest()
+        )
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+        with _FileLock(path + '.lock'):
+            token = self._read(path, cipher)
+        if _token_ttl(token) <= min_ttl:
+            with _FileLock(path + '.lock', exclusive=True):
+                # Another process may have refreshed it while this one
+                # waited for the lock.
+                token = self._read(path, cipher)
+                if _token_ttl(token) <= min_ttl:
+                    token = fetch()
+                    self._write(path, cipher, token)
+                    with self._lock:
+                        self.fetches += 1
+                    return token
+        with self._lock:
+            self.hits += 1
+        return token
+
+    @staticmethod
+    def _cipher(name, secret):
+        """
+        Returns the Fernet cipher of one token file.
+
+        :param name: (str) – name of the token.
+        :param secret: (str) – secret the token is issued for.
+        :return: Fernet
+        """
+        key = hmac.new(
+            secret.encode('utf-8'), name.encode('utf-8'), hashlib.sha256
+        ).digest()
+        return fernet.Fernet(base64.urlsafe_b64encode(key))
+
+    @staticmethod
+    def _read(path, cipher):
+        """
+        Reads a token file.
+
+        :param path: (str) – token file.
+        :param cipher: (Fernet) – cipher of the file.
+        :return: dict, or None if the file is missing or unreadable
+        """
+        try:
+            with open(path, 'rb') as f:
+                return json.loads(cipher.decrypt(f.read()).decode('utf-8'))
+        except (OSError, ValueError, fernet.InvalidToken):
+            return None
+
+    @staticmethod
+    def _write(path, cipher, token):
+        """
+        Replaces a token file atomically, readable by its owner only.
+
+        :param path: (str) – token file.
+        :param cipher: (Fernet) – cipher of the file.
+        :param token: (dict) – token to store.
+        """
+        temporary = '{}.{}.tmp'.format(path, os.getpid())
+        fd = os.open(
+            temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+        )
+        with os.fdopen(fd, 'wb') as f:
+            f.write(cipher.encrypt(json.dumps(token).encode('utf-8')))
+        os.replace(temporary, path)
+
+
+class CachedServicePrincipalCredentials(object):
+    """
+    Service principal credentials whose access token is kept in a
+    TokenCache and refreshed in the background before it expires.
+
+    They can be used wherever ServicePrincipalCredentials are, including
+    with ClientHandle and Transport. Unlike ServicePrincipalCredentials,
+    building them sends no request: the token is read from the cache, or
+    fetched, the first time a request is signed. After that a daemon timer
+    renews it between refresh_margin and half of refresh_margin seconds
+    before it expires, at a random point so that processes sharing the
+    cache do not all wake at once.
+
+    :param client_id: (str) – application ID of the service principal.
+    :param secret: (str) – client secret of the service principal.
+    :param tenant: (str) – Azure AD tenant ID or domain.
+    :param cloud: (Cloud) – msrestazure.azure_cloud cloud definition.
+        AZURE_PUBLIC_CLOUD when None.
+    :param cache: (TokenCache) – cache to keep the token in. A TokenCache
+        in the default directory when None.
+    :param refresh_margin: (float) – seconds before expiry to renew the
+        token.
+    """
+
+    def __init__(self, client_id, secret, tenant, cloud=None, cache=None,
+                 refresh_margin=300):
+        self.client_id = client_id
+        self.secret = secret
+        self.tenant = tenant
+        self.cloud = cloud
+        self.cache = cache if cache is not None else TokenCache()
+        self.refresh_margin = refresh_margin
+        self.token = None
+        self._credentials = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def _name(self):
+        """
+        Returns the name the token is cached under.
+
+        :return: str
+        """
+        cloud = self.cloud or azure_cloud.AZURE_PUBLIC_CLOUD
+        return '{} {} {} {}'.format(
+            cloud.endpoints.active_directory,
+            self.tenant,
+            self.client_id,
+            cloud.endpoints.management
+        )
+
+    def _fetch(self):
+        """
+        Gets a new token from Azure AD.
+
+        :return: dict
+        :raises: AuthenticationError
+        """
+        if self._credentials is None:
+            kwargs = {'tenant': self.tenant, 'cached': True}
+            if self.cloud is not None:
+                kwargs['cloud_environment'] = self.cloud
+            self._credentials = \
+                azure_active_directory.ServicePrincipalCredentials(
+                    self.client_id, self.secret, **kwargs
+                )
+        self._credentials.set_token()
+        return dict(self._credentials.token)
+
+    def _refresh(self, min_ttl):
+        """
+        Loads a token valid for min_ttl more seconds and schedules its
+        renewal.
+
+        :param min_ttl: (float) – seconds the token must still be valid.
+        """
+        token = self.cache.get(self._name(), self.secret, self._fetch,
+                               min_ttl)
+        self.token = token
+        self._schedule(
+            _token_ttl(token)
+            - self.refresh_margin * random.uniform(0.5, 1.0)
+        )
+
+    def _schedule(self, delay):
+        """
+        Starts the timer of the next background renewal.
+
+        :param delay: (float) – seconds from now.
+        """
+        timer = threading.Timer(max(delay, 1.0), self._renew)
+        timer.daemon = True
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = timer
+        timer.start()
+
+    def _renew(self):
+        """
+        Renews the token from the background timer.
+        """
+        try:
+            with self._lock:
+                self._refresh(self.refresh_margin)
+        except Exception as e:
+            if cumulus.log_sink is not None:
+                cumulus.log_sink.emit(
+                    logging.WARNING,
+                    'renew_token',
+                    client_id=self.client_id,
+                    error=type(e).__name__,
+                    message=str(e)
+                )
+            # Try again while the current token is still good; past that,
+            # the next request renews it itself.
+            if _token_ttl(self.token) > _MIN_TOKEN_TTL:
+                self._schedule(30)
+
+    def signed_session(self):
+        """
+        Returns a requests session that sends the access token, renewing
+        the token first if it is about to expire.
+
+        :return: requests.Session
+        :raises: AuthenticationError
+        """
+        if _token_ttl(self.token) <= _MIN_TOKEN_TTL:
+            with self._lock:
+                if _token_ttl(self.token) <= _MIN_TOKEN_TTL:
+                    self._refresh(self.refresh_margin)
+        return authentication.BasicTokenAuthentication(
+            self.token
+        ).signed_session()
+
+    def refresh_session(self):
+        """
+        Returns a session signed with a newly fetched token. msrest calls
+        this when a token is rejected as expired.
+
+        :return: requests.Session
+        :raises: AuthenticationError
+        """
+        with self._lock:
+            self._refresh(float('inf'))
+        return self.signed_session()
+
+    def close(self):
+        """
+        Stops the background renewal.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
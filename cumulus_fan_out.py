@@ -0,0 +1,222 @@
+#!/usr/bin/python3
+#
+# cumulus_fan_out.py
+#
+###############################################################################
+# Runs cumulus_v05.py jobs across many subscriptions on a pool of processes.
+#
+# fan_out runs a job such as an InventoryJob for every subscription, and
+# every region of it, in worker processes that each build their own
+# credentials, clients, and connection pool once, and streams the results
+# back as they finish.
+###############################################################################
+
+import collections
+import os
+import pickle
+import time
+from concurrent import futures
+
+import cumulus_transport
+import cumulus_v05 as cumulus
+
+
+FanOutResult = collections.namedtuple(
+    'FanOutResult',
+    ['subscription_id', 'region', 'result', 'error', 'elapsed', 'worker']
+)
+
+# Credentials, cloud, and ClientRegistry of a fan_out worker process.
+_fan_out_worker = None
+
+
+class InventoryJob(object):
+    """
+    fan_out job that takes the inventory of a subscription and returns the
+    resources of some types, in one region or all of them.
+
+    The inventory is listed for the whole subscription whatever the region,
+    so run it with regions=None unless the list calls are cheap.
+
+    :param resource_types: (list) – types to return, e.g.
+        ['network_security_groups', 'route_tables']. All types when None.
+    :param raw: (str) – 'json' to return RawResource objects.
+    :param resource_group_names: (list) – only inventory these resource
+        groups.
+    """
+
+    def __init__(self, resource_types=None, raw=None,
+                 resource_group_names=None):
+        self.resource_types = resource_types
+        self.raw = raw
+        self.resource_group_names = resource_group_names
+
+    def __call__(self, client, region):
+        """
+        :param client: (ClientHandle) – clients of the subscription.
+        :param region: (str) – location to keep, or None for all.
+        :return: dict of resource type to list of resources
+        """
+        inventory = cumulus.take_inventory(
+            self.resource_group_names,
+            client=client,
+            raw=self.raw,
+            resource_types=self.resource_types
+        )
+        types = self.resource_types
+        if types is None:
+            types = sorted(inventory._by_type)
+        if region is not None:
+            # 'West US' and 'westus' name the same location.
+            region = region.replace(' ', '').lower()
+        found = {}
+        for resource_type in types:
+            resources = inventory.list(resource_type)
+            if region is not None:
+                resources = [
+                    r for r in resources
+                    if _location(r, inventory) == region
+                ]
+            found[resource_type] = resources
+        return found
+
+
+def _location(resource, inventory):
+    """
+    Returns the lower-cased location of a resource, or of its parent for
+    child resources, which have none of their own.
+
+    :param resource: model or RawResource.
+    :param inventory: (Inventory) – snapshot the resource came from.
+    :return: str, or None
+    """
+    location = resource.get('location') \
+        if isinstance(resource, cumulus.RawResource) \
+        else getattr(resource, 'location', None)
+    if location is None:
+        parent = inventory._by_id.get(resource.id.lower().rsplit('/', 2)[0])
+        if parent is not None and parent is not resource:
+            return _location(parent, inventory)
+        return None
+    return location.replace(' ', '').lower()
+
+
+def _fan_out_init(credentials, cloud):
+    """
+    Sets up a fan_out worker process: its own credentials, clients, and
+    connection pool.
+
+    :param credentials: credentials object, or a callable that builds one.
+    :param cloud: (Cloud) – cloud of every subscription.
+    """
+    global _fan_out_worker
+    if callable(credentials):
+        credentials = credentials()
+    _fan_out_worker = (
+        credentials,
+        cloud,
+        cumulus.ClientRegistry(transport=cumulus_transport.Transport())
+    )
+
+
+def _portable_error(error):
+    """
+    Returns an error the worker can send to the parent process. CloudError
+    cannot be unpickled, so errors that do not survive a round trip are
+    replaced by a RuntimeError with the same text and status_code.
+
+    :param error: (Exception) – error raised by the job.
+    :return: Exception
+    """
+    try:
+        return pickle.loads(pickle.dumps(error))
+    except Exception:
+        portable = RuntimeError('{}: {}'.format(type(error).__name__, error))
+        portable.status_code = getattr(error, 'status_code', None)
+        return portable
+
+
+def _fan_out_call(job, subscription_id, region):
+    """
+    Runs a job for one subscription and region in a worker process.
+
+    :return: FanOutResult
+    """
+    credentials, cloud, registry = _fan_out_worker
+    start = time.monotonic()
+    try:
+        client = registry.get(credentials, subscription_id, cloud)
+        result = job(client, region)
+        error = None
+    except Exception as e:
+        result = None
+        error = _portable_error(e)
+    return FanOutResult(
+        subscription_id,
+        region,
+        result,
+        error,
+        time.monotonic() - start,
+        os.getpid()
+    )
+
+
+def fan_out(
+        job,
+        subscription_ids,
+        credentials,
+        regions=None,
+        cloud=None,
+        max_workers=None
+):
+    """
+    Runs a job for every subscription, and every region of it, on a pool
+    of processes, and yields the results as they finish.
+
+    Each worker process builds its own credentials and clients once, and
+    reuses them for every subscription it is given, so the run scales with
+    the number of cores rather than being held to one by the GIL and the
+    global clients. Use CachedServicePrincipalCredentials so the workers
+    share one token.
+
+    :param job: (callable) – job(client, region) run in a worker, where
+        client is the ClientHandle of the subscription and region is one of
+        regions or None. It, its arguments, and its result must pickle, so
+        it has to be a module-level function or an object such as
+        InventoryJob.
+    :param subscription_ids: (list) – subscriptions to run the job for.
+    :param credentials: credentials object that pickles, or a module-level
+        callable, e.g. a functools.partial of
+        CachedServicePrincipalCredentials, that each worker calls once to
+        build its own.
+    :param regions: (list) – run the job once per subscription and region
+        instead of once per subscription.
+    :param cloud: (Cloud) – cloud of every subscription. AZURE_PUBLIC_CLOUD
+        when None.
+    :param max_workers: (int) – worker processes. One per core when None.
+    :return: generator of FanOutResult(subscription_id, region, result,
+        error, elapsed, worker) in the order they finish. error is any
+        exception the job raised and worker the process ID that ran it.
+    """
+    units = [
+        (subscription_id, region)
+        for subscription_id in subscription_ids
+        for region in (regions or [None])
+    ]
+    executor = futures.ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count(),
+        initializer=_fan_out_init,
+        initargs=(credentials, cloud)
+    )
+    pending = [
+        executor.submit(_fan_out_call, job, subscription_id, region)
+        for subscription_id, region in units
+    ]
+    try:
+        for future in futures.as_completed(pending):
+            yield future.result()
+    finally:
+        # The caller may stop early: drop what has not started.
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,311 @@
+#!/usr/bin/python3
+#
+# cumulus_journal.py
+#
+###############################################################################
+# Write-ahead journal for the bulk runs of cumulus_v05.py.
+#
+# bulk_apply and deploy_topology given a Journal record every create_update,
+# delete, and merge_subnets item as it is sent, accepted, and finished; run
+# again with the same journal after a crash, they skip the finished items
+# and resume the accepted ones from their poll URLs instead of sending them
+# again.
+###############################################################################
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import cumulus_v05 as cumulus
+
+
+def _journal_key(operation, args, kwargs):
+    """
+    Names a create_update, delete, or merge_subnets item in the journal.
+
+    :param operation: (callable) – function from this module.
+    :param args: (tuple) – positional arguments of the call.
+    :param kwargs: (dict) – keyword arguments of the call.
+    :return: str, or None for calls that are not journaled
+    """
+    if not operation.__name__.startswith(cumulus._WRITE_FUNCTIONS):
+        return None
+    return '{} {} {}'.format(
+        getattr(kwargs.get('client'), 'subscription_id', None) or '-',
+        operation.__name__,
+        cumulus._resource_path(operation, args)
+    )
+
+
+def _journal_digest(args, kwargs):
+    """
+    Hashes the arguments of a call, so an item whose parameters changed
+    since it was journaled is sent again.
+
+    :param args: (tuple) – positional arguments of the call.
+    :param kwargs: (dict) – keyword arguments of the call.
+    :return: str
+    """
+    kwargs = {k: v for k, v in kwargs.items() if k not in ('client', 'wait')}
+    text = json.dumps(
+        [args, kwargs],
+        sort_keys=True,
+        default=lambda value: vars(value) if hasattr(value, '__dict__')
+        else str(value)
+    )
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _poll_urls(handle):
+    """
+    Reads where a running operation can be polled from.
+
+    :param handle: (OperationHandle) – operation that has been accepted.
+    :return: dict with the method and URL of the initial request and the
+        Azure-AsyncOperation and Location URLs, or None if it is done
+    """
+    if handle.done():
+        return None
+    operation = handle.operation
+    return {
+        'method': operation.method,
+        'url': operation.initial_url,
+        'async_url': operation.async_url,
+        'location_url': operation.location_url,
+    }
+
+
+class Journal(object):
+    """
+    Write-ahead log of the create_update, delete, and merge_subnets items of
+    bulk runs, so a run that dies can be started again without paying twice
+    for what it already did.
+
+    Each item is recorded as intent before it is sent, submitted once the
+    service has accepted it, with the URLs its operation can be polled by,
+    and done or failed when it ends. Records are appended as JSON lines and
+    flushed to disk before the run goes on; a last line cut short by a
+    crash is ignored.
+
+    Given the journal, bulk_apply and deploy_topology skip the items that
+    are done with the same arguments, resume the submitted ones by polling
+    their operation instead of sending them again, and send the rest.
+
+    :param path: (str) – journal file, created if it does not exist.
+    :param sync: (bool) – fsync every record. Without it, a crash of the
+        host rather than the process can lose the last records.
+    """
+
+    def __init__(self, path, sync=True):
+        self.path = path
+        self.sync = sync
+        self._entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._entries[record['key']] = record
+        self._file = open(path, 'a')
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def entry(self, key):
+        """
+        Returns the last record of an item.
+
+        :param key: (str) – item key.
+        :return: dict with key, state, digest, time, and the fields of the
+            state, or None if the item was never journaled
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def entries(self, state=None):
+        """
+        Lists the last record of every item.
+
+        :param state: (str) – only the items in this state: 'intent',
+            'submitted', 'done', or 'failed'.
+        :return: list of dict
+        """
+        with self._lock:
+            return [e for e in self._entries.values()
+                    if state is None or e['state'] == state]
+
+    def record(self, key, state, digest, **fields):
+        """
+        Appends a record and waits for it to reach the disk.
+
+        :param key: (str) – item key.
+        :param state: (str) – 'intent', 'submitted', 'done', or 'failed'.
+        :param digest: (str) – digest of the item's arguments.
+        :param fields: other values to keep with the record.
+        :return: dict, the record
+        """
+        fields.update(key=key, state=state, digest=digest, time=time.time())
+        line = json.dumps(fields, sort_keys=True, default=str) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+            self._entries[key] = fields
+        return fields
+
+    def submitted(self, key, digest, model, handle):
+        """
+        Records that an item's operation was accepted, with the URLs to
+        poll it by. Operations that finished with their first response are
+        not recorded.
+
+        :param key: (str) – item key.
+        :param digest: (str) – digest of the item's arguments.
+        :param model: (str) – model name of the result, None for deletes.
+        :param handle: (OperationHandle) – the operation.
+        """
+        poll = _poll_urls(handle)
+        if poll is not None:
+            self.record(key, 'submitted', digest, model=model, poll=poll)
+
+    def finished(self, key, digest, result):
+        """
+        Records how an item ended, once its operation is done.
+
+        :param key: (str) – item key.
+        :param digest: (str) – digest of the item's arguments.
+        :param result: what the function returned: an OperationHandle, a
+            resource, or None if it caught a CloudError. The functions
+            return a handle for deletes too, so None is a failure for
+            every item.
+        """
+        if isinstance(result, cumulus.OperationHandle):
+            if not result.done():
+                result.add_done_callback(
+                    lambda handle: self.finished(key, digest, handle)
+                )
+                return
+            if result.exception() is not None:
+                self.record(key, 'failed', digest)
+                return
+            result = result.result()
+        elif result is None:
+            self.record(key, 'failed', digest)
+            return
+        if isinstance(result, cumulus.pipeline.ClientRawResponse):
+            result = result.output
+        self.record(key, 'done', digest, id=getattr(result, 'id', None))
+
+    def call(self, operation, args, kwargs):
+        """
+        Runs one bulk item under the journal: skips it if it is done,
+        resumes it if it was submitted, and sends it otherwise. bulk_apply
+        and deploy_topology run their items with it.
+
+        :param operation: (callable) – function from cumulus_v05 to call.
+        :param args: (tuple) – positional arguments for the operation.
+        :param kwargs: (dict) – keyword arguments for the operation.
+        :return: BulkResult. The result of a skipped item is its done
+            record.
+        """
+        key = _journal_key(operation, args, kwargs)
+        if key is None:
+            return cumulus._timed_call(operation, args, kwargs)
+        digest = _journal_digest(args, kwargs)
+        entry = self.entry(key)
+        if entry is not None and entry['digest'] == digest:
+            if entry['state'] == 'done':
+                return cumulus.BulkResult(
+                    operation.__name__, args, kwargs, entry, None, 0.0
+                )
+            if entry['state'] == 'submitted':
+                start = time.monotonic()
+                result = _resume(operation, args, kwargs, entry)
+                self.finished(key, digest, result)
+                return cumulus.BulkResult(
+                    operation.__name__,
+                    args,
+                    kwargs,
+                    result,
+                    None,
+                    time.monotonic() - start
+                )
+
+        self.record(key, 'intent', digest)
+        cumulus._journal_item.entry = (self, key, digest)
+        try:
+            result = cumulus._timed_call(operation, args, kwargs)
+        finally:
+            cumulus._journal_item.entry = None
+        self.finished(key, digest, result.result)
+        return result
+
+    def compact(self):
+        """
+        Rewrites the file with only the last record of every item.
+        """
+        with self._lock:
+            temporary = self.path + '.tmp'
+            with open(temporary, 'w') as f:
+                for record in self._entries.values():
+                    f.write(json.dumps(record, sort_keys=True, default=str))
+                    f.write('\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(temporary, self.path)
+            self._file = open(self.path, 'a')
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        with self._lock:
+            self._file.close()
+
+
+def _resume(operation, args, kwargs, entry):
+    """
+    Picks up the operation of a submitted item by polling the URLs in its
+    journal record, without sending the item again.
+
+    :param operation: (callable) – function from this module.
+    :param args: (tuple) – positional arguments of the call.
+    :param kwargs: (dict) – keyword arguments of the call.
+    :param entry: (dict) – the item's submitted record.
+    :return: OperationHandle, or None if the operation failed
+    """
+    poll = entry['poll']
+    headers = {}
+    if poll['async_url']:
+        headers['Azure-AsyncOperation'] = poll['async_url']
+    if poll['location_url']:
+        headers['Location'] = poll['location_url']
+    try:
+        handle = cumulus._poll_loop().track(
+            cumulus._operations(
+                cumulus._resource_type(operation), kwargs.get('client')
+            ),
+            entry.get('model'),
+            cumulus._response(poll['method'], poll['url'], 202, 'Accepted',
+                              headers, b''),
+            bool(kwargs.get('raw'))
+        )
+        if not kwargs.get('wait', True):
+            return handle
+        if entry.get('model') is None:
+            handle.wait()
+            cumulus._log_status(operation, handle, *args)
+        else:
+            cumulus._log_result(operation, handle.result())
+    except cumulus.azure_exceptions.CloudError as e:
+        cumulus._log_error(operation, e)
+        return None
+    return handle
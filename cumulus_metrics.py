@@ -0,0 +1,332 @@
+#!/usr/bin/python3
+#
+# cumulus_metrics.py
+#
+###############################################################################
+# Latency histograms for the calls of cumulus_v05.py.
+#
+# When cumulus_v05.metrics is set to a Metrics, every call records its
+# request latency, long running operation wall time, poll count, and errors
+# in HDR-style histograms per resource type and operation, exported as JSON
+# or Prometheus text.
+###############################################################################
+
+import collections
+import functools
+import json
+import math
+import threading
+import time
+
+import cumulus_v05 as cumulus
+
+
+class Histogram(object):
+    """
+    HDR-style histogram of non-negative values.
+
+    Values are counted in log-linear buckets: exactly below 2**precision
+    units, and to within 1 part in 2**(precision - 1) above, so at the
+    default precision a percentile is off by at most about 1.6% whatever
+    the range of the values. Memory grows with the number of buckets hit,
+    not the number of values.
+
+    :param unit: (float) – size of one unit, e.g. 1e-6 to record seconds to
+        the microsecond.
+    :param precision: (int) – significant bits kept of each value.
+    """
+
+    def __init__(self, unit=1.0, precision=7):
+        self.unit = unit
+        self.precision = precision
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._buckets = collections.Counter()
+
+    def record(self, value):
+        """
+        Counts one value.
+
+        :param value: (float) – value in the histogram's unit scale, e.g.
+            seconds.
+        """
+        units = max(int(value / self.unit), 0)
+        shift = max(units.bit_length() - self.precision, 0)
+        self._buckets[(shift, units >> shift)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def _upper(self, bucket):
+        shift, mantissa = bucket
+        return ((mantissa + 1) << shift) * self.unit
+
+    def buckets(self):
+        """
+        Returns the buckets hit.
+
+        :return: list of (upper bound, count) in ascending order
+        """
+        return [(self._upper(b), self._buckets[b])
+                for b in sorted(self._buckets)]
+
+    def percentile(self, p):
+        """
+        Returns the value below which p percent of the values fall.
+
+        :param p: (float) – percentile, 0 to 100.
+        :return: float, the upper bound of the bucket it falls in
+        """
+        if not self.count:
+            return 0.0
+        rank = max(int(math.ceil(p / 100.0 * self.count)), 1)
+        seen = 0
+        for upper, count in self.buckets():
+            seen += count
+            if seen >= rank:
+                return min(upper, self.max)
+        return self.max
+
+    def to_dict(self):
+        """
+        Summarizes the histogram.
+
+        :return: dict of count, sum, min, max, p50, p90, p99, p999, and
+            buckets
+        """
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'p999': self.percentile(99.9),
+            'buckets': self.buckets(),
+        }
+
+
+class Metrics(object):
+    """
+    Latency histograms and error counts for the create_update, get, and
+    delete functions, keyed by resource type and SDK operation.
+
+    Nothing is recorded while the global metrics is None. Set it to a
+    Metrics to record:
+
+    request_seconds – time to send the initial request of a long running
+        operation, or to complete a get (read cache hits included) or a
+        synchronous write.
+    operation_seconds – wall time of a long running operation, from its
+        initial request until it finished.
+    polls – status requests sent while waiting on an operation.
+    errors – failed calls and operations by exception class and HTTP
+        status.
+    """
+
+    _UNITS = {
+        'request_seconds': 1e-6,
+        'operation_seconds': 1e-6,
+        'polls': 1,
+    }
+
+    _HELP = {
+        'request_seconds': 'Initial request or get latency in seconds.',
+        'operation_seconds': 'Long running operation wall time in seconds.',
+        'polls': 'Status requests sent per long running operation.',
+    }
+
+    def __init__(self):
+        self._histograms = {}
+        self._errors = collections.Counter()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(method):
+        """
+        Returns the (resource type, operation) of an SDK method.
+        """
+        return cumulus._operations_type(method.__self__), method.__name__
+
+    def observe(self, name, resource_type, operation, value):
+        """
+        Records one value.
+
+        :param name: (str) – 'request_seconds', 'operation_seconds', or
+            'polls'.
+        :param resource_type: (str) – e.g. 'virtual_networks'.
+        :param operation: (str) – SDK method, e.g. 'create_or_update'.
+        :param value: (float) – value to record.
+        """
+        key = (name, resource_type, operation)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = Histogram(self._UNITS[name])
+                self._histograms[key] = histogram
+            histogram.record(value)
+
+    def error(self, resource_type, operation, error):
+        """
+        Counts one failure.
+
+        :param resource_type: (str) – e.g. 'virtual_networks'.
+        :param operation: (str) – SDK method, e.g. 'create_or_update'.
+        :param error: (Exception) – the failure.
+        """
+        status = getattr(error, 'status_code', None)
+        key = (
+            resource_type,
+            operation,
+            type(error).__name__,
+            str(status) if status is not None else ''
+        )
+        with self._lock:
+            self._errors[key] += 1
+
+    def histogram(self, name, resource_type, operation):
+        """
+        Returns a histogram, or None if nothing was recorded in it.
+
+        :return: Histogram
+        """
+        with self._lock:
+            return self._histograms.get((name, resource_type, operation))
+
+    def reset(self):
+        """
+        Forgets everything recorded.
+        """
+        with self._lock:
+            self._histograms.clear()
+            self._errors.clear()
+
+    # Hooks
+
+    def start(self, method):
+        """
+        Prepares to time a long running operation about to be started.
+
+        :param method: (callable) – SDK create_or_update or delete method.
+        :return: float start time for request_done and operation_started
+        """
+        return time.perf_counter()
+
+    def request_done(self, method, started, error=None):
+        """
+        Records a request.
+
+        :param method: (callable) – SDK method that sent it.
+        :param started: (float) – time.perf_counter() when it was sent.
+        :param error: (Exception) – the failure, if it failed.
+        """
+        resource_type, operation = self._key(method)
+        self.observe('request_seconds', resource_type, operation,
+                     time.perf_counter() - started)
+        if error is not None:
+            self.error(resource_type, operation, error)
+
+    def operation_started(self, method, started, handle):
+        """
+        Records the initial request of a long running operation and
+        arranges for the rest to be recorded when it finishes.
+
+        :param method: (callable) – SDK method that started it.
+        :param started: (float) – time.perf_counter() when it was sent.
+        :param handle: (OperationHandle) – the operation.
+        """
+        self.request_done(method, started)
+        handle.add_done_callback(
+            functools.partial(self._operation_done, method, started)
+        )
+
+    def _operation_done(self, method, started, handle):
+        resource_type, operation = self._key(method)
+        self.observe('operation_seconds', resource_type, operation,
+                     time.perf_counter() - started)
+        polls = handle.operation.requests \
+            if handle.operation is not None else 0
+        self.observe('polls', resource_type, operation, polls)
+        if handle.exception() is not None:
+            self.error(resource_type, operation, handle.exception())
+
+    # Export
+
+    def to_dict(self):
+        """
+        Returns everything recorded.
+
+        :return: dict with a list of histograms and a list of error counts
+        """
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            errors = sorted(self._errors.items())
+            return {
+                'histograms': [
+                    dict(name=name, resource_type=resource_type,
+                         operation=operation, **histogram.to_dict())
+                    for (name, resource_type, operation), histogram
+                    in histograms
+                ],
+                'errors': [
+                    {'resource_type': key[0], 'operation': key[1],
+                     'error': key[2], 'status': key[3], 'count': count}
+                    for key, count in errors
+                ],
+            }
+
+    def to_json(self, **kwargs):
+        """
+        Returns everything recorded as JSON.
+
+        :param kwargs: options for json.dumps, e.g. indent.
+        :return: str
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix='cumulus'):
+        """
+        Returns everything recorded in the Prometheus text exposition
+        format, one histogram per name, resource type, and operation.
+
+        :param prefix: (str) – prefix of every metric name.
+        :return: str
+        """
+        data = self.to_dict()
+        lines = []
+        for name in sorted(self._UNITS):
+            metric = '{}_{}'.format(prefix, name)
+            lines.append('# HELP {} {}'.format(metric, self._HELP[name]))
+            lines.append('# TYPE {} histogram'.format(metric))
+            for item in data['histograms']:
+                if item['name'] != name:
+                    continue
+                labels = 'resource_type="{}",operation="{}"'.format(
+                    item['resource_type'], item['operation'])
+                seen = 0
+                for upper, count in item['buckets']:
+                    seen += count
+                    lines.append('{}_bucket{{{},le="{:.6g}"}} {}'.format(
+                        metric, labels, upper, seen))
+                lines.append('{}_bucket{{{},le="+Inf"}} {}'.format(
+                    metric, labels, item['count']))
+                lines.append('{}_sum{{{}}} {:.6f}'.format(
+                    metric, labels, item['sum']))
+                lines.append('{}_count{{{}}} {}'.format(
+                    metric, labels, item['count']))
+        metric = '{}_errors_total'.format(prefix)
+        lines.append('# HELP {} Failed calls and operations.'.format(metric))
+        lines.append('# TYPE {} counter'.format(metric))
+        for item in data['errors']:
+            lines.append(
+                '{}{{resource_type="{}",operation="{}",error="{}",'
+                'status="{}"}} {}'.format(
+                    metric, item['resource_type'], item['operation'],
+                    item['error'], item['status'], item['count']))
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,340 @@
+#!/usr/bin/python3
+#
+# cumulus_polling.py
+#
+###############################################################################
+# Polling of the long running operations cumulus_v05.py starts.
+#
+# Every operation is polled by a PollLoop, from one thread, in due-time
+# order and under a request rate cap. Each resource type backs off on its
+# own PollingPolicy from POLLING_PROFILES, with exponential backoff and
+# jitter, and Retry-After is always honored. cumulus_v05 starts a loop of
+# its own unless cumulus_v05.poll_loop is set to one.
+###############################################################################
+
+import heapq
+import itertools
+import random
+import threading
+import time
+
+import cumulus_v05 as cumulus
+
+azure_operation = cumulus._LazyModule('msrestazure.azure_operation')
+
+
+class _PolledOperation(object):
+    """
+    LongRunningOperation wrapper that also remembers what PollLoop needs to
+    poll it. The status, resource, and status methods are the wrapped
+    operation's.
+
+    :param operations: SDK operations group that sent the initial request.
+    :param response: (requests.Response) – the initial response.
+    :param outputs: (callable) – deserializes the resource from a response.
+    """
+
+    def __init__(self, operations, response, outputs):
+        self._operation = azure_operation.LongRunningOperation(
+            response, outputs
+        )
+        # The generated operations groups keep their ServiceClient in
+        # _client; the SDK pollers send their status requests through it.
+        self.client = operations._client
+        self.initial_url = response.request.url
+        self.response = response
+        self.policy = polling_policy(operations)
+        self.attempts = 0
+        self.requests = 0
+        # Span of the call that started the operation, to trace polls under.
+        self.span = cumulus.tracer.current() \
+            if cumulus.tracer is not None else None
+
+    def __getattr__(self, name):
+        return getattr(self._operation, name)
+
+
+class PollLoop(object):
+    """
+    Polls many long running operations from a single thread.
+
+    Operations wait in a heap ordered by when their next status check is
+    due, and status requests are spaced so the loop never sends more than
+    max_polls_per_second of them, however many operations are in flight.
+    Each operation backs off according to its resource type's
+    PollingPolicy.
+
+    :param max_polls_per_second: (float) – cap on status requests sent.
+    """
+
+    def __init__(self, max_polls_per_second=20):
+        self.max_polls_per_second = max_polls_per_second
+        self._heap = []
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self._next_send = 0.0
+
+    def __len__(self):
+        with self._condition:
+            return len(self._heap)
+
+    def track(self, operations, model, response, raw=False):
+        """
+        Adds an operation whose initial request has been sent.
+
+        :param operations: SDK operations group that sent the request.
+        :param model: (str) – model name of the result, None for deletes.
+        :param response: (requests.Response) – the initial response.
+        :param raw: (bool) – resolve the handle to a ClientRawResponse.
+        :return: OperationHandle
+        :raises: CloudError
+        """
+        def outputs(response):
+            if model is None or response.status_code not in (200, 201):
+                return None
+            return operations._deserialize(model, response)
+
+        handle = cumulus.OperationHandle(raw=raw)
+        handle.operation = _PolledOperation(operations, response, outputs)
+        try:
+            handle.operation.set_initial_status(response)
+        except Exception as e:
+            raise self._cloud_error(e, response)
+
+        if azure_operation.finished(handle.operation.status):
+            self._finish(handle)
+        else:
+            self._schedule(handle, self._delay(handle.operation))
+        return handle
+
+    def stop(self):
+        """
+        Stops the polling thread. Operations still in flight never finish.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    @staticmethod
+    def _delay(operation):
+        """
+        Returns how long to wait before the next status check.
+
+        :param operation: (_PolledOperation) – operation to check.
+        :return: float
+        """
+        delay = operation.policy.delay(
+            operation.attempts, cumulus.retry_after(operation.response)
+        )
+        operation.attempts += 1
+        return delay
+
+    def _schedule(self, handle, delay):
+        """
+        Queues the next status check of an operation.
+
+        :param handle: (OperationHandle) – operation to check.
+        :param delay: (float) – seconds from now.
+        """
+        with self._condition:
+            heapq.heappush(
+                self._heap,
+                (time.monotonic() + delay, next(self._order), handle)
+            )
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='PollLoop'
+                )
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        """
+        Body of the polling thread.
+        """
+        while True:
+            with self._condition:
+                while True:
+                    if self._stopped:
+                        return
+                    now = time.monotonic()
+                    due = max(self._next_send, self._heap[0][0]) \
+                        if self._heap else None
+                    if due is not None and due <= now:
+                        break
+                    self._condition.wait(None if due is None else due - now)
+                handle = heapq.heappop(self._heap)[2]
+                self._next_send = now + 1.0 / self.max_polls_per_second
+
+            try:
+                if self._poll(handle.operation):
+                    self._finish(handle)
+                else:
+                    self._schedule(handle, self._delay(handle.operation))
+            except Exception as e:
+                handle.set_exception(
+                    self._cloud_error(e, handle.operation.response)
+                )
+
+    def _send(self, operation, url):
+        """
+        Sends one status request for an operation.
+
+        :param operation: (LongRunningOperation) – operation to check.
+        :param url: (str) – URL to GET.
+        :return: requests.Response
+        """
+        request = operation.client.get(url)
+        operation.requests += 1
+        if operation.span is None:
+            operation.response = operation.client.send(request)
+            return operation.response
+        cumulus.tracer.polling(operation.span)
+        try:
+            operation.response = operation.client.send(request)
+        finally:
+            cumulus.tracer.polling(None)
+        return operation.response
+
+    def _poll(self, operation):
+        """
+        Checks an operation once, the same way AzureOperationPoller does.
+
+        :param operation: (LongRunningOperation) – operation to check.
+        :return: True once the operation has finished
+        """
+        if operation.async_url:
+            response = self._send(operation, operation.async_url)
+            operation.set_async_url_if_present(response)
+            operation.get_status_from_async(response)
+        elif operation.location_url:
+            response = self._send(operation, operation.location_url)
+            operation.set_async_url_if_present(response)
+            operation.get_status_from_location(response)
+        elif operation.method == 'PUT':
+            response = self._send(operation, operation.initial_url)
+            operation.set_async_url_if_present(response)
+            operation.get_status_from_resource(response)
+        else:
+            raise azure_operation.BadResponse(
+                'Location header is missing from long running operation.'
+            )
+
+        if not azure_operation.finished(operation.status):
+            return False
+        if azure_operation.failed(operation.status):
+            raise azure_operation.OperationFailed(
+                'Operation failed or cancelled'
+            )
+        if operation.should_do_final_get():
+            response = self._send(operation, operation.initial_url)
+            operation.get_status_from_resource(response)
+        return True
+
+    def _finish(self, handle):
+        """
+        Resolves the handle of a finished operation.
+
+        :param handle: (OperationHandle) – finished operation.
+        """
+        if azure_operation.failed(handle.operation.status):
+            handle.set_exception(
+                cumulus.azure_exceptions.CloudError(handle.operation.response)
+            )
+        else:
+            handle.set_result(handle._output(
+                handle.operation.resource, handle.operation.response
+            ))
+
+    @staticmethod
+    def _cloud_error(error, response):
+        """
+        Converts a polling failure into the CloudError the SDK would raise.
+
+        :param error: (Exception) – failure raised while polling.
+        :param response: (requests.Response) – latest response.
+        :return: Exception
+        """
+        if isinstance(error, azure_operation.BadResponse):
+            return cumulus.azure_exceptions.CloudError(response, str(error))
+        if isinstance(error, (azure_operation.BadStatus,
+                              azure_operation.OperationFailed)):
+            return cumulus.azure_exceptions.CloudError(response)
+        return error
+
+
+# Polling Policies
+class PollingPolicy(object):
+    """
+    Exponential backoff with jitter for the status checks of one resource
+    type.
+
+    The n-th check (from 0) waits initial * factor ** n seconds, capped at
+    maximum, with up to jitter of it taken off at random so operations
+    started together spread out. A Retry-After from the service is used
+    when it asks for a longer wait.
+
+    :param initial: (float) – seconds before the first status check.
+    :param maximum: (float) – longest wait between two status checks.
+    :param factor: (float) – growth of the wait after each check.
+    :param jitter: (float) – fraction of the wait that is randomized.
+    """
+
+    def __init__(self, initial, maximum, factor=2, jitter=0.25):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+
+    def delay(self, attempt, retry_after=None):
+        """
+        Returns how long to wait before a status check.
+
+        :param attempt: (int) – number of status checks already made.
+        :param retry_after: (float) – Retry-After of the last response.
+        :return: float
+        """
+        delay = min(self.maximum, self.initial * self.factor ** attempt)
+        delay *= random.uniform(1 - self.jitter, 1)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+# Typical time to provision each resource type: a route is done in seconds,
+# a virtual network gateway takes 30 to 45 minutes.
+POLLING_PROFILES = {
+    'routes': PollingPolicy(1, 10),
+    'subnets': PollingPolicy(2, 15),
+    'route_tables': PollingPolicy(2, 15),
+    'network_security_groups': PollingPolicy(2, 15),
+    'public_ip_addresses': PollingPolicy(2, 15),
+    'network_interfaces': PollingPolicy(2, 15),
+    'virtual_network_peerings': PollingPolicy(2, 15),
+    'virtual_networks': PollingPolicy(3, 20),
+    'local_network_gateways': PollingPolicy(5, 30),
+    'express_route_circuit_authorizations': PollingPolicy(5, 30),
+    'express_route_circuits': PollingPolicy(15, 60),
+    'express_route_circuit_peerings': PollingPolicy(15, 60),
+    'virtual_network_gateway_connections': PollingPolicy(15, 60),
+    'resource_groups': PollingPolicy(15, 60),
+    'virtual_network_gateways': PollingPolicy(60, 300),
+}
+
+DEFAULT_POLLING_POLICY = PollingPolicy(5, 60)
+
+
+def polling_policy(operations):
+    """
+    Returns the PollingPolicy for the operations of an SDK operations group.
+
+    :param operations: SDK operations group, e.g.
+        network_client.virtual_network_gateways.
+    :return: PollingPolicy
+    """
+    return POLLING_PROFILES.get(
+        cumulus._operations_type(operations), DEFAULT_POLLING_POLICY
+    )
@@ -0,0 +1,319 @@
+#!/usr/bin/python3
+#
+# cumulus_rate_limit.py
+#
+###############################################################################
+# Subscription-wide pacing of the requests cumulus_v05.py sends.
+#
+# Setting cumulus_v05.rate_limiter to a RateLimiter paces every request with
+# per-subscription read and write token buckets that follow the
+# x-ms-ratelimit-remaining-subscription headers ARM returns, shared by all
+# threads, so bulk runs stay under the throttling limits.
+###############################################################################
+
+import re
+import threading
+import time
+
+import cumulus_v05 as cumulus
+
+
+_SUBSCRIPTION = re.compile(r'/subscriptions/([^/?#]+)', re.I)
+
+
+class _TokenBucket(object):
+    """
+    Read or write budget of one subscription.
+
+    :param kind: (str) – 'reads' or 'writes'.
+    :param capacity: (int) – requests allowed per window.
+    :param window: (float) – seconds the capacity is allowed over.
+    """
+
+    def __init__(self, kind, capacity, window):
+        self.kind = kind
+        self.capacity = capacity
+        self.rate = capacity / float(window)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.in_flight = 0
+        self.remaining = None
+        self.blocked_until = 0.0
+        self.waits = 0
+        self.waited = 0.0
+        self.throttled = 0
+
+    def refill(self, now):
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+
+class _ThrottledCredentials(object):
+    """
+    Credentials wrapper that sends every request signed with the wrapped
+    credentials through a RateLimiter.
+
+    :param credentials: msrestazure credentials object to wrap.
+    :param limiter: (RateLimiter) – limiter to pace requests with.
+    """
+
+    def __init__(self, credentials, limiter):
+        self._credentials = credentials
+        self._limiter = limiter
+
+    def __getattr__(self, name):
+        return getattr(self._credentials, name)
+
+    def signed_session(self):
+        return self._limiter.attach_session(
+            self._credentials.signed_session()
+        )
+
+    def refresh_session(self):
+        return self._limiter.attach_session(
+            self._credentials.refresh_session()
+        )
+
+
+class RateLimiter(object):
+    """
+    Paces requests to stay inside Resource Manager's per-subscription read
+    and write limits, across every thread that uses it.
+
+    Each subscription has a token bucket for reads (GET and HEAD) and one
+    for writes, holding up to the limit and refilled at limit / window per
+    second. A request takes a token, waiting for one if the bucket is
+    empty. A response resets its bucket to the
+    x-ms-ratelimit-remaining-subscription-reads or -writes count it
+    carries, less the requests still in flight. The buckets then follow
+    what ARM itself counts, including the requests of other processes and
+    tools. A 429 empties the bucket until its Retry-After has passed.
+
+    When the global rate_limiter is set, the clients the functions use are
+    attached to it on first use.
+
+    :param reads: (int) – reads allowed per subscription per window.
+    :param writes: (int) – writes allowed per subscription per window.
+    :param window: (float) – seconds the limits apply over.
+    :param reserve: (int) – requests of each kind to leave unused, for
+        other clients of the subscription.
+    """
+
+    def __init__(self, reads=12000, writes=1200, window=3600, reserve=0):
+        self.reads = reads
+        self.writes = writes
+        self.window = window
+        self.reserve = reserve
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def acquire(self, method, url):
+        """
+        Takes a token for a request, waiting until one is available.
+
+        :param method: (str) – HTTP method of the request.
+        :param url: (str) – request URL.
+        :return: the bucket to give back to release, or None if the
+            request is not for a subscription
+        """
+        with self._lock:
+            bucket = self._bucket(method, url)
+            if bucket is None:
+                return None
+            started = None
+            while True:
+                now = time.monotonic()
+                delay = self._delay(bucket, now)
+                if delay == 0:
+                    break
+                if started is None:
+                    started = now
+                    bucket.waits += 1
+                self._changed.wait(delay)
+            if started is not None:
+                bucket.waited += now - started
+            bucket.tokens -= 1
+            bucket.in_flight += 1
+        return bucket
+
+    def try_acquire(self, method, url):
+        """
+        Takes a token for a request if one is available now, for callers
+        that cannot block, such as coroutines.
+
+        :param method: (str) – HTTP method of the request.
+        :param url: (str) – request URL.
+        :return: (bucket, 0) with the bucket to give back to release,
+            (None, seconds) to try again after, or (None, 0) if the request
+            is not for a subscription
+        """
+        with self._lock:
+            bucket = self._bucket(method, url)
+            if bucket is None:
+                return None, 0
+            delay = self._delay(bucket, time.monotonic())
+            if delay != 0:
+                bucket.waits += 1
+                # The probe in flight ends with a response that cannot
+                # notify a coroutine: check again shortly.
+                return None, delay if delay is not None else 0.05
+            bucket.tokens -= 1
+            bucket.in_flight += 1
+        return bucket, 0
+
+    def _bucket(self, method, url):
+        """
+        Returns the bucket a request takes its token from, creating it on
+        first use. Called with the lock held.
+
+        :return: _TokenBucket, or None if the request is not for a
+            subscription
+        """
+        match = _SUBSCRIPTION.search(url)
+        if match is None:
+            return None
+        kind = 'reads' if method in ('GET', 'HEAD') else 'writes'
+        key = (match.group(1).lower(), kind)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _TokenBucket(
+                kind,
+                self.reads if kind == 'reads' else self.writes,
+                self.window
+            )
+            self._buckets[key] = bucket
+        return bucket
+
+    def _delay(self, bucket, now):
+        """
+        Returns how long a request has to wait for a token of bucket.
+        Called with the lock held.
+
+        :return: 0 to send now, seconds to wait, or None to wait until a
+            request in flight finishes
+        """
+        bucket.refill(now)
+        delay = max(
+            bucket.blocked_until - now,
+            (self.reserve + 1 - bucket.tokens) / bucket.rate
+        )
+        if delay > 0:
+            return delay
+        # Once ARM reports the budget spent, refilling is only an estimate:
+        # send one request at a time until a response shows budget again.
+        if bucket.in_flight and bucket.remaining is not None \
+                and bucket.remaining <= self.reserve:
+            return None
+        return 0
+
+    def release(self, bucket, response=None):
+        """
+        Gives back the request slot of acquire, and updates the bucket from
+        the response's rate limit headers.
+
+        :param bucket: what acquire returned.
+        :param response: (requests.Response) – the response, or None if the
+            request failed without one.
+        """
+        with self._lock:
+            bucket.in_flight -= 1
+            self._changed.notify_all()
+            if response is None:
+                return
+            now = time.monotonic()
+            bucket.refill(now)
+            remaining = response.headers.get(
+                'x-ms-ratelimit-remaining-subscription-' + bucket.kind
+            )
+            if remaining is not None:
+                bucket.remaining = int(remaining)
+                # The limit is higher than configured.
+                bucket.capacity = max(bucket.capacity, bucket.remaining)
+                bucket.tokens = bucket.remaining - bucket.in_flight
+            if response.status_code == 429:
+                bucket.throttled += 1
+                bucket.tokens = min(bucket.tokens, 0)
+                bucket.blocked_until = max(
+                    bucket.blocked_until,
+                    now + (cumulus.retry_after(response) or 1.0)
+                )
+
+    def credentials(self, credentials):
+        """
+        Wraps credentials so every client built with them is paced by this
+        limiter.
+
+        :param credentials: msrestazure credentials object.
+        :return: credentials object to give the client
+        """
+        return _ThrottledCredentials(credentials, self)
+
+    def attach(self, *clients):
+        """
+        Switches clients that already exist to this limiter. Clients that
+        are attached already are left as they are.
+
+        :param clients: (NetworkManagementClient or
+            ResourceManagementClient) – clients to switch.
+        """
+        for client in clients:
+            if getattr(client._client.creds, '_limiter', None) is self:
+                continue
+            with self._lock:
+                if getattr(client._client.creds, '_limiter', None) is self:
+                    continue
+                credentials = self.credentials(client.config.credentials)
+                client.config.credentials = credentials
+                # The ServiceClient keeps its own reference to the
+                # credentials.
+                client._client.creds = credentials
+
+    def attach_session(self, session):
+        """
+        Makes a session take a token before each request it sends.
+
+        :param session: (requests.Session) – session to pace.
+        :return: the session
+        """
+        send = session.send
+
+        def throttled_send(request, **kwargs):
+            bucket = self.acquire(request.method, request.url)
+            if bucket is None:
+                return send(request, **kwargs)
+            response = None
+            try:
+                response = send(request, **kwargs)
+            finally:
+                self.release(bucket, response)
+            return response
+
+        session.send = throttled_send
+        return session
+
+    def stats(self):
+        """
+        Reports the state of every bucket.
+
+        :return: dict of 'subscription reads' or 'subscription writes' to a
+            dict with the tokens left, the last remaining count ARM sent,
+            requests in flight, requests that had to wait and the seconds
+            they waited, and 429 responses
+        """
+        with self._lock:
+            now = time.monotonic()
+            stats = {}
+            for (subscription, kind), bucket in self._buckets.items():
+                bucket.refill(now)
+                stats['{} {}'.format(subscription, kind)] = {
+                    'tokens': bucket.tokens,
+                    'remaining': bucket.remaining,
+                    'in_flight': bucket.in_flight,
+                    'waits': bucket.waits,
+                    'waited_seconds': bucket.waited,
+                    'throttled': bucket.throttled,
+                }
+            return stats
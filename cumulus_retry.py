@@ -0,0 +1,339 @@
+#!/usr/bin/python3
+#
+# cumulus_retry.py
+#
+###############################################################################
+# Retries for the calls of cumulus_v05.py.
+#
+# Setting cumulus_v05.retry_policy to a RetryPolicy retries the calls of
+# every function that fail with a throttling, conflict, or transient error,
+# honoring Retry-After and waiting with decorrelated jitter, within a retry
+# budget shared by all calls. Long running operations that fail with a
+# retryable error are started again.
+###############################################################################
+
+import collections
+import logging
+import random
+import threading
+import time
+
+import cumulus_v05 as cumulus
+
+msrest_exceptions = cumulus._LazyModule('msrest.exceptions')
+
+
+# Statuses worth retrying, and Resource Manager error codes worth retrying
+# whatever status they come with.
+RETRYABLE_STATUS_CODES = frozenset([408, 429, 500, 502, 503, 504])
+RETRYABLE_ERROR_CODES = frozenset([
+    'AnotherOperationInProgress',
+    'GatewayTimeout',
+    'InternalServerError',
+    'OperationPreempted',
+    'ReferencedResourceNotProvisioned',
+    'ResourceGroupRequestsThrottled',
+    'RetryableError',
+    'ServerTimeout',
+    'ServiceUnavailable',
+    'SubscriptionRequestsThrottled',
+    'TooManyRequests',
+])
+
+
+def _error_code(error):
+    """
+    Reads the Resource Manager error code of a CloudError.
+
+    :param error: (Exception) – the error.
+    :return: str, or None if there is none
+    """
+    code = getattr(getattr(error, 'error', None), 'error', None)
+    return code if isinstance(code, str) else None
+
+
+class RetryPolicy(object):
+    """
+    Retries the calls of every function that fail with an error worth
+    retrying, within a retry budget shared by all of them.
+
+    classify sorts errors into throttled (429 and the throttling codes),
+    conflict (AnotherOperationInProgress), transient (the other retryable
+    statuses and codes, and connection failures) and permanent, which are
+    raised at once. Retries wait with decorrelated jitter: each wait is
+    drawn between base and three times the previous one, capped at
+    maximum, and is never shorter than the response's Retry-After.
+
+    Every call adds budget_ratio to the budget, up to budget, and every
+    retry takes one from it. When it is empty, errors are raised rather
+    than retried, so a failing service sees at most budget_ratio more
+    requests than it would without retries instead of attempts times as
+    many.
+
+    A long running operation that ends in Failed with a retryable code is
+    started again. When the global retry_policy is set, the SDK's own
+    retries on error statuses are turned off for the clients the functions
+    use, so requests are not retried by both, and turned back on once it is
+    unset.
+
+    :param attempts: (int) – tries per call, the first included.
+    :param base: (float) – shortest wait before a retry, seconds.
+    :param maximum: (float) – longest wait before a retry, seconds, unless
+        Retry-After asks for more.
+    :param budget: (float) – retries that can be made in a burst.
+    :param budget_ratio: (float) – retries earned by each call.
+    """
+
+    def __init__(self, attempts=5, base=1.0, maximum=60.0, budget=20,
+                 budget_ratio=0.1):
+        self.attempts = attempts
+        self.base = base
+        self.maximum = maximum
+        self.budget = budget
+        self.budget_ratio = budget_ratio
+        self.calls = 0
+        self.retries = collections.Counter()
+        self.exhausted = 0
+        self.denied = 0
+        self._tokens = float(budget)
+        self._lock = threading.Lock()
+
+    def classify(self, error):
+        """
+        Sorts an error by whether and why it is worth retrying.
+
+        :param error: (Exception) – error a call raised.
+        :return: 'throttled', 'conflict', 'transient', or None for errors
+            that are not worth retrying
+        """
+        if isinstance(error, msrest_exceptions.ClientRequestError):
+            return 'transient'
+        if not isinstance(error, cumulus.azure_exceptions.CloudError):
+            return None
+        code = _error_code(error)
+        if code == 'AnotherOperationInProgress':
+            return 'conflict'
+        if error.status_code == 429 or code in (
+                'ResourceGroupRequestsThrottled',
+                'SubscriptionRequestsThrottled',
+                'TooManyRequests'):
+            return 'throttled'
+        if error.status_code in RETRYABLE_STATUS_CODES \
+                or code in RETRYABLE_ERROR_CODES:
+            return 'transient'
+        return None
+
+    def call(self, method, call, *args, **kwargs):
+        """
+        Runs a synchronous call, retrying it while it fails with errors
+        worth retrying.
+
+        :param method: (callable) – SDK method the call is for.
+        :param call: (callable) – what to run, method itself or a wrapper of
+            it.
+        :param args: positional arguments for call.
+        :param kwargs: keyword arguments for call.
+        :return: what call returns
+        :raises: the last error
+        """
+        self._earn()
+        return self._retry(method, call, args, kwargs, 1, self.base)[0]
+
+    def operation(self, method, start, *args, **kwargs):
+        """
+        Starts a long running operation, retrying its initial request, and
+        starts it again if it fails with an error worth retrying.
+
+        :param method: (callable) – SDK method the operation is for.
+        :param start: (callable) – sends the initial request and returns an
+            OperationHandle.
+        :param args: positional arguments for start.
+        :param kwargs: keyword arguments for start.
+        :return: OperationHandle
+        :raises: the last error of the initial request
+        """
+        self._earn()
+        # The restarts run on timer threads; they record where to poll the
+        # operation under the journal item of this one.
+        retry = (
+            method,
+            start,
+            args,
+            kwargs,
+            getattr(cumulus._journal_item, 'entry', None)
+        )
+        inner, attempt, delay = self._retry(
+            method, start, args, kwargs, 1, self.base
+        )
+        handle = cumulus.OperationHandle()
+        self._follow(handle, inner, retry, attempt, delay)
+        return handle
+
+    def attach(self, *clients):
+        """
+        Turns off the SDK's retries on error statuses for clients, leaving
+        its retries of failed connections. The settings they had are kept
+        for detach.
+
+        :param clients: (NetworkManagementClient or
+            ResourceManagementClient) – clients to change.
+        """
+        for client in clients:
+            config = client.config.retry_policy
+            if getattr(config, '_saved_statuses', None) is not None:
+                continue
+            policy = config.policy
+            config._saved_statuses = (
+                policy.status_forcelist, policy.respect_retry_after_header
+            )
+            policy.status_forcelist = frozenset()
+            policy.respect_retry_after_header = False
+
+    @staticmethod
+    def detach(*clients):
+        """
+        Gives clients back the SDK's retries on error statuses that attach
+        turned off. Clients that are not attached are left as they are.
+
+        :param clients: (NetworkManagementClient or
+            ResourceManagementClient) – clients to change.
+        """
+        for client in clients:
+            config = client.config.retry_policy
+            saved = getattr(config, '_saved_statuses', None)
+            if saved is None:
+                continue
+            policy = config.policy
+            policy.status_forcelist, policy.respect_retry_after_header = saved
+            config._saved_statuses = None
+
+    def stats(self):
+        """
+        Reports what was retried.
+
+        :return: dict with the calls made, retries by kind of error, calls
+            that failed after every attempt, errors not retried because the
+            budget was empty, and the budget left
+        """
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'retries': dict(self.retries),
+                'exhausted': self.exhausted,
+                'denied': self.denied,
+                'budget': self._tokens,
+            }
+
+    def _earn(self):
+        with self._lock:
+            self.calls += 1
+            self._tokens = min(self.budget, self._tokens + self.budget_ratio)
+
+    def _delay(self, method, error, attempt, previous):
+        """
+        Decides whether to retry after an error, and takes the retry from
+        the budget if so.
+
+        :param method: (callable) – SDK method that failed.
+        :param error: (Exception) – the error.
+        :param attempt: (int) – tries made so far.
+        :param previous: (float) – the last wait, base before the first.
+        :return: seconds to wait before retrying, or None to give up
+        """
+        kind = self.classify(error)
+        if kind is None:
+            return None
+        with self._lock:
+            if attempt >= self.attempts:
+                self.exhausted += 1
+                return None
+            if self._tokens < 1:
+                self.denied += 1
+                return None
+            self._tokens -= 1
+            self.retries[kind] += 1
+
+        delay = min(self.maximum, random.uniform(self.base, previous * 3))
+        wait = cumulus.retry_after(getattr(error, 'response', None))
+        if wait is not None:
+            delay = max(delay, wait)
+        if cumulus.log_sink is not None:
+            cumulus.log_sink.emit(
+                logging.WARNING,
+                'retry',
+                operation='{}.{}'.format(
+                    cumulus._operations_type(method.__self__), method.__name__
+                ),
+                kind=kind,
+                attempt=attempt,
+                delay=round(delay, 3),
+                status=getattr(error, 'status_code', None),
+                message=str(error)
+            )
+        return delay
+
+    def _retry(self, method, call, args, kwargs, attempt, delay):
+        """
+        Runs call until it succeeds or an error is not to be retried.
+
+        :return: (result, tries made, last wait)
+        """
+        while True:
+            try:
+                return call(*args, **kwargs), attempt, delay
+            except Exception as e:
+                wait = self._delay(method, e, attempt, delay)
+                if wait is None:
+                    raise
+            time.sleep(wait)
+            attempt += 1
+            delay = wait
+
+    def _follow(self, handle, inner, retry, attempt, delay):
+        """
+        Resolves handle from the operation inner, or starts the operation
+        again when inner fails with an error worth retrying.
+
+        :param handle: (OperationHandle) – handle given to the caller.
+        :param inner: (OperationHandle) – the latest start.
+        :param retry: (tuple) – method, start, args and kwargs of the
+            operation, and the journal item it is sent under.
+        :param attempt: (int) – tries made so far.
+        :param delay: (float) – the last wait.
+        """
+        handle.poller = inner.poller
+        handle.operation = inner.operation
+
+        def done(inner):
+            error = inner.exception()
+            if error is None:
+                handle.set_result(inner.result())
+                return
+            wait = self._delay(retry[0], error, attempt, delay)
+            if wait is None:
+                handle.set_exception(error)
+                return
+            timer = threading.Timer(
+                wait, self._restart, (handle, retry, attempt + 1, wait)
+            )
+            timer.daemon = True
+            timer.start()
+
+        inner.add_done_callback(done)
+
+    def _restart(self, handle, retry, attempt, delay):
+        """
+        Starts a failed operation again, from a timer thread.
+        """
+        method, start, args, kwargs, item = retry
+        cumulus._journal_item.entry = item
+        try:
+            inner, attempt, delay = self._retry(
+                method, start, args, kwargs, attempt, delay
+            )
+        except Exception as e:
+            handle.set_exception(e)
+            return
+        finally:
+            cumulus._journal_item.entry = None
+        self._follow(handle, inner, retry, attempt, delay)
@@ -0,0 +1,325 @@
+#!/usr/bin/python3
+#
+# cumulus_tracing.py
+#
+###############################################################################
+# Tracing of the calls of cumulus_v05.py.
+#
+# When cumulus_v05.tracer is set to a Tracer, every call is traced as a
+# span with its HTTP requests and poll iterations, linked across threads
+# and under bulk_apply and deploy_topology runs, and written to a local file
+# as OpenTelemetry (OTLP) JSON.
+###############################################################################
+
+import functools
+import json
+import random
+import threading
+import time
+
+import cumulus_v05 as cumulus
+
+
+def _now():
+    """
+    Returns the time in nanoseconds since the Unix epoch.
+    """
+    return int(time.time() * 1e9)
+
+
+class Span(object):
+    """
+    One timed step of a trace.
+
+    :param name: (str) – what the span times.
+    :param parent: (Span) – enclosing span, None for a new trace.
+    :param kind: (int) – OpenTelemetry span kind, Span.INTERNAL or
+        Span.CLIENT.
+    :param attributes: (dict) – str, bool, int, or float values.
+    :param start: (int) – start time in Unix nanoseconds, now when None.
+    """
+
+    INTERNAL = 1
+    CLIENT = 3
+
+    def __init__(self, name, parent=None, kind=INTERNAL, attributes=None,
+                 start=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None \
+            else '{:032x}'.format(random.getrandbits(128))
+        self.span_id = '{:016x}'.format(random.getrandbits(64))
+        self.parent_id = parent.span_id if parent is not None else None
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.start = _now() if start is None else start
+        self.end = None
+        self.error = None
+        # Status requests of a long running operation, and when its last
+        # other request finished.
+        self.polls = []
+        self.request_end = None
+        self.previous = None
+
+    def to_otlp(self):
+        """
+        Returns the span in the OTLP JSON encoding.
+
+        :return: dict
+        """
+        attributes = []
+        for key, value in sorted(self.attributes.items()):
+            if isinstance(value, bool):
+                value = {'boolValue': value}
+            elif isinstance(value, int):
+                value = {'intValue': str(value)}
+            elif isinstance(value, float):
+                value = {'doubleValue': value}
+            else:
+                value = {'stringValue': str(value)}
+            attributes.append({'key': key, 'value': value})
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id or '',
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start),
+            'endTimeUnixNano': str(self.end),
+            'attributes': attributes,
+            'status': {},
+        }
+        if self.error is not None:
+            span['status'] = {'code': 2, 'message': str(self.error)}
+        return span
+
+
+class Tracer(object):
+    """
+    Traces the create_update, get, and delete functions into a local file.
+
+    Nothing is traced while the global tracer is None. Set it to a Tracer
+    to get, for every call, a tree of spans:
+
+        virtual_network_gateways.create_or_update   initial request until
+                                                    the operation finished
+            HTTP PUT                                the initial request
+            poll 1 .. poll n                        each wait and status
+                HTTP GET                            check, in order
+
+    bulk_apply and deploy_topology add a span for the whole run and one per
+    item, so the calls their worker threads make are linked to the run.
+
+    Spans are written in batches, each one line of JSON holding an OTLP
+    ExportTraceServiceRequest: the layout of the OpenTelemetry Collector's
+    file exporter, which OpenTelemetry tools can load.
+
+    :param path: (str) – file to append spans to.
+    :param service_name: (str) – service.name of the spans.
+    :param batch_size: (int) – spans held before they are written.
+    """
+
+    def __init__(self, path, service_name='cumulus', batch_size=512):
+        self.path = path
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self._finished = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def current(self):
+        """
+        Returns the span active on this thread.
+
+        :return: Span or None
+        """
+        return getattr(self._local, 'span', None)
+
+    def start_span(self, name, kind=Span.INTERNAL, attributes=None):
+        """
+        Starts a span under the active one and makes it active on this
+        thread.
+
+        :param name: (str) – what the span times.
+        :param kind: (int) – Span.INTERNAL or Span.CLIENT.
+        :param attributes: (dict) – attributes of the span.
+        :return: Span
+        """
+        span = Span(name, self.current(), kind, attributes)
+        span.previous = self.current()
+        self._local.span = span
+        return span
+
+    def finish(self, span, error=None):
+        """
+        Ends a span started on this thread and makes its parent active
+        again.
+
+        :param span: (Span) – span to end.
+        :param error: (Exception) – failure the span ended with.
+        """
+        self._local.span = span.previous
+        self.end(span, error)
+
+    def end(self, span, error=None, end=None):
+        """
+        Ends a span from any thread.
+
+        :param span: (Span) – span to end.
+        :param error: (Exception) – failure the span ended with.
+        :param end: (int) – end time in Unix nanoseconds, now when None.
+        """
+        span.end = _now() if end is None else end
+        span.error = error
+        with self._lock:
+            self._finished.append(span)
+            if len(self._finished) >= self.batch_size:
+                self._write()
+
+    def wrap(self, function, name=None, attributes=None):
+        """
+        Binds a function to the span active now, so the spans it starts on
+        another thread are linked under it.
+
+        :param function: (callable) – function to run elsewhere.
+        :param name: (str) – if given, also time each run in a span of
+            this name.
+        :param attributes: (dict) – attributes of that span.
+        :return: callable
+        """
+        parent = self.current()
+
+        def run(*args, **kwargs):
+            previous = self.current()
+            self._local.span = parent
+            span = self.start_span(name, attributes=attributes) \
+                if name is not None else None
+            try:
+                result = function(*args, **kwargs)
+            except Exception as e:
+                if span is not None:
+                    self.finish(span, e)
+                raise
+            finally:
+                self._local.span = previous
+            if span is not None:
+                self.end(span)
+            return result
+
+        return run
+
+    def flush(self):
+        """
+        Writes the spans that have ended.
+        """
+        with self._lock:
+            self._write()
+
+    def _write(self):
+        if not self._finished:
+            return
+        spans, self._finished = self._finished, []
+        request = {
+            'resourceSpans': [{
+                'resource': {'attributes': [{
+                    'key': 'service.name',
+                    'value': {'stringValue': self.service_name},
+                }]},
+                'scopeSpans': [{
+                    'scope': {'name': cumulus.__name__,
+                              'version': cumulus.__version__},
+                    'spans': [span.to_otlp() for span in spans],
+                }],
+            }],
+        }
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(request, separators=(',', ':')) + '\n')
+
+    # Hooks
+
+    def start_call(self, method, args):
+        """
+        Starts the span of an SDK call.
+
+        :param method: (callable) – SDK method being called.
+        :param args: (tuple) – positional arguments of the call.
+        :return: Span
+        """
+        operations = method.__self__
+        cumulus._add_hook(operations, self._record_request)
+        resource_type = cumulus._operations_type(operations)
+        return self.start_span(
+            '{}.{}'.format(resource_type, method.__name__),
+            attributes={
+                'cumulus.resource_type': resource_type,
+                'cumulus.operation': method.__name__,
+                'cumulus.resource_id': cumulus._resource_id(operations, args),
+            }
+        )
+
+    def operation_started(self, span, handle):
+        """
+        Hands the span of a long running operation over to whatever thread
+        waits on it, once its initial request has been sent.
+
+        :param span: (Span) – span of the call, active on this thread.
+        :param handle: (OperationHandle) – the operation.
+        """
+        self._local.span = span.previous
+        handle.add_done_callback(
+            functools.partial(self._operation_done, span)
+        )
+
+    def polling(self, span):
+        """
+        Marks the requests this thread sends from now on as status requests
+        of an operation, or stops if span is None.
+
+        :param span: (Span) – span of the operation.
+        """
+        self._local.polling = span
+
+    def _operation_done(self, span, handle):
+        previous = span.request_end or span.start
+        for number, request in enumerate(
+                sorted(span.polls, key=lambda r: r.start), 1):
+            poll = Span('poll', span, attributes={'cumulus.poll': number},
+                        start=previous)
+            request.parent_id = poll.span_id
+            self.end(request, request.error, request.end)
+            self.end(poll, None, request.end)
+            previous = request.end
+        self.end(span, handle.exception())
+
+    def _record_request(self, response, *args, **kwargs):
+        """
+        requests response hook adding a span for every request, while this
+        is the module's tracer. The hook stays on the client after it is
+        replaced or unset.
+        """
+        if cumulus.tracer is not self:
+            return
+        end = _now()
+        start = end - int(response.elapsed.total_seconds() * 1e9)
+        polled = getattr(self._local, 'polling', None)
+        parent = polled or self.current()
+        span = Span(
+            'HTTP ' + response.request.method,
+            parent,
+            Span.CLIENT,
+            {
+                'http.method': response.request.method,
+                'http.url': response.request.url,
+                'http.status_code': response.status_code,
+            },
+            start
+        )
+        if response.status_code >= 400:
+            span.error = '{} {}'.format(
+                response.status_code, response.reason)
+        if polled is not None:
+            span.end = end
+            polled.polls.append(span)
+            return
+        if parent is not None:
+            parent.request_end = end
+        self.end(span, span.error, end)
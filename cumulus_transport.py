@@ -0,0 +1,191 @@
+#!/usr/bin/python3
+#
+# cumulus_transport.py
+#
+###############################################################################
+# Connection pooling for the management clients of cumulus_v05.py.
+#
+# The SDK clients open a new requests session, and so a new connection and
+# TLS handshake, for every request. A Transport keeps one pool of keep-alive
+# connections that every client built with it shares:
+#
+#     transport = cumulus_transport.Transport(pool_maxsize=64)
+#     handle = cumulus_v05.ClientHandle(credentials, subscription_id,
+#                                       transport=transport)
+###############################################################################
+
+
+
+import cumulus_v05 as cumulus
+
+adapters = cumulus._LazyModule('requests.adapters')
+
+
+class _PooledAdapter(object):
+    """
+    HTTPAdapter wrapper whose connection pool outlives the sessions it is
+    mounted on. msrest closes its session after every request.
+
+    :param kwargs: keyword arguments for HTTPAdapter.
+    """
+
+    def __init__(self, **kwargs):
+        self._adapter = adapters.HTTPAdapter(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._adapter, name)
+
+    @property
+    def max_retries(self):
+        return self._adapter.max_retries
+
+    @max_retries.setter
+    def max_retries(self, value):
+        self._adapter.max_retries = value
+
+    def close(self):
+        pass
+
+    def shutdown(self):
+        """
+        Closes every pooled connection.
+        """
+        self._adapter.close()
+
+
+class _PooledCredentials(object):
+    """
+    Credentials wrapper that mounts a Transport's adapter on every session
+    the wrapped credentials sign.
+
+    :param credentials: msrestazure credentials object to wrap.
+    :param transport: (Transport) – transport to send requests through.
+    """
+
+    def __init__(self, credentials, transport):
+        self._credentials = credentials
+        self._transport = transport
+
+    def __getattr__(self, name):
+        return getattr(self._credentials, name)
+
+    def signed_session(self):
+        return self._transport.attach_session(
+            self._credentials.signed_session()
+        )
+
+    def refresh_session(self):
+        return self._transport.attach_session(
+            self._credentials.refresh_session()
+        )
+
+
+class Transport(object):
+    """
+    Shared pool of keep-alive HTTP connections for the management clients.
+
+    msrest builds a new requests session and HTTPAdapter for every request,
+    so by default every call pays for a new TCP connection and TLS
+    handshake. A Transport keeps one adapter, and so one connection pool
+    per host, for all the clients it is attached to.
+
+    :param pool_connections: (int) – number of hosts to keep pools for.
+    :param pool_maxsize: (int) – connections kept open per host. Size it to
+        the number of threads sending requests.
+    :param pool_block: (bool) – wait for a free connection rather than open
+        one that will not be kept when a host's pool is in use.
+    :param keep_alive: (bool) – keep connections open between requests.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=64,
+                 pool_block=False, keep_alive=True):
+        self.keep_alive = keep_alive
+        self.adapter = _PooledAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+
+    def credentials(self, credentials):
+        """
+        Wraps credentials so every client built with them uses this
+        transport.
+
+        :param credentials: msrestazure credentials object.
+        :return: credentials object to give the client
+        """
+        return _PooledCredentials(credentials, self)
+
+    def attach(self, *clients):
+        """
+        Switches clients that already exist, such as the global
+        network_client and resource_client, to this transport.
+
+        :param clients: (NetworkManagementClient or
+            ResourceManagementClient) – clients to switch.
+        """
+        for client in clients:
+            credentials = self.credentials(client.config.credentials)
+            client.config.credentials = credentials
+            # The ServiceClient keeps its own reference to the credentials.
+            client._client.creds = credentials
+
+    def attach_session(self, session):
+        """
+        Mounts the pooled adapter on a session signed by the credentials.
+
+        ServiceClient mounts a fresh HTTPAdapter before each request; the
+        session keeps the pooled one and only takes its retry settings.
+
+        :param session: (requests.Session) – session to send through.
+        :return: the session
+        """
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+            return session
+
+        adapter = self.adapter
+        for prefix in ('https://', 'http://'):
+            session.adapters[prefix] = adapter
+
+        def mount(prefix, replacement):
+            if prefix in ('https://', 'http://'):
+                adapter.max_retries = replacement.max_retries
+            else:
+                type(session).mount(session, prefix, replacement)
+
+        session.mount = mount
+        return session
+
+    def stats(self):
+        """
+        Reports how well connections are being reused.
+
+        :return: dict with the number of requests sent, connections opened
+            (each a TCP connect and TLS handshake), requests that reused a
+            connection, and the same counts per host
+        """
+        hosts = {}
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = '{}://{}:{}'.format(pool.scheme, pool.host, pool.port)
+            hosts[host] = {
+                'requests': pool.num_requests,
+                'connections': pool.num_connections,
+                'reused': pool.num_requests - pool.num_connections,
+            }
+        return {
+            'requests': sum(h['requests'] for h in hosts.values()),
+            'connections': sum(h['connections'] for h in hosts.values()),
+            'reused': sum(h['reused'] for h in hosts.values()),
+            'hosts': hosts,
+        }
+
+    def close(self):
+        """
+        Closes every pooled connection.
+        """
+        self.adapter.shutdown()
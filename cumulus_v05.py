@@ -45,11 +45,180 @@
 # Added Local Network Gateways Operation functions to test create_or_update,
 # delete, and get.
 ###############################################################################
+# Version 06
+# **********
+#
+# All create_update, delete, and get functions now return the poller or
+# resource they used to only print. Added bulk_apply to run many of these
+# calls concurrently on a bounded thread pool and collect per-item results
+# and timings.
+#
+# Added deploy_topology and plan_topology to work out the dependencies
+# between the create_update calls of a whole deployment and run each one as
+# soon as everything it references exists.
+#
+# Added a wait parameter to every create_update and delete function. With
+# wait=False they return an OperationHandle right after the request is
+# accepted instead of blocking on the long running operation.
+#
+# Added PollLoop. Every long running operation is polled from one thread,
+# in due-time order and under a request rate cap, instead of by an SDK
+# poller thread per operation. Setting the global poll_loop replaces the
+# module's own loop, e.g. to change the rate cap.
+#
+# Added PollingPolicy and POLLING_PROFILES. Each resource type now polls on
+# its own schedule, with exponential backoff and jitter, and Retry-After is
+# always honored.
+#
+# Added ReadCache. When the global read_cache is set, the get functions are
+# served from memory for a TTL, revalidated with If-None-Match once stale,
+# and dropped or refreshed by the matching create_update and delete calls.
+#
+# Added take_inventory to load every resource type this module manages with
+# a handful of paged list calls instead of one get per resource, into an
+# indexed Inventory that also primes the read cache.
+#
+# Added ClientRegistry and ClientHandle. Every function takes an optional
+# client handle, so one process can drive several clouds, subscriptions,
+# and credentials at once. The global clients are still used by default.
+#
+# Added Transport, a shared pool of keep-alive HTTP connections for the
+# management clients, with connection reuse statistics.
+#
+# Added Metrics. When the global metrics is set, every call records its
+# request latency, long running operation wall time, poll count, and errors
+# in HDR-style histograms per resource type and operation, exported as JSON
+# or Prometheus text.
+#
+# Added Tracer. When the global tracer is set, every call is traced as a
+# span with its HTTP requests and poll iterations, linked across threads
+# and under bulk_apply and deploy_topology runs, and written to a local file
+# as OpenTelemetry (OTLP) JSON.
+#
+# Replaced every print with structured records sent to the global log_sink,
+# a LogSink that filters by level, samples, and writes from a background
+# thread, as text or JSON lines. Records carry the resource ID and
+# provisioning state; the full resource is only logged at DEBUG.
+#
+# The custom_headers, raw, and expand parameters are now passed on to the
+# SDK instead of being dropped. raw=True on a create_update or delete
+# returns a ClientRawResponse of the final response once the operation has
+# finished. raw='json' on a get, or on take_inventory, skips deserializing
+# and returns RawResource objects that keep the JSON bytes and parse them
+# on first access.
+#
+# Importing the module no longer imports msrest, msrestazure, or requests;
+# they are imported by the first function that needs them. Setting the
+# global default_client to a ClientHandle builds the network and resource
+# clients, and imports their SDKs, only when a function first uses them.
+#
+# Added CachedServicePrincipalCredentials and TokenCache. The access token
+# is kept in an encrypted, file-locked cache shared by every process on the
+# host, and renewed in the background before it expires, so scripts
+# started together get one token between them.
+#
+# Added RateLimiter. Setting the global rate_limiter paces every request
+# with per-subscription read and write token buckets that follow the
+# x-ms-ratelimit-remaining-subscription headers ARM returns, shared by all
+# threads, so bulk runs stay under the throttling limits.
+#
+# Added RetryPolicy. Setting the global retry_policy retries the calls of
+# every function that fail with a throttling, conflict, or transient error,
+# honoring Retry-After and waiting with decorrelated jitter, within a retry
+# budget shared by all calls. Long running operations that fail with a
+# retryable error are started again.
+#
+# Added ParentScheduler. bulk_apply and deploy_topology now run the writes
+# under one vnet, route table, or ExpressRoute circuit one at a time, in
+# order, while different parents still run in parallel, instead of failing
+# with AnotherOperationInProgress.
+#
+# Added cumulus_aio.py, an asyncio version of every create_update, get, and
+# delete function that sends its requests with aiohttp and polls long
+# running operations without a thread per call.
+#
+# Added fan_out and InventoryJob to run a job such as an inventory across
+# many subscriptions and regions on a pool of processes, each with its own
+# clients, streaming the results back as they finish. take_inventory can
+# now be limited to some resource types.
+#
+# Added Journal. bulk_apply and deploy_topology given a journal record
+# every create_update and delete item as it is sent, accepted, and
+# finished; run again with the same journal after a crash, they skip the
+# finished items and resume the accepted ones from their poll URLs instead
+# of sending them again.
+#
+# Added ChangeDetector. With the global change_detector set, create_update
+# functions read the resource first and skip the PUT when it already
+# matches the parameters, so applying an unchanged configuration only
+# costs reads.
+#
+# Added merge_subnets, which writes many subnets of a virtual network in
+# one PUT of the virtual network, guarded by its etag, instead of one PUT
+# and one long running operation per subnet.
+#
+# Moved the infrastructure out of this module: Transport to
+# cumulus_transport.py, RateLimiter to cumulus_rate_limit.py, RetryPolicy to
+# cumulus_retry.py, CachedServicePrincipalCredentials and TokenCache to
+# cumulus_credentials.py, PollLoop and PollingPolicy to cumulus_polling.py,
+# Metrics to cumulus_metrics.py, Tracer to cumulus_tracing.py, Journal to
+# cumulus_journal.py, and fan_out to cumulus_fan_out.py. The globals that
+# hold them stay here.
+###############################################################################
 
 __author__ = 'rafael'
 __version__ = '0.0'
 
-from msrestazure import azure_exceptions
+import atexit
+import collections
+import copy
+import enum
+import functools
+import importlib
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from concurrent import futures
+from email import utils as email_utils
+from urllib import parse
+
+
+class _LazyModule(object):
+    """
+    Stands in for a module and imports it when one of its attributes is
+    first read.
+
+    :param name: (str) – full name of the module.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attribute):
+        value = getattr(importlib.import_module(self._name), attribute)
+        # Later reads find the attribute on the proxy itself.
+        setattr(self, attribute, value)
+        return value
+
+
+# msrest, msrestazure, and requests take most of the time to import this
+# module, and the SDK packages cost as much again, so none of them is
+# imported until a function first needs it.
+azure_exceptions = _LazyModule('msrestazure.azure_exceptions')
+models = _LazyModule('requests.models')
+structures = _LazyModule('requests.structures')
+pipeline = _LazyModule('msrest.pipeline')
+# Modules split out of this one. They import it for its globals, so they
+# are imported when a function here first needs them.
+cumulus_polling = _LazyModule('cumulus_polling')
+cumulus_retry = _LazyModule('cumulus_retry')
 
 # Cloud definitions:
 # AZURE_PUBLIC_CLOUD
@@ -62,8 +231,21 @@ Create create_update, delete, and get functions for each networknclass at
 https://azure-sdk-for-python.readthedocs.io/en/latest/ref/azure.mgmt.network.v2017_03_01.operations.html
 '''
 
+# Default clients used by every function that is not given a ClientHandle.
 network_client = None
 resource_client = None
+# ClientHandle to use when the default clients are not set. It builds each
+# client, and imports its SDK, the first time a function needs it.
+default_client = None
+rate_limiter = None
+retry_policy = None
+# cumulus_polling.PollLoop to poll long running operations with. The module
+# starts its own when this is None.
+poll_loop = None
+read_cache = None
+change_detector = None
+metrics = None
+tracer = None
 
 
 # Resource Group Operations
@@ -71,7 +253,9 @@ def create_update_resource_group(
         resource_group_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Creates or updates a resource group.
@@ -83,24 +267,41 @@ def create_update_resource_group(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        resource_client.
     :return: ResourceGroup or ClientRawResponse if raw=true
     """
 
     try:
-        rg_info = resource_client.resource_groups.create_or_update(
+        rg_info = _write(
+            _resource(client).resource_groups.create_or_update,
             resource_group_name,
-            parameters
+            parameters,
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(rg_info.properties.provisioning_state)
+        if read_cache is not None:
+            read_cache.update(
+                _resource(client).resource_groups,
+                (resource_group_name,),
+                rg_info
+            )
+        if not wait:
+            return OperationHandle(value=rg_info)
+        _log_result(create_update_resource_group, rg_info)
+        return rg_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_resource_group, e)
 
 
 def get_resource_group(
         resource_group_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        client=None
 ):
     """
     Gets a resource group.
@@ -108,25 +309,35 @@ def get_resource_group(
     :param resource_group_name: (str) – The name of the resource group to
         create or update.
     :param custom_headers: (dict) – headers that will be added to the request
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized
+    :param client: (ClientHandle) – clients to use instead of the global
+        resource_client.
     :return: ResourceGroup or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     """
 
     try:
-        rg_info = resource_client.resource_groups.get(
-            resource_group_name
+        rg_info = _read(
+            _resource(client).resource_groups.get,
+            resource_group_name,
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(rg_info)
+        _log_result(get_resource_group, rg_info)
+        return rg_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_resource_group, e)
 
 
 def delete_resource_group(
         resource_group_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Deletes a resource group.
@@ -136,21 +347,30 @@ def delete_resource_group(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns None or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        resource_client.
+    :return: OperationHandle that returns None or
         ClientRawResponse if raw=true
     """
 
     try:
-        rg_info = resource_client.resource_groups.delete(
+        rg_info = _start_operation(
+            _resource(client).resource_groups.delete,
+            None,
             resource_group_name,
-            custom_headers=None,
-            raw=False)
+            custom_headers=custom_headers,
+            raw=raw)
+        if not wait:
+            return rg_info
         rg_info.wait()
 
-        print(rg_info.status())
+        _log_status(delete_resource_group, rg_info, resource_group_name)
+        return rg_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(delete_resource_group, e)
 
 
 # Virtual Networks Operations:
@@ -159,7 +379,9 @@ def create_update_virtual_networks(
         virtual_network_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Creates or updates a virtual network in the specified resource group.
@@ -173,23 +395,32 @@ def create_update_virtual_networks(
     :param custom_headers: (dict) – headers that will be added to the request.
     :param raw: (bool) – returns the direct response alongside the deserialized
         response.
-    :return: AzureOperationPoller instance that returns Subnet or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns Subnet or
         ClientRawResponse if raw=true
     :raises: CloudError
     """
 
     try:
-        vnet_info = network_client.virtual_networks.create_or_update(
+        vnet_info = _start_operation(
+            _network(client).virtual_networks.create_or_update,
+            'VirtualNetwork',
             resource_group_name,
             virtual_network_name,
             parameters,
-            custom_headers=None,
-            raw=False)
+            custom_headers=custom_headers,
+            raw=raw)
+        if not wait:
+            return vnet_info
         vnet_info.wait()
-        print(vnet_info.result().provisioning_state)
+        _log_result(create_update_virtual_networks, vnet_info.result())
+        return vnet_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_virtual_networks, e)
 
 
 def get_virtual_networks(
@@ -197,7 +428,8 @@ def get_virtual_networks(
         virtual_network_name,
         expand=None,
         custom_headers=None,
-        raw=False
+        raw=False,
+        client=None
 ):
     """
     Gets the specified virtual network by resource group.
@@ -208,30 +440,38 @@ def get_virtual_networks(
     :param virtual_network_name: (str) – The name of the virtual network.
     :param expand: (str) – Expands referenced resources.
     :param custom_headers: (dict) – headers that will be added to the request.
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
     :return: VirtualNetwork or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     :raises: CloudError
     """
     try:
-        vnet_info = network_client.virtual_networks.get(
+        vnet_info = _read(
+            _network(client).virtual_networks.get,
             resource_group_name,
             virtual_network_name,
-            expand=None,
-            custom_headers=None,
-            raw=False)
+            expand=expand,
+            custom_headers=custom_headers,
+            raw=raw)
 
-        print(vnet_info)
+        _log_result(get_virtual_networks, vnet_info)
+        return vnet_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_virtual_networks, e)
 
 
 def delete_virtual_networks(
         resource_group_name,
         virtual_network_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Deletes the specified virtual network.
@@ -243,24 +483,38 @@ def delete_virtual_networks(
     :param custom_headers: (dict) – headers that will be added to the request.
     :param raw: (bool) – returns the direct response alongside the deserialized
         response.
-    :return: AzureOperationPoller instance that returns None or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns None or
         ClientRawResponse if raw=true
     :raises: CloudError
     """
 
     try:
-        vnet_info = network_client.virtual_networks.delete(
+        vnet_info = _start_operation(
+            _network(client).virtual_networks.delete,
+            None,
             resource_group_name,
             virtual_network_name,
-            custom_headers=None,
-            raw=False)
+            custom_headers=custom_headers,
+            raw=raw)
+        if not wait:
+            return vnet_info
 
         #do we need the wait?
         vnet_info.wait()
-        print(vnet_info.status())
+        _log_status(
+            delete_virtual_networks,
+            vnet_info,
+            resource_group_name,
+            virtual_network_name
+        )
+        return vnet_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(delete_virtual_networks, e)
 
 
 # Subnets Operations:
@@ -270,7 +524,9 @@ def create_update_subnets(
         subnet_name,
         subnet_parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ): 
     """
     Creates or updates a subnet in the specified virtual network.
@@ -285,23 +541,32 @@ def create_update_subnets(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns Subnet or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns Subnet or
         ClientRawResponse if raw=true
     :raises: CloudError
     """
     try:
-        subnet_creation = network_client.subnets.create_or_update(
+        subnet_creation = _start_operation(
+            _network(client).subnets.create_or_update,
+            'Subnet',
             resource_group_name,
             virtual_network_name,
             subnet_name,
             subnet_parameters,
-            custom_headers=None,
-            raw=False
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(subnet_creation.result().provisioning_state)
+        if not wait:
+            return subnet_creation
+        _log_result(create_update_subnets, subnet_creation.result())
+        return subnet_creation
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_subnets, e)
 
 
 def get_subnets(
@@ -310,7 +575,8 @@ def get_subnets(
         subnet_name,
         expand=None,
         custom_headers=None,
-        raw=False
+        raw=False,
+        client=None
 ):
     """
     Gets the specified subnet by virtual network and resource group.
@@ -322,24 +588,30 @@ def get_subnets(
     :param subnet_name: (str) – The name of the subnet.
     :param expand: (str) – Expands referenced resources.
     :param custom_headers: (dict) – headers that will be added to the request
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
     :return: Subnet or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     :raises: CloudError
     """
     try:
-        subnet_info = network_client.subnets.get(
+        subnet_info = _read(
+            _network(client).subnets.get,
             resource_group_name,
             virtual_network_name,
             subnet_name,
-            expand=None,
-            custom_headers=None,
-            raw=False
+            expand=expand,
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(subnet_info)
+        _log_result(get_subnets, subnet_info)
+        return subnet_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_subnets, e)
 
 
 def delete_subnets(
@@ -347,7 +619,9 @@ def delete_subnets(
         virtual_network_name,
         subnet_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Deletes the specified subnet.
@@ -360,24 +634,127 @@ def delete_subnets(
     :param custom_headers: (dict) – headers that will be added to the request.
     :param raw: (bool) – returns the direct response alongside the deserialized
         response.
-    :return: AzureOperationPoller instance that returns Subnet or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns Subnet or
         ClientRawResponse if raw=true.
     :raises: CloudError
     """
 
     try:
-        subnet_info = network_client.subnets.delete(
+        subnet_info = _start_operation(
+            _network(client).subnets.delete,
+            None,
             resource_group_name,
             virtual_network_name,
             subnet_name,
-            custom_headers=None,
-            raw=False
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return subnet_info
         subnet_info.wait()
-        print(subnet_info.status())
+        _log_status(
+            delete_subnets,
+            subnet_info,
+            resource_group_name,
+            virtual_network_name,
+            subnet_name
+        )
+        return subnet_info
+
+    except azure_exceptions.CloudError as e:
+        _log_error(delete_subnets, e)
+
+
+def merge_subnets(
+        resource_group_name,
+        virtual_network_name,
+        subnets,
+        custom_headers=None,
+        raw=False,
+        wait=True,
+        client=None,
+        attempts=3
+):
+    """
+    Creates or updates many subnets of a virtual network with one write of
+    the virtual network, instead of one write per subnet.
+
+    The virtual network is read, the subnets are merged into it by name,
+    replacing the ones it has and adding the others, and it is written back
+    with If-Match set to the etag it was read with. A write to it made in
+    between fails the PUT with 412 Precondition Failed instead of being
+    overwritten, and the merge is done again on a fresh read, up to
+    attempts times. Subnets that are not given keep what they have.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_name: (str) – The name of an existing virtual
+        network.
+    :param subnets: (list) – Subnet objects, each with its name set.
+    :param custom_headers: (dict) – headers that will be added to the
+        requests.
+    :param raw: (bool) – returns the direct response alongside the deserialized
+        response.
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :param attempts: (int) – times to read, merge, and write before giving
+        up on a virtual network that keeps changing.
+    :return: OperationHandle that returns VirtualNetwork or
+        ClientRawResponse if raw=true
+    :raises: CloudError, ValueError
+    """
+    if not all(getattr(subnet, 'name', None) for subnet in subnets):
+        raise ValueError('merge_subnets needs the name of every subnet')
+    operations = _network(client).virtual_networks
+
+    try:
+        for attempt in range(attempts):
+            vnet = _read(
+                operations.get,
+                resource_group_name,
+                virtual_network_name,
+                custom_headers=custom_headers,
+                raw=True
+            ).output
+            merged = list(vnet.subnets or [])
+            index = {subnet.name.lower(): i for i, subnet in enumerate(merged)}
+            for subnet in subnets:
+                i = index.get(subnet.name.lower())
+                if i is None:
+                    index[subnet.name.lower()] = len(merged)
+                    merged.append(subnet)
+                else:
+                    merged[i] = subnet
+            vnet.subnets = merged
+
+            headers = dict(custom_headers or {})
+            headers['If-Match'] = vnet.etag
+            try:
+                vnet_info = _start_operation(
+                    operations.create_or_update,
+                    'VirtualNetwork',
+                    resource_group_name,
+                    virtual_network_name,
+                    vnet,
+                    custom_headers=headers,
+                    raw=raw
+                )
+                break
+            except azure_exceptions.CloudError as e:
+                if e.status_code != 412 or attempt == attempts - 1:
+                    raise
+        if not wait:
+            return vnet_info
+        _log_result(merge_subnets, vnet_info.result())
+        return vnet_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(merge_subnets, e)
 
 
 # Route Tables Operations
@@ -386,7 +763,9 @@ def create_update_route_tables(
         route_table_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Create or updates a route table in a specified resource group.
@@ -400,22 +779,31 @@ def create_update_route_tables(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns RouteTable or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns RouteTable or
         ClientRawResponse if raw=true
     """
 
     try:
-        route_table_creation = network_client.route_tables.create_or_update(
+        route_table_creation = _start_operation(
+            _network(client).route_tables.create_or_update,
+            'RouteTable',
             resource_group_name,
             route_table_name,
             parameters,
-            custom_headers=None,
-            raw=False
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(route_table_creation.result().provisioning_state)
+        if not wait:
+            return route_table_creation
+        _log_result(create_update_route_tables, route_table_creation.result())
+        return route_table_creation
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_route_tables, e)
 
 
 def get_route_tables(
@@ -423,7 +811,8 @@ def get_route_tables(
         route_table_name,
         expand=None,
         custom_headers=None,
-        raw=False
+        raw=False,
+        client=None
 ):
     """
     Gets the specified route table.
@@ -434,30 +823,38 @@ def get_route_tables(
     :param route_table_name: (str) – The name of the route table.
     :param expand: (str) – Expands referenced resources.
     :param custom_headers: (dict) – headers that will be added to the request
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
     :return: RouteTable or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     """
 
     try:
-        route_table_info = network_client.route_tables.get(
+        route_table_info = _read(
+            _network(client).route_tables.get,
             resource_group_name,
             route_table_name,
-            expand=None,
-            custom_headers=None,
-            raw=False
+            expand=expand,
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(route_table_info)
+        _log_result(get_route_tables, route_table_info)
+        return route_table_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_route_tables, e)
 
 
 def delete_route_tables(
         resource_group_name,
         route_table_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Deletes the specified route table.
@@ -469,22 +866,36 @@ def delete_route_tables(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns None or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns None or
         ClientRawResponse if raw=true
     """
 
     try:
-        route_table_info = network_client.route_tables.delete(
+        route_table_info = _start_operation(
+            _network(client).route_tables.delete,
+            None,
             resource_group_name,
             route_table_name,
-            custom_headers=None,
-            raw=False
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return route_table_info
         route_table_info.wait()
-        print(route_table_info.status())
+        _log_status(
+            delete_route_tables,
+            route_table_info,
+            resource_group_name,
+            route_table_name
+        )
+        return route_table_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(delete_route_tables, e)
 
 # Routes Operations
 def create_update_routes(
@@ -493,7 +904,9 @@ def create_update_routes(
         route_name,
         route_parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Creates or updates a route in the specified route table.
@@ -508,23 +921,32 @@ def create_update_routes(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns Route or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns Route or
         ClientRawResponse if raw=true
     """
 
     try:
-        route_creation = network_client.routes.create_or_update(
+        route_creation = _start_operation(
+            _network(client).routes.create_or_update,
+            'Route',
             resource_group_name,
             route_table_name,
             route_name,
             route_parameters,
-            custom_headers=None,
-            raw=False
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(route_creation.result().provisioning_state)
+        if not wait:
+            return route_creation
+        _log_result(create_update_routes, route_creation.result())
+        return route_creation
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_routes, e)
 
 
 def get_routes(
@@ -532,7 +954,8 @@ def get_routes(
         route_table_name,
         route_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        client=None
 ):
     """
     Gets the specified route from a route table.
@@ -543,30 +966,38 @@ def get_routes(
     :param route_table_name: (str) – The name of the route table.
     :param route_name: (str) – The name of the route.
     :param custom_headers: (dict) – headers that will be added to the request
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
     :return: Route or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     """
 
     try:
-        route_info = network_client.routes.get(
+        route_info = _read(
+            _network(client).routes.get,
             resource_group_name,
             route_table_name,
             route_name,
-            custom_headers=None,
-            raw=False
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(route_info)
+        _log_result(get_routes, route_info)
+        return route_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_routes, e)
 
 def delete_routes(
         resource_group_name,
         route_table_name,
         route_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Deletes the specified route from a route table.
@@ -579,23 +1010,38 @@ def delete_routes(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns None or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns None or
         ClientRawResponse if raw=true
     """
 
     try:
-        route_info = network_client.routes.delete(
+        route_info = _start_operation(
+            _network(client).routes.delete,
+            None,
             resource_group_name,
             route_table_name,
             route_name,
-            custom_headers=None,
-            raw=False
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return route_info
         route_info.wait()
-        print(route_info.status())
+        _log_status(
+            delete_routes,
+            route_info,
+            resource_group_name,
+            route_table_name,
+            route_name
+        )
+        return route_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(delete_routes, e)
 
 
 # Virtual Network Peerings Operations
@@ -605,7 +1051,9 @@ def create_update_virtual_network_peerings(
         virtual_network_peering_name,
         virtual_network_peering_parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Creates or updates a peering in the specified virtual network.
@@ -620,22 +1068,34 @@ def create_update_virtual_network_peerings(
     :param custom_headers: (dict) – headers that will be added to the request.
     :param raw: (bool) – returns the direct response alongside the deserialized
         response.
-    :return: AzureOperationPoller instance that returns None or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns None or
         ClientRawResponse if raw=true
     """
     try:
-        peering_creation = network_client.virtual_network_peerings.create_or_update(
+        peering_creation = _start_operation(
+            _network(client).virtual_network_peerings.create_or_update,
+            'VirtualNetworkPeering',
             resource_group_name,
             virtual_network_name,
             virtual_network_peering_name,
             virtual_network_peering_parameters,
-            custom_headers=None,
-            raw=False
+            custom_headers=custom_headers,
+            raw=raw
+        )
+        if not wait:
+            return peering_creation
+        _log_result(
+            create_update_virtual_network_peerings,
+            peering_creation.result()
         )
-        print(peering_creation.result().provisioning_state)
+        return peering_creation
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_virtual_network_peerings, e)
 
 
 def get_virtual_network_peerings(
@@ -643,7 +1103,8 @@ def get_virtual_network_peerings(
         virtual_network_name,
         virtual_network_peering_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        client=None
 ):
     """
     Gets the specified virtual network peering.
@@ -655,22 +1116,28 @@ def get_virtual_network_peerings(
     :param virtual_network_peering_name: (str) – The name of the virtual
         network peering.
     :param custom_headers: (dict) – headers that will be added to the request.
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response.
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
     :return: VirtualNetworkPeering or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     """
     try:
-        route_info = network_client.virtual_network_peerings.get(
+        route_info = _read(
+            _network(client).virtual_network_peerings.get,
             resource_group_name,
             virtual_network_name,
             virtual_network_peering_name,
-            custom_headers=None,
-            raw=False
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(route_info)
+        _log_result(get_virtual_network_peerings, route_info)
+        return route_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_virtual_network_peerings, e)
 
 
 def delete_virtual_network_peerings(
@@ -678,7 +1145,9 @@ def delete_virtual_network_peerings(
         virtual_network_name,
         virtual_network_peering_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Deletes the specified virtual network peering.
@@ -692,22 +1161,37 @@ def delete_virtual_network_peerings(
     :param custom_headers: (dict) – headers that will be added to the request.
     :param raw: (bool) – returns the direct response alongside the deserialized
         response.
-    :return: AzureOperationPoller instance that returns None or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns None or
         ClientRawResponse if raw=true
     """
     try:
-        route_info = network_client.virtual_network_peerings.delete(
+        route_info = _start_operation(
+            _network(client).virtual_network_peerings.delete,
+            None,
             resource_group_name,
             virtual_network_name,
             virtual_network_peering_name,
-            custom_headers=None,
-            raw=False
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return route_info
         route_info.wait()
-        print(route_info.status())
+        _log_status(
+            delete_virtual_network_peerings,
+            route_info,
+            resource_group_name,
+            virtual_network_name,
+            virtual_network_peering_name
+        )
+        return route_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(delete_virtual_network_peerings, e)
 
 
 # Local Network Gateway Operations
@@ -716,7 +1200,9 @@ def create_update_local_network_gateways(
         local_network_gateway_name,
         parameters,
         custom_headers=None,
-        raw=None
+        raw=None,
+        wait=True,
+        client=None
 ):
     """
     Creates or updates a local network gateway in the specified resource group.
@@ -729,29 +1215,39 @@ def create_update_local_network_gateways(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns LocalNetworkGateway or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns LocalNetworkGateway or
         ClientRawResponse if raw=true
     """
     try:
-        lng_info = network_client.local_network_gateways.create_or_update(
+        lng_info = _start_operation(
+            _network(client).local_network_gateways.create_or_update,
+            'LocalNetworkGateway',
             resource_group_name,
             local_network_gateway_name,
             parameters,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return lng_info
         lng_info.wait()
-        print(lng_info.result().provisioning_state)
+        _log_result(create_update_local_network_gateways, lng_info.result())
+        return lng_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_local_network_gateways, e)
 
 
 def get_local_network_gateways(
         resource_group_name,
         local_network_gateway_name,
         custom_headers=None,
-        raw=None
+        raw=None,
+        client=None
 ):
     """
     Gets the specified local network gateway in a resource group.
@@ -760,28 +1256,36 @@ def get_local_network_gateways(
     :param local_network_gateway_name: (str) – The name of the local network
         gateway.
     :param custom_headers: (dict) – headers that will be added to the request
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
     :return: LocalNetworkGateway or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     """
     try:
-        lng_info = network_client.local_network_gateways.get(
+        lng_info = _read(
+            _network(client).local_network_gateways.get,
             resource_group_name,
             local_network_gateway_name,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(lng_info)
+        _log_result(get_local_network_gateways, lng_info)
+        return lng_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_local_network_gateways, e)
 
 
 def delete_local_network_gateways(
         resource_group_name,
         local_network_gateway_name,
         custom_headers=None,
-        raw=None
+        raw=None,
+        wait=True,
+        client=None
 ):
     """
     Deletes the specified local network gateway.
@@ -792,21 +1296,35 @@ def delete_local_network_gateways(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns None or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns None or
         ClientRawResponse if raw=true
     """
     try:
-        lng_info = network_client.local_network_gateways.delete(
+        lng_info = _start_operation(
+            _network(client).local_network_gateways.delete,
+            None,
             resource_group_name,
             local_network_gateway_name,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return lng_info
         lng_info.wait()
-        print(lng_info.status())
+        _log_status(
+            delete_local_network_gateways,
+            lng_info,
+            resource_group_name,
+            local_network_gateway_name
+        )
+        return lng_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(delete_local_network_gateways, e)
 
 # Public IP Addresses Operations
 def create_update_public_ip_addresses(
@@ -814,7 +1332,9 @@ def create_update_public_ip_addresses(
         public_ip_address_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Creates or updates a static or dynamic public IP address.
@@ -826,22 +1346,31 @@ def create_update_public_ip_addresses(
     :param custom_headers:  (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns PublicIPAddress or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns PublicIPAddress or
         ClientRawResponse if raw=true
     """
     try:
-        pip_info = network_client.public_ip_addresses.create_or_update(
+        pip_info = _start_operation(
+            _network(client).public_ip_addresses.create_or_update,
+            'PublicIPAddress',
             resource_group_name,
             public_ip_address_name,
             parameters,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return pip_info
         pip_info.wait()
-        print(pip_info.result().provisioning_state)
+        _log_result(create_update_public_ip_addresses, pip_info.result())
+        return pip_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_public_ip_addresses, e)
 
 
 def get_public_ip_addresses(
@@ -849,7 +1378,8 @@ def get_public_ip_addresses(
         public_ip_address_name,
         expand=None,
         custom_headers=None,
-        raw=False
+        raw=False,
+        client=None
 ):
     """
     Gets the specified public IP address in a specified resource group.
@@ -858,29 +1388,37 @@ def get_public_ip_addresses(
     :param public_ip_address_name: (str) – The name of the public IP address.
     :param expand: (str) – Expands referenced resources.
     :param custom_headers: (dict) – headers that will be added to the request
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
     :return: PublicIPAddress or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     """
     try:
-        pip_info = network_client.public_ip_addresses.get(
+        pip_info = _read(
+            _network(client).public_ip_addresses.get,
             resource_group_name,
             public_ip_address_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
+            expand=expand,
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(pip_info)
+        _log_result(get_public_ip_addresses, pip_info)
+        return pip_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_public_ip_addresses, e)
 
 
 def delete_public_ip_addresses(
         resource_group_name,
         public_ip_address_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Deletes the specified public IP address.
@@ -890,21 +1428,35 @@ def delete_public_ip_addresses(
     :param custom_headers:  (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns PublicIPAddress or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns PublicIPAddress or
         ClientRawResponse if raw=true
     """
     try:
-        pip_info = network_client.public_ip_addresses.delete(
+        pip_info = _start_operation(
+            _network(client).public_ip_addresses.delete,
+            None,
             resource_group_name,
             public_ip_address_name,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return pip_info
         pip_info.wait()
-        print(pip_info.status())
+        _log_status(
+            delete_public_ip_addresses,
+            pip_info,
+            resource_group_name,
+            public_ip_address_name
+        )
+        return pip_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(delete_public_ip_addresses, e)
 
 # Virtual Network Gateway Operations
 def create_update_virtual_network_gateways(
@@ -912,7 +1464,9 @@ def create_update_virtual_network_gateways(
         virtual_network_gateway_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Creates or updates a virtual network gateway in the specified resource
@@ -926,29 +1480,39 @@ def create_update_virtual_network_gateways(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns VirtualNetworkGateway or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns VirtualNetworkGateway or
         ClientRawResponse if raw=true
     """
     try:
-        vng_info = network_client.virtual_network_gateways.create_or_update(
+        vng_info = _start_operation(
+            _network(client).virtual_network_gateways.create_or_update,
+            'VirtualNetworkGateway',
             resource_group_name,
             virtual_network_gateway_name,
             parameters,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return vng_info
         # vng_info.wait()
-        print(vng_info.result().provisioning_state)
+        _log_result(create_update_virtual_network_gateways, vng_info.result())
+        return vng_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_virtual_network_gateways, e)
 
 
 def get_virtual_network_gateways(
         resource_group_name,
         virtual_network_gateway_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        client=None
 ):
     """
     Gets the specified virtual network gateway by resource group.
@@ -957,29 +1521,36 @@ def get_virtual_network_gateways(
     :param virtual_network_gateway_name: (str) – The name of the virtual
         network gateway.
     :param custom_headers: (dict) – headers that will be added to the request
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
     :return: VirtualNetworkGateway or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     """
     try:
-        vng_info = network_client.virtual_network_gateways.get(
+        vng_info = _read(
+            _network(client).virtual_network_gateways.get,
             resource_group_name,
             virtual_network_gateway_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(vng_info)
+        _log_result(get_virtual_network_gateways, vng_info)
+        return vng_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_virtual_network_gateways, e)
 
 
 def delete_virtual_network_gateways(
         resource_group_name,
         virtual_network_gateway_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Deletes the specified virtual network gateway.
@@ -990,21 +1561,35 @@ def delete_virtual_network_gateways(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns None or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns None or
         ClientRawResponse if raw=true
     """
     try:
-        vng_info = network_client.virtual_network_gateways.delete(
+        vng_info = _start_operation(
+            _network(client).virtual_network_gateways.delete,
+            None,
             resource_group_name,
             virtual_network_gateway_name,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return vng_info
         vng_info.wait()
-        print(vng_info.status())
+        _log_status(
+            delete_virtual_network_gateways,
+            vng_info,
+            resource_group_name,
+            virtual_network_gateway_name
+        )
+        return vng_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(delete_virtual_network_gateways, e)
 
 
 # Virtual Network Gateway Connections Operations
@@ -1013,7 +1598,9 @@ def create_update_virtual_network_gateway_connections(
         virtual_network_gateway_connection_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Creates or updates a virtual network gateway connection in the specified
@@ -1028,29 +1615,42 @@ def create_update_virtual_network_gateway_connections(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns
         VirtualNetworkGatewayConnection or ClientRawResponse if raw=true
     """
     try:
-        vngc_info = network_client.virtual_network_gateway_connections.create_or_update(
+        vngc_info = _start_operation(
+            _network(client).virtual_network_gateway_connections.create_or_update,
+            'VirtualNetworkGatewayConnection',
             resource_group_name,
             virtual_network_gateway_connection_name,
             parameters,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return vngc_info
         vngc_info.wait()
-        print(vngc_info.result().provisoning_state)
+        _log_result(
+            create_update_virtual_network_gateway_connections,
+            vngc_info.result()
+        )
+        return vngc_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_virtual_network_gateway_connections, e)
 
 
 def get_virtual_network_gateway_connections(
         resource_group_name,
         virtual_network_gateway_connection_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        client=None
 ):
     """
     Gets the specified virtual network gateway connection by resource group.
@@ -1059,29 +1659,36 @@ def get_virtual_network_gateway_connections(
     :param virtual_network_gateway_connection_name: (str) – The name of the
         virtual network gateway connection.
     :param custom_headers: (dict) – headers that will be added to the request
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
     :return: VirtualNetworkGatewayConnection or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     """
     try:
-        vngc_info = network_client.virtual_network_gateway_connections.get(
+        vngc_info = _read(
+            _network(client).virtual_network_gateway_connections.get,
             resource_group_name,
             virtual_network_gateway_connection_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(vngc_info)
+        _log_result(get_virtual_network_gateway_connections, vngc_info)
+        return vngc_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_virtual_network_gateway_connections, e)
 
 
 def delete_virtual_network_gateway_connections(
         resource_group_name,
         virtual_network_gateway_connection_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Deletes the specified virtual network Gateway connection.
@@ -1092,21 +1699,35 @@ def delete_virtual_network_gateway_connections(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns None or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns None or
         ClientRawResponse if raw=true
     """
     try:
-        vngc_info = network_client.virtual_network_gateway_connections.delete(
+        vngc_info = _start_operation(
+            _network(client).virtual_network_gateway_connections.delete,
+            None,
             resource_group_name,
             virtual_network_gateway_connection_name,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return vngc_info
         vngc_info.wait()
-        print(vngc_info.status())
+        _log_status(
+            delete_virtual_network_gateway_connections,
+            vngc_info,
+            resource_group_name,
+            virtual_network_gateway_connection_name
+        )
+        return vngc_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(delete_virtual_network_gateway_connections, e)
 
 
 # Network Interfaces Operations
@@ -1115,7 +1736,9 @@ def create_update_network_interfaces(
         network_interface_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Creates or updates a network interface.
@@ -1127,22 +1750,31 @@ def create_update_network_interfaces(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns NetworkInterface or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns NetworkInterface or
         ClientRawResponse if raw=true
     """
     try:
-        nic_info = network_client.network_interfaces.create_or_update(
+        nic_info = _start_operation(
+            _network(client).network_interfaces.create_or_update,
+            'NetworkInterface',
             resource_group_name,
             network_interface_name,
             parameters,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return nic_info
         nic_info.wait()
-        print(nic_info.result().provisioning_state)
+        _log_result(create_update_network_interfaces, nic_info.result())
+        return nic_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_network_interfaces, e)
 
 
 def get_network_interfaces(
@@ -1150,7 +1782,8 @@ def get_network_interfaces(
         network_interface_name,
         expand=None,
         custom_headers=None,
-        raw=False
+        raw=False,
+        client=None
 ):
     """
     Gets information about the specified network interface.
@@ -1159,28 +1792,36 @@ def get_network_interfaces(
     :param network_interface_name: (str) – The name of the network interface
     :param expand: (str) – Expands referenced resources.
     :param custom_headers: (dict) – headers that will be added to the request
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
     :return: NetworkInterface or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     """
     try:
-        nic_info = network_client.network_interfaces.get(
+        nic_info = _read(
+            _network(client).network_interfaces.get,
             resource_group_name,
             network_interface_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
+            expand=expand,
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(nic_info)
+        _log_result(get_network_interfaces, nic_info)
+        return nic_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_network_interfaces, e)
 
 def delete_network_interfaces(
         resource_group_name,
         network_interface_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Deletes the specified network interface.
@@ -1190,21 +1831,35 @@ def delete_network_interfaces(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns None or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns None or
         ClientRawResponse if raw=true
     """
     try:
-        nic_info = network_client.network_interfaces.delete(
+        nic_info = _start_operation(
+            _network(client).network_interfaces.delete,
+            None,
             resource_group_name,
             network_interface_name,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return nic_info
         nic_info.wait()
-        print(nic_info.status())
+        _log_status(
+            delete_network_interfaces,
+            nic_info,
+            resource_group_name,
+            network_interface_name
+        )
+        return nic_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(delete_network_interfaces, e)
 
 
 # Network Security Groups Operations
@@ -1213,7 +1868,9 @@ def create_update_network_security_groups(
         network_security_group_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Creates or updates a network interface.
@@ -1226,29 +1883,39 @@ def create_update_network_security_groups(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns NetworkInterface or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns NetworkInterface or
         ClientRawResponse if raw=true
     """
     try:
-        nsg_info = network_client.network_security_groups.create_or_update(
+        nsg_info = _start_operation(
+            _network(client).network_security_groups.create_or_update,
+            'NetworkSecurityGroup',
             resource_group_name,
             network_security_group_name,
             parameters,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return nsg_info
         nsg_info.wait()
-        print(nsg_info.result().provisioning_state)
+        _log_result(create_update_network_security_groups, nsg_info.result())
+        return nsg_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_network_security_groups, e)
 
 def get_network_security_groups(
         resource_group_name,
         network_security_group_name,
         expand=None,
         custom_headers=None,
-        raw=False
+        raw=False,
+        client=None
 ):
     """
     Gets information about the specified network interface.
@@ -1258,28 +1925,36 @@ def get_network_security_groups(
         security group.
     :param expand: (str) – Expands referenced resources.
     :param custom_headers: (dict) – headers that will be added to the request
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
     :return: NetworkInterface or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     """
     try:
-        nsg_info = network_client.network_security_groups.get(
+        nsg_info = _read(
+            _network(client).network_security_groups.get,
             resource_group_name,
             network_security_group_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
+            expand=expand,
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(nsg_info)
+        _log_result(get_network_security_groups, nsg_info)
+        return nsg_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_network_security_groups, e)
 
 def delete_network_security_groups(
         resource_group_name,
         network_security_group_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Deletes the specified network interface.
@@ -1290,21 +1965,35 @@ def delete_network_security_groups(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns None or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns None or
         ClientRawResponse if raw=true
     """
     try:
-        nsg_info = network_client.network_security_groups.delete(
+        nsg_info = _start_operation(
+            _network(client).network_security_groups.delete,
+            None,
             resource_group_name,
             network_security_group_name,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return nsg_info
         nsg_info.wait()
-        print(nsg_info.status())
+        _log_status(
+            delete_network_security_groups,
+            nsg_info,
+            resource_group_name,
+            network_security_group_name
+        )
+        return nsg_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(delete_network_security_groups, e)
 
 
 # Express Route Circuits Operations
@@ -1313,7 +2002,9 @@ def create_update_express_route_circuits(
         circuit_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Creates or updates an express route circuit.
@@ -1325,29 +2016,39 @@ def create_update_express_route_circuits(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns ExpressRouteCircuit or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns ExpressRouteCircuit or
         ClientRawResponse if raw=true
     """
     try:
-        erc_info = network_client.express_route_circuits.create_or_update(
+        erc_info = _start_operation(
+            _network(client).express_route_circuits.create_or_update,
+            'ExpressRouteCircuit',
             resource_group_name,
             circuit_name,
             parameters,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return erc_info
         erc_info.wait()
-        print(erc_info.result().provisioning_state)
+        _log_result(create_update_express_route_circuits, erc_info.result())
+        return erc_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_express_route_circuits, e)
 
 
 def get_express_route_circuits(
         resource_group_name,
         circuit_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        client=None
 ):
     """
     Gets information about the specified express route circuit.
@@ -1355,29 +2056,36 @@ def get_express_route_circuits(
     :param resource_group_name: (str) – The name of the resource group.
     :param circuit_name: (str) – The name of express route circuit.
     :param custom_headers: (dict) – headers that will be added to the request
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
     :return: ExpressRouteCircuit or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     """
     try:
-        erc_info = network_client.express_route_circuits.get(
+        erc_info = _read(
+            _network(client).express_route_circuits.get,
             resource_group_name,
             circuit_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(erc_info)
+        _log_result(get_express_route_circuits, erc_info)
+        return erc_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_express_route_circuits, e)
 
 
 def delete_express_route_circuits(
         resource_group_name,
         circuit_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Deletes the specified express route circuit.
@@ -1387,21 +2095,35 @@ def delete_express_route_circuits(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns None or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns None or
         ClientRawResponse if raw=true
     """
     try:
-        erc_info = network_client.express_route_circuits.delete(
+        erc_info = _start_operation(
+            _network(client).express_route_circuits.delete,
+            None,
             resource_group_name,
             circuit_name,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return erc_info
         erc_info.wait()
-        print(erc_info.status())
+        _log_status(
+            delete_express_route_circuits,
+            erc_info,
+            resource_group_name,
+            circuit_name
+        )
+        return erc_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(delete_express_route_circuits, e)
 
 
 # Express Route Circuit Authorizations Operations
@@ -1411,7 +2133,9 @@ def create_update_express_route_circuit_authorizations(
         authorization_name,
         authorization_parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Creates or updates an authorization in the specified express route circuit.
@@ -1425,23 +2149,35 @@ def create_update_express_route_circuit_authorizations(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns
         ExpressRouteCircuitAuthorization or ClientRawResponse if raw=true
     """
     try:
-        erca_info = network_client.express_route_circuit_authorizations.create_or_update(
+        erca_info = _start_operation(
+            _network(client).express_route_circuit_authorizations.create_or_update,
+            'ExpressRouteCircuitAuthorization',
             resource_group_name,
             circuit_name,
             authorization_name,
             authorization_parameters,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return erca_info
         erca_info.wait()
-        print(erca_info.result().provisioning_state)
+        _log_result(
+            create_update_express_route_circuit_authorizations,
+            erca_info.result()
+        )
+        return erca_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_express_route_circuit_authorizations, e)
 
 
 def get_express_route_circuit_authorizations(
@@ -1449,7 +2185,8 @@ def get_express_route_circuit_authorizations(
         circuit_name,
         authorization_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        client=None
 ):
     """
     Gets the specified authorization from the specified express route circuit.
@@ -1458,23 +2195,28 @@ def get_express_route_circuit_authorizations(
     :param circuit_name: (str) – The name of the express route circuit.
     :param authorization_name: (str) – The name of the authorization.
     :param custom_headers: (dict) – headers that will be added to the request
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
     :return: ExpressRouteCircuitAuthorization or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     """
     try:
-        erca_info = network_client.express_route_circuit_authorizations.get(
+        erca_info = _read(
+            _network(client).express_route_circuit_authorizations.get,
             resource_group_name,
             circuit_name,
             authorization_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(erca_info)
+        _log_result(get_express_route_circuit_authorizations, erca_info)
+        return erca_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_express_route_circuit_authorizations, e)
 
 
 def delete_express_route_circuits_authorizations(
@@ -1482,7 +2224,9 @@ def delete_express_route_circuits_authorizations(
         circuit_name,
         authorization_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Deletes the specified authorization from the specified express route circuit.
@@ -1493,22 +2237,37 @@ def delete_express_route_circuits_authorizations(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns None or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns None or
         ClientRawResponse if raw=true
     """
     try:
-        erca_info = network_client.express_route_circuit_authorizations.delete(
+        erca_info = _start_operation(
+            _network(client).express_route_circuit_authorizations.delete,
+            None,
             resource_group_name,
             circuit_name,
             authorization_name,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return erca_info
         erca_info.wait()
-        print(erca_info.status())
+        _log_status(
+            delete_express_route_circuits_authorizations,
+            erca_info,
+            resource_group_name,
+            circuit_name,
+            authorization_name
+        )
+        return erca_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(delete_express_route_circuits_authorizations, e)
 
 
 def create_update_express_route_circuit_peerings(
@@ -1517,7 +2276,9 @@ def create_update_express_route_circuit_peerings(
         peering_name,
         peering_parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Creates or updates a peering in the specified express route circuits.
@@ -1531,23 +2292,35 @@ def create_update_express_route_circuit_peerings(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns
         ExpressRouteCircuitPeering or ClientRawResponse if raw=true
     """
     try:
-        ercp_info = network_client.express_route_circuit_peerings.create_or_update(
+        ercp_info = _start_operation(
+            _network(client).express_route_circuit_peerings.create_or_update,
+            'ExpressRouteCircuitPeering',
             resource_group_name,
             circuit_name,
             peering_name,
             peering_parameters,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return ercp_info
         ercp_info.wait()
-        print(ercp_info.result().provisioning_state)
+        _log_result(
+            create_update_express_route_circuit_peerings,
+            ercp_info.result()
+        )
+        return ercp_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(create_update_express_route_circuit_peerings, e)
 
 
 def get_express_route_circuit_peerings(
@@ -1555,7 +2328,8 @@ def get_express_route_circuit_peerings(
         circuit_name,
         peering_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        client=None
 ):
     """
     Gets the specified authorization from the specified express route circuit.
@@ -1564,30 +2338,37 @@ def get_express_route_circuit_peerings(
     :param circuit_name: (str) – The name of the express route circuit.
     :param peering_name: (str) – The name of the peering.
     :param custom_headers: (dict) – headers that will be added to the request
-    :param raw: (bool) – returns the direct response alongside the deserialized
-        response
+    :param raw: (bool or str) – returns the direct response alongside the
+        deserialized response, or with 'json', a RawResource that is never
+        deserialized
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
     :return: ExpressRouteCircuitPeering or ClientRawResponse if raw=true
+        or RawResource if raw='json'
     """
     try:
-        ercp_info = network_client.express_route_circuit_peerings.get(
+        ercp_info = _read(
+            _network(client).express_route_circuit_peerings.get,
             resource_group_name,
             circuit_name,
             peering_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
-        print(ercp_info)
+        _log_result(get_express_route_circuit_peerings, ercp_info)
+        return ercp_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(get_express_route_circuit_peerings, e)
 
 def delete_express_route_circuit_peerings(
         resource_group_name,
         circuit_name,
         peering_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        wait=True,
+        client=None
 ):
     """
     Deletes the specified peering from the specified express route circuit.
@@ -1598,22 +2379,2249 @@ def delete_express_route_circuit_peerings(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
-    :return: AzureOperationPoller instance that returns None or
+    :param wait: (bool) – wait for the operation to finish. If False,
+        return an OperationHandle as soon as the request is accepted.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client.
+    :return: OperationHandle that returns None or
         ClientRawResponse if raw=true
     """
     try:
-        ercp_info = network_client.express_route_circuit_peerings.delete(
+        ercp_info = _start_operation(
+            _network(client).express_route_circuit_peerings.delete,
+            None,
             resource_group_name,
             circuit_name,
             peering_name,
-            custom_headers=None,
-            raw=None
+            custom_headers=custom_headers,
+            raw=raw
         )
+        if not wait:
+            return ercp_info
         ercp_info.wait()
-        print(ercp_info.status())
+        _log_status(
+            delete_express_route_circuit_peerings,
+            ercp_info,
+            resource_group_name,
+            circuit_name,
+            peering_name
+        )
+        return ercp_info
 
     except azure_exceptions.CloudError as e:
-        print(e)
+        _log_error(delete_express_route_circuit_peerings, e)
+
+
+# Client Registry
+def _network(client):
+    """
+    Returns the NetworkManagementClient a function should use.
+
+    :param client: (ClientHandle) – handle passed to the function, or None.
+    :return: NetworkManagementClient
+    """
+    if client is not None:
+        network = client.network
+    elif network_client is not None or default_client is None:
+        network = network_client
+    else:
+        network = default_client.network
+    if network is not None:
+        if rate_limiter is not None:
+            rate_limiter.attach(network)
+        if retry_policy is not None:
+            retry_policy.attach(network)
+        else:
+            cumulus_retry.RetryPolicy.detach(network)
+    return network
+
+
+def _resource(client):
+    """
+    Returns the ResourceManagementClient a function should use.
+
+    :param client: (ClientHandle) – handle passed to the function, or None.
+    :return: ResourceManagementClient
+    """
+    if client is not None:
+        resource = client.resource
+    elif resource_client is not None or default_client is None:
+        resource = resource_client
+    else:
+        resource = default_client.resource
+    if resource is not None:
+        if rate_limiter is not None:
+            rate_limiter.attach(resource)
+        if retry_policy is not None:
+            retry_policy.attach(resource)
+        else:
+            cumulus_retry.RetryPolicy.detach(resource)
+    return resource
+
+
+def _operations(resource_type, client):
+    """
+    Returns the SDK operations group of a resource type.
+
+    :param resource_type: (str) – _RESOURCE_PATHS key, e.g.
+        'virtual_networks'.
+    :param client: (ClientHandle) – clients to use, or None for the global
+        ones.
+    :return: SDK operations group
+    """
+    if resource_type == 'resource_groups':
+        return _resource(client).resource_groups
+    return getattr(_network(client), resource_type)
+
+
+class ClientHandle(object):
+    """
+    Network and resource management clients for one cloud, subscription,
+    and set of credentials, built on first use.
+
+    Both clients share the credentials object, so they share its token.
+    The SDK clients are safe to call from many threads once built.
+
+    :param credentials: msrestazure credentials, e.g.
+        ServicePrincipalCredentials.
+    :param subscription_id: (str) – subscription to manage.
+    :param cloud: (Cloud) – msrestazure.azure_cloud cloud definition.
+        AZURE_PUBLIC_CLOUD when None.
+    :param transport: (cumulus_transport.Transport) – connection pool to send
+        requests through. Each request opens its own connection when None.
+    """
+
+    def __init__(self, credentials, subscription_id, cloud=None,
+                 transport=None):
+        self.credentials = credentials
+        self.subscription_id = subscription_id
+        self.cloud = cloud
+        self.transport = transport
+        self._network = None
+        self._resource = None
+        self._lock = threading.Lock()
+
+    def _base_url(self):
+        """
+        Returns the Resource Manager endpoint of the handle's cloud.
+
+        :return: str, or None for the SDK default
+        """
+        if self.cloud is None:
+            return None
+        return self.cloud.endpoints.resource_manager
+
+    def _credentials(self):
+        """
+        Returns the credentials to build the clients with.
+
+        :return: credentials, wrapped by the transport if there is one
+        """
+        if self.transport is None:
+            return self.credentials
+        return self.transport.credentials(self.credentials)
+
+    @property
+    def network(self):
+        """
+        NetworkManagementClient of the handle.
+        """
+        if self._network is None:
+            with self._lock:
+                if self._network is None:
+                    from azure.mgmt.network import NetworkManagementClient
+                    self._network = NetworkManagementClient(
+                        self._credentials(),
+                        self.subscription_id,
+                        base_url=self._base_url()
+                    )
+        return self._network
+
+    @property
+    def resource(self):
+        """
+        ResourceManagementClient of the handle.
+        """
+        if self._resource is None:
+            with self._lock:
+                if self._resource is None:
+                    from azure.mgmt.resource import ResourceManagementClient
+                    self._resource = ResourceManagementClient(
+                        self._credentials(),
+                        self.subscription_id,
+                        base_url=self._base_url()
+                    )
+        return self._resource
+
+
+class ClientRegistry(object):
+    """
+    Thread-safe cache of ClientHandles keyed by (cloud, subscription,
+    credentials).
+
+    :param transport: (cumulus_transport.Transport) – connection pool shared
+        by the clients of every handle the registry creates.
+    """
+
+    def __init__(self, transport=None):
+        self.transport = transport
+        self._handles = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._handles)
+
+    def get(self, credentials, subscription_id, cloud=None):
+        """
+        Returns the handle for a cloud, subscription, and credentials,
+        creating it the first time.
+
+        :param credentials: msrestazure credentials object.
+        :param subscription_id: (str) – subscription to manage.
+        :param cloud: (Cloud) – msrestazure.azure_cloud cloud definition.
+        :return: ClientHandle
+        """
+        key = (
+            cloud.name if cloud is not None else None,
+            subscription_id,
+            credentials
+        )
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is None:
+                handle = ClientHandle(
+                    credentials, subscription_id, cloud, self.transport
+                )
+                self._handles[key] = handle
+            return handle
+
+    def clear(self):
+        """
+        Forgets every handle.
+        """
+        with self._lock:
+            self._handles.clear()
+
+
+client_registry = ClientRegistry()
+
+
+# Non-blocking Operations
+_PENDING = object()
+
+
+class OperationHandle(futures.Future):
+    """
+    Future around a long running operation.
+
+    done(), result(timeout), exception(timeout) and add_done_callback(fn)
+    behave like concurrent.futures.Future. Unlike AzureOperationPoller,
+    callbacks receive this handle and may be added after the operation has
+    finished. result() and wait() raise the operation's CloudError if it
+    failed.
+
+    :param poller: (AzureOperationPoller) – poller returned by the SDK.
+    :param value: result of an operation that has already completed.
+    :param raw: (bool) – resolve to a ClientRawResponse of the final
+        response instead of the resource alone.
+    """
+
+    def __init__(self, poller=None, value=_PENDING, raw=False):
+        futures.Future.__init__(self)
+        self.poller = poller
+        self.operation = None
+        self.raw = raw
+        self.set_running_or_notify_cancel()
+
+        if poller is None:
+            if value is not _PENDING:
+                self.set_result(value)
+            return
+
+        try:
+            poller.add_done_callback(self._poller_done)
+        except ValueError:
+            # The operation finished with its initial response, so there is
+            # no polling thread to wait for.
+            try:
+                resource = poller.result()
+            except Exception as e:
+                self.set_exception(e)
+            else:
+                self.set_result(self._output(resource, poller._response))
+
+    def _output(self, resource, response):
+        """
+        Returns what the handle resolves to for a finished operation.
+
+        :param resource: the deserialized resource, None for deletes.
+        :param response: (requests.Response) – the final response.
+        :return: resource or ClientRawResponse if raw=true
+        """
+        if self.raw:
+            return pipeline.ClientRawResponse(resource, response)
+        return resource
+
+    def _poller_done(self, operation):
+        """
+        Resolves the handle from the poller's thread.
+
+        poller.result() cannot be used here because it joins the thread
+        that is running this callback.
+
+        :param operation: (LongRunningOperation) – the finished operation.
+        """
+        error = getattr(self.poller, '_exception', None)
+        if error is not None:
+            self.set_exception(error)
+        else:
+            self.set_result(
+                self._output(operation.resource, self.poller._response)
+            )
+
+    def wait(self, timeout=None):
+        """
+        Waits for the operation to finish, like AzureOperationPoller.wait.
+
+        :param timeout: (float) – seconds to wait at most.
+        :raises: CloudError
+        """
+        futures.wait([self], timeout)
+        if self.done() and self.exception() is not None:
+            raise self.exception()
+
+    def status(self):
+        """
+        Returns the provisioning status of the operation.
+
+        :return: str
+        """
+        if self.poller is not None:
+            return self.poller.status()
+        if self.operation is not None:
+            return self.operation.status
+        return 'Succeeded' if self.done() else 'InProgress'
+
+
+def _start_operation(
+        method,
+        model,
+        *args,
+        **kwargs
+):
+    """
+    Starts a long running SDK operation and returns a handle to it, under
+    the global retry_policy if it is set. When the global change_detector
+    is set and the resource already matches a create_or_update's
+    parameters, nothing is sent and the handle resolves to the resource at
+    once.
+
+    :param method: (callable) – SDK create_or_update or delete method.
+    :param model: (str) – model name of the result, None for deletes.
+    :param args: positional arguments for method.
+    :param kwargs: keyword arguments for method.
+    :return: OperationHandle
+    :raises: CloudError
+    """
+    if change_detector is not None and model is not None \
+            and not kwargs.get('raw'):
+        current = change_detector.current(method, args, kwargs)
+        if current is not None:
+            return OperationHandle(value=current)
+    if retry_policy is not None:
+        return retry_policy.operation(
+            method,
+            functools.partial(_send_operation, method, model),
+            *args,
+            **kwargs
+        )
+    return _send_operation(method, model, *args, **kwargs)
+
+
+def _send_operation(
+        method,
+        model,
+        *args,
+        **kwargs
+):
+    """
+    Sends the initial request of a long running SDK operation and returns a
+    handle to it.
+
+    Only the initial request is sent here. The operation is polled by the
+    global poll_loop, or by the module's own PollLoop when it is not set,
+    so every wrapper backs off with jitter under its resource type's
+    PollingPolicy instead of polling at the SDK's fixed interval. Cached
+    reads of the resource are dropped
+    when it starts and refreshed when it finishes. Under a journaled bulk
+    run, the URLs to poll the operation by are written to the journal.
+    When the global metrics is set, the operation is timed and its polls
+    counted, and when the global tracer is set, it is traced.
+
+    The SDK answers raw=True with the initial response alone, before the
+    operation has finished, so raw is not passed on: the handle resolves to
+    a ClientRawResponse of the final response instead.
+
+    :param method: (callable) – SDK create_or_update or delete method.
+    :param model: (str) – model name of the result, None for deletes.
+    :param args: positional arguments for method.
+    :param kwargs: keyword arguments for method.
+    :return: OperationHandle
+    :raises: CloudError
+    """
+    if read_cache is not None:
+        read_cache.invalidate(
+            method.__self__, args, descendants=model is None
+        )
+
+    started = metrics.start(method) if metrics is not None else None
+    span = tracer.start_call(method, args) if tracer is not None else None
+    raw = bool(kwargs.pop('raw', False))
+    try:
+        initial = method(*args, raw=True, **kwargs)
+        handle = _poll_loop().track(
+            method.__self__, model, initial.response, raw
+        )
+    except Exception as e:
+        if started is not None:
+            metrics.request_done(method, started, e)
+        if span is not None:
+            tracer.finish(span, e)
+        raise
+
+    if started is not None:
+        metrics.operation_started(method, started, handle)
+    if span is not None:
+        tracer.operation_started(span, handle)
+    if read_cache is not None:
+        handle.add_done_callback(
+            functools.partial(read_cache.operation_done, method, args)
+        )
+    item = getattr(_journal_item, 'entry', None)
+    if item is not None:
+        item[0].submitted(item[1], item[2], model, handle)
+    return handle
+
+
+# The module's own PollLoop when the global poll_loop is not set, with the
+# ID of the process that started it: a forked child gets a new one, since
+# the polling thread is not copied.
+_default_poll_loop = (None, None)
+_default_poll_loop_lock = threading.Lock()
+
+
+def _poll_loop():
+    """
+    Returns the PollLoop that polls long running operations: the global
+    poll_loop if it is set, otherwise the module's own, started on first
+    use.
+
+    :return: PollLoop
+    """
+    global _default_poll_loop
+    if poll_loop is not None:
+        return poll_loop
+    with _default_poll_loop_lock:
+        pid, loop = _default_poll_loop
+        if loop is None or pid != os.getpid():
+            loop = cumulus_polling.PollLoop()
+            _default_poll_loop = (os.getpid(), loop)
+        return loop
+
+
+def _operations_type(operations):
+    """
+    Returns the resource type an SDK operations group works on, e.g.
+    'public_ip_addresses' for PublicIPAddressesOperations.
+
+    :param operations: SDK operations group.
+    :return: str
+    """
+    name = type(operations).__name__
+    if name.endswith('Operations'):
+        name = name[:-len('Operations')]
+    name = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
+    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', name).lower()
+
+
+def retry_after(response):
+    """
+    Reads the Retry-After header of a response.
+
+    :param response: (requests.Response) – response to read.
+    :return: seconds to wait as a float, or None if there is no usable
+        header
+    """
+    value = response.headers.get('retry-after') if response is not None \
+        else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        when = email_utils.parsedate_tz(value)
+        if when is None:
+            return None
+        return max(0.0, email_utils.mktime_tz(when) - time.time())
+
+
+# Read Cache
+def _resource_id(operations, args):
+    """
+    Builds the lower-cased ARM ID of the resource an SDK call acts on.
+
+    :param operations: SDK operations group making the call.
+    :param args: (tuple) – positional arguments of the call.
+    :return: str
+    """
+    return '/subscriptions/{}/{}'.format(
+        operations.config.subscription_id,
+        _RESOURCE_PATHS[_operations_type(operations)].format(*args)
+    ).lower()
+
+
+def _read(
+        method,
+        *args,
+        **kwargs
+):
+    """
+    Sends an SDK get, through the global read_cache if it is set, retried
+    under the global retry_policy if it is set, timed if the global metrics
+    is set, and traced if the global tracer is set.
+
+    raw=True and raw='json' reads are never cached, and with raw='json' the
+    request is sent by _read_json instead of method.
+
+    :param method: (callable) – SDK get method.
+    :param args: positional arguments for method.
+    :param kwargs: keyword arguments for method.
+    :return: the resource, ClientRawResponse if raw=true, or RawResource if
+        raw='json'
+    :raises: CloudError
+    """
+    raw = kwargs.get('raw')
+    if raw == 'json':
+        call = functools.partial(_read_json, method)
+    elif raw or read_cache is None:
+        call = method
+    else:
+        call = functools.partial(read_cache.get, method)
+    if retry_policy is not None:
+        call = functools.partial(retry_policy.call, method, call)
+    if metrics is not None or tracer is not None:
+        return _observed(method, call, *args, **kwargs)
+    return call(*args, **kwargs)
+
+
+# JSON Passthrough
+class RawResource(object):
+    """
+    A resource as Resource Manager returned it, never deserialized into an
+    SDK model.
+
+    Only the JSON bytes are kept, and they are parsed on first access, so a
+    caller that forwards the content, or only needs the ID, pays for neither
+    the parse nor the model objects. Values are read with the REST API's
+    camelCase names, e.g. resource['properties']['addressSpace']. A resource
+    embedded in another, like a subnet in its virtual network, is a view
+    into its parent.
+
+    :param content: (bytes) – the resource as JSON.
+    :param resource_id: (str) – ARM ID of the resource. Read from the JSON
+        if not given.
+    :param parent: (RawResource) – resource this one is embedded in, when
+        it has no content of its own.
+    :param path: (tuple) – keys from the parent's JSON down to this one.
+    """
+
+    __slots__ = ('_content', '_id', '_data', '_parent', '_path')
+
+    def __init__(self, content=None, resource_id=None, parent=None, path=()):
+        self._content = content
+        self._id = resource_id
+        self._data = None
+        self._parent = parent
+        self._path = path
+
+    def __repr__(self):
+        return '<RawResource {}>'.format(self.id)
+
+    def __getitem__(self, key):
+        return self.json()[key]
+
+    def __contains__(self, key):
+        return key in self.json()
+
+    @property
+    def content(self):
+        """
+        The resource as JSON bytes.
+
+        :return: bytes
+        """
+        if self._content is None:
+            return json.dumps(self.json()).encode('utf-8')
+        return self._content
+
+    @property
+    def id(self):
+        """
+        ARM ID of the resource.
+
+        :return: str
+        """
+        if self._id is None:
+            self._id = self.json().get('id')
+        return self._id
+
+    def json(self):
+        """
+        Parses the resource, once.
+
+        :return: dict
+        """
+        if self._data is None:
+            if self._parent is None:
+                self._data = json.loads(self._content)
+            else:
+                data = self._parent.json()
+                for key in self._path:
+                    data = data[key]
+                self._data = data
+        return self._data
+
+    def get(self, key, default=None):
+        return self.json().get(key, default)
+
+
+def _api_version(operations):
+    """
+    Returns the API version an SDK operations group sends. Most groups keep
+    it in api_version; the others hard-code it in every method, so it is
+    taken from the versioned package the group comes from.
+
+    :param operations: SDK operations group.
+    :return: str
+    """
+    version = getattr(operations, 'api_version', None)
+    if version is None:
+        version = '-'.join(re.search(
+            r'\.v(\d{4})_(\d\d)_(\d\d)\.', type(operations).__module__
+        ).groups())
+    return version
+
+
+def _request_headers(
+        operations,
+        custom_headers=None
+):
+    """
+    Builds the headers the SDK adds to every request of an operations group.
+
+    :param operations: SDK operations group the request is for.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :return: dict
+    """
+    config = operations.config
+    headers = {'Content-Type': 'application/json; charset=utf-8'}
+    if config.generate_client_request_id:
+        headers['x-ms-client-request-id'] = str(uuid.uuid1())
+    if custom_headers:
+        headers.update(custom_headers)
+    if config.accept_language is not None:
+        headers['accept-language'] = config.accept_language
+    return headers
+
+
+def _send_json(
+        operations,
+        url,
+        query,
+        custom_headers=None
+):
+    """
+    Sends a GET through the client of an SDK operations group, with the
+    headers the SDK would add, and returns the response undeserialized.
+
+    :param operations: SDK operations group the request is for.
+    :param url: (str) – absolute request URL.
+    :param query: (dict) – query parameters.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :return: requests.Response
+    :raises: CloudError
+    """
+    headers = _request_headers(operations, custom_headers)
+    client = operations._client
+    response = client.send(client.get(url, query), headers)
+    if response.status_code != 200:
+        error = azure_exceptions.CloudError(response)
+        error.request_id = response.headers.get('x-ms-request-id')
+        raise error
+    return response
+
+
+def _read_json(
+        method,
+        *args,
+        **kwargs
+):
+    """
+    Sends the request an SDK get method would, and returns the resource as
+    a RawResource instead of a model.
+
+    :param method: (callable) – SDK get method.
+    :param args: positional arguments for method.
+    :param kwargs: expand and custom_headers, as method takes them.
+    :return: RawResource
+    :raises: CloudError
+    """
+    operations = method.__self__
+    path = _RESOURCE_PATHS[_operations_type(operations)].format(
+        *[parse.quote(arg, safe='') for arg in args]
+    )
+    url = operations._client.format_url(
+        '/subscriptions/{}/{}'.format(
+            parse.quote(operations.config.subscription_id, safe=''), path
+        )
+    )
+    query = {'api-version': _api_version(operations)}
+    if kwargs.get('expand') is not None:
+        query['$expand'] = kwargs['expand']
+    response = _send_json(
+        operations, url, query, kwargs.get('custom_headers')
+    )
+    return RawResource(
+        response.content, parse.unquote(parse.urlsplit(response.url).path)
+    )
+
+
+class ReadCache(object):
+    """
+    In-process cache of get results keyed by resource ID.
+
+    Entries are served without a request for ttl seconds. After that the
+    next read sends If-None-Match with the stored etag, and a 304 Not
+    Modified renews the entry without a new body. The least recently used
+    entries are evicted beyond max_entries. Writes through the create_update
+    and delete functions drop the entry for the resource and its parents
+    (a subnet write changes its vnet), and a delete also drops its
+    children.
+
+    Resources are copied into the cache and out of it, so a caller that
+    changes the resource it got, e.g. to pass it to a create_update
+    function, changes neither the entry nor what other callers get.
+
+    :param ttl: (float) – seconds an entry is served without a request.
+    :param max_entries: (int) – number of entries kept.
+    """
+
+    def __init__(self, ttl=30, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, method, *args, **kwargs):
+        """
+        Returns a resource from the cache, or sends method to fetch it.
+
+        :param method: (callable) – SDK get method.
+        :param args: positional arguments for method.
+        :param kwargs: keyword arguments for method.
+        :return: the resource
+        :raises: CloudError
+        """
+        key = (_resource_id(method.__self__, args), kwargs.get('expand'))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry[2] > time.monotonic():
+                    self.hits += 1
+                    return copy.deepcopy(entry[0])
+
+        if entry is not None and entry[1]:
+            headers = dict(kwargs.get('custom_headers') or {})
+            headers['If-None-Match'] = entry[1]
+            kwargs['custom_headers'] = headers
+
+        try:
+            resource = method(*args, **kwargs)
+        except azure_exceptions.CloudError as e:
+            if entry is None or e.status_code != 304:
+                raise
+            with self._lock:
+                self.revalidations += 1
+            self._store(key, entry[0], copied=True)
+            return copy.deepcopy(entry[0])
+
+        with self._lock:
+            self.misses += 1
+        self._store(key, resource)
+        return resource
+
+    def _store(self, key, resource, copied=False):
+        """
+        Adds or renews an entry and evicts the least recently used ones.
+
+        :param key: (tuple) – resource ID and expand option.
+        :param resource: the resource to cache.
+        :param copied: (bool) – resource is already the cache's own copy.
+        """
+        if not copied:
+            resource = copy.deepcopy(resource)
+        with self._lock:
+            self._entries[key] = (
+                resource,
+                getattr(resource, 'etag', None),
+                time.monotonic() + self.ttl
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, operations, args, descendants=False):
+        """
+        Drops the entries of a resource and of the parents it belongs to.
+
+        :param operations: SDK operations group of the resource.
+        :param args: (tuple) – positional arguments naming the resource.
+        :param descendants: (bool) – also drop the resource's children.
+        """
+        resource_id = _resource_id(operations, args)
+        with self._lock:
+            for key in list(self._entries):
+                cached_id = key[0]
+                if cached_id == resource_id:
+                    del self._entries[key]
+                elif descendants and cached_id.startswith(resource_id + '/'):
+                    del self._entries[key]
+                elif '/providers/' in cached_id \
+                        and resource_id.startswith(cached_id + '/'):
+                    del self._entries[key]
+
+    def put(self, resource_id, resource):
+        """
+        Adds a resource fetched some other way, e.g. by a list call.
+
+        :param resource_id: (str) – ARM ID of the resource.
+        :param resource: the resource to cache.
+        """
+        self._store((resource_id.lower(), None), resource)
+
+    def update(self, operations, args, resource):
+        """
+        Records a resource that has just been written.
+
+        :param operations: SDK operations group of the resource.
+        :param args: (tuple) – positional arguments naming the resource.
+        :param resource: the resource as returned by the write, or None.
+        """
+        if isinstance(resource, pipeline.ClientRawResponse):
+            resource = resource.output
+        self.invalidate(operations, args)
+        if resource is not None:
+            self._store((_resource_id(operations, args), None), resource)
+
+    def operation_done(self, method, args, handle):
+        """
+        Done callback of a create_update or delete operation.
+
+        :param method: (callable) – SDK method that started the operation.
+        :param args: (tuple) – positional arguments of the call.
+        :param handle: (OperationHandle) – the finished operation.
+        """
+        if method.__name__ == 'delete' or handle.exception() is not None:
+            self.invalidate(
+                method.__self__, args, descendants=method.__name__ == 'delete'
+            )
+        else:
+            self.update(method.__self__, args, handle.result())
+
+
+# Change Detection
+# Properties that Resource Manager sets or rewrites on every write, so they
+# never count as a difference even where the SDK does not mark them
+# read-only.
+_VOLATILE_PROPERTIES = frozenset(['etag', 'provisioningState', 'resourceGuid'])
+
+# Child collections that a parent's PUT carries inline. A PUT that leaves
+# one out deletes the children, so a missing collection means an empty one.
+_INLINE_CHILDREN = frozenset([
+    'subnets',
+    'virtualNetworkPeerings',
+    'routes',
+    'securityRules',
+    'authorizations',
+    'peerings',
+])
+
+
+_ENUM_VALUES = None
+
+
+def _enum_values():
+    """
+    Returns the lower-cased values of every enum in the network models,
+    e.g. 'allow' or 'virtualappliance'. Resource Manager matches these
+    without regard to case, as it does resource IDs.
+
+    :return: frozenset of str
+    """
+    global _ENUM_VALUES
+    if _ENUM_VALUES is None:
+        network_models = importlib.import_module('azure.mgmt.network.models')
+        _ENUM_VALUES = frozenset(
+            str(member.value).lower()
+            for value in vars(network_models).values()
+            if isinstance(value, type) and issubclass(value, enum.Enum)
+            for member in value
+        )
+    return _ENUM_VALUES
+
+
+def _rest_value(value):
+    """
+    Returns a model as the JSON Resource Manager exchanges, without its
+    read-only properties.
+
+    :param value: (Model, dict, or None) – SDK model or JSON already.
+    :return: dict, or value as it is
+    """
+    if hasattr(value, 'serialize'):
+        return value.serialize()
+    return value
+
+
+class ChangeDetector(object):
+    """
+    Skips create_update calls that would not change anything.
+
+    Before a create_or_update is sent, the resource is read, through the
+    global read_cache if it is set, and compared with the parameters: the
+    properties the parameters set, and the inline child collections
+    (subnets, routes, security rules, peerings, and authorizations) whether
+    they are set or not, since a PUT deletes the children it leaves out.
+    Other properties the parameters leave out are defaulted by the service
+    and not compared. Resource IDs and enum values are compared without
+    regard to case, locations also without spaces, other strings exactly,
+    lists item by item, matched by name where the items have one, and tags
+    as a whole. If nothing differs and the resource's provisioning state is
+    Succeeded, the PUT is not sent and the function returns the current
+    resource as if it had written it.
+
+    :param ignore: (iterable) – more property names, as in the REST API
+        (e.g. 'dnsSettings'), never to compare.
+    """
+
+    def __init__(self, ignore=()):
+        self.ignore = _VOLATILE_PROPERTIES | frozenset(ignore)
+        self.skipped = 0
+        self.sent = 0
+        self._lock = threading.Lock()
+
+    def current(self, method, args, kwargs):
+        """
+        Reads the resource a create_or_update would write and returns it if
+        the write would not change it.
+
+        :param method: (callable) – SDK create_or_update method.
+        :param args: (tuple) – positional arguments for method: the names
+            of the resource followed by its parameters.
+        :param kwargs: (dict) – keyword arguments for method.
+        :return: the current resource, or None if the write is needed
+        """
+        try:
+            current = _read(
+                method.__self__.get,
+                *args[:-1],
+                custom_headers=kwargs.get('custom_headers')
+            )
+        except azure_exceptions.CloudError as e:
+            if e.status_code != 404:
+                raise
+            current = None
+        if self.unchanged(args[-1], current):
+            return current
+        return None
+
+    def unchanged(self, desired, current):
+        """
+        Tells whether writing the desired parameters would leave a resource
+        as it is, and counts the write as skipped or sent accordingly.
+
+        :param desired: (Model or dict) – parameters of the write.
+        :param current: (Model or dict) – resource as it is now, None if it
+            does not exist.
+        :return: bool
+        """
+        state = getattr(current, 'provisioning_state', None) or getattr(
+            getattr(current, 'properties', None), 'provisioning_state', None)
+        unchanged = current is not None and state in (None, 'Succeeded') \
+            and not self.differences(desired, current)
+        with self._lock:
+            if unchanged:
+                self.skipped += 1
+            else:
+                self.sent += 1
+        return unchanged
+
+    def differences(self, desired, current):
+        """
+        Lists the properties that writing the desired parameters would
+        change.
+
+        :param desired: (Model or dict) – parameters of the write.
+        :param current: (Model or dict) – resource as it is now.
+        :return: list of str, dotted property paths as in the REST API,
+            e.g. 'properties.subnets[web].properties.addressPrefix'
+        """
+        found = []
+        self._compare(_rest_value(desired), _rest_value(current), '', found)
+        return found
+
+    def _compare(self, desired, current, path, found, key=None):
+        if isinstance(desired, dict):
+            if not isinstance(current, dict):
+                found.append(path)
+                return
+            for name, value in desired.items():
+                if name in self.ignore:
+                    continue
+                child = path + '.' + name if path else name
+                if name == 'tags':
+                    if (value or {}) != (current.get(name) or {}):
+                        found.append(child)
+                    continue
+                self._compare(value, current.get(name), child, found, name)
+            if not path:
+                wanted = desired.get('properties') or {}
+                existing = current.get('properties') or {}
+                for name in sorted(_INLINE_CHILDREN - self.ignore):
+                    if name not in wanted and existing.get(name):
+                        found.append('properties.' + name)
+        elif isinstance(desired, list):
+            if not isinstance(current, list) or len(desired) != len(current):
+                found.append(path)
+                return
+            named = all(
+                isinstance(item, dict) and item.get('name')
+                for item in desired + current
+            )
+            if named:
+                by_name = {item['name'].lower(): item for item in current}
+                for item in desired:
+                    self._compare(
+                        item,
+                        by_name.get(item['name'].lower()),
+                        '{}[{}]'.format(path, item['name']),
+                        found
+                    )
+            else:
+                for index, item in enumerate(desired):
+                    self._compare(
+                        item,
+                        current[index],
+                        '{}[{}]'.format(path, index),
+                        found
+                    )
+        elif isinstance(desired, str):
+            if not isinstance(current, str):
+                found.append(path)
+            elif key == 'location':
+                if desired.replace(' ', '').lower() \
+                        != current.replace(' ', '').lower():
+                    found.append(path)
+            elif key == 'id' or _ARM_ID.match(desired) \
+                    or desired.lower() in _enum_values():
+                if desired.lower() != current.lower():
+                    found.append(path)
+            elif desired != current:
+                found.append(path)
+        elif desired != current:
+            found.append(path)
+
+    def stats(self):
+        """
+        Returns how many writes were skipped and sent since creation.
+
+        :return: dict with skipped and sent
+        """
+        with self._lock:
+            return {'skipped': self.skipped, 'sent': self.sent}
+
+
+# Metrics
+def _write(
+        method,
+        *args,
+        **kwargs
+):
+    """
+    Sends an SDK create or update that is not a long running operation,
+    retried under the global retry_policy if it is set, timed if the global
+    metrics is set, and traced if the global tracer is set. When the global
+    change_detector is set and the resource already matches the
+    parameters, nothing is sent and the current resource is returned.
+
+    :param method: (callable) – SDK create_or_update method.
+    :param args: positional arguments for method.
+    :param kwargs: keyword arguments for method.
+    :return: the resource
+    :raises: CloudError
+    """
+    if change_detector is not None and not kwargs.get('raw'):
+        current = change_detector.current(method, args, kwargs)
+        if current is not None:
+            return current
+    call = method
+    if retry_policy is not None:
+        call = functools.partial(retry_policy.call, method, method)
+    if metrics is not None or tracer is not None:
+        return _observed(method, call, *args, **kwargs)
+    return call(*args, **kwargs)
+
+
+def _observed(
+        method,
+        call,
+        *args,
+        **kwargs
+):
+    """
+    Runs a synchronous SDK call under the global metrics and tracer.
+
+    :param method: (callable) – SDK method the call is for.
+    :param call: (callable) – what to run, method itself or a wrapper of it.
+    :param args: positional arguments for call.
+    :param kwargs: keyword arguments for call.
+    :return: what call returns
+    """
+    span = tracer.start_call(method, args) if tracer is not None else None
+    started = time.perf_counter()
+    try:
+        result = call(*args, **kwargs)
+    except Exception as e:
+        if metrics is not None:
+            metrics.request_done(method, started, e)
+        if span is not None:
+            tracer.finish(span, e)
+        raise
+    if metrics is not None:
+        metrics.request_done(method, started)
+    if span is not None:
+        tracer.finish(span)
+    return result
+
+
+def _add_hook(operations, hook):
+    """
+    Adds a requests response hook to the client of an SDK operations group,
+    once.
+
+    :param operations: SDK operations group.
+    :param hook: (callable) – hook(response, *args, **kwargs).
+    """
+    hooks = operations._client.config.hooks
+    if hook not in hooks:
+        with _hooks_lock:
+            if hook not in hooks:
+                hooks.append(hook)
+
+
+_hooks_lock = threading.Lock()
+
+
+# Logging
+def _log_result(
+        function,
+        resource
+):
+    """
+    Logs the resource a create_update or get function returned.
+
+    :param function: (callable) – function from this module.
+    :param resource: the resource, or None.
+    """
+    if log_sink is None or log_sink.level > logging.INFO:
+        return
+    if isinstance(resource, pipeline.ClientRawResponse):
+        resource = resource.output
+    state = getattr(resource, 'provisioning_state', None)
+    if state is None:
+        state = getattr(getattr(resource, 'properties', None),
+                        'provisioning_state', None)
+    fields = {'id': getattr(resource, 'id', None), 'state': state}
+    if log_sink.level <= logging.DEBUG:
+        fields['resource'] = resource
+    log_sink.emit(logging.INFO, function.__name__, **fields)
+
+
+def _log_status(
+        function,
+        handle,
+        *names
+):
+    """
+    Logs the status of the operation a delete function waited on.
+
+    :param function: (callable) – function from this module.
+    :param handle: (OperationHandle) – the finished operation.
+    :param names: positional name arguments of the call.
+    """
+    if log_sink is None or log_sink.level > logging.INFO:
+        return
+    log_sink.emit(
+        logging.INFO,
+        function.__name__,
+        path=_resource_path(function, names),
+        state=handle.status()
+    )
+
+
+def _log_error(
+        function,
+        error
+):
+    """
+    Logs the error a function caught.
+
+    :param function: (callable) – function from this module.
+    :param error: (Exception) – the error, usually a CloudError.
+    """
+    if log_sink is None or log_sink.level > logging.ERROR:
+        return
+    request = getattr(getattr(error, 'response', None), 'request', None)
+    log_sink.emit(
+        logging.ERROR,
+        function.__name__,
+        error=type(error).__name__,
+        status=getattr(error, 'status_code', None),
+        url=getattr(request, 'url', None),
+        message=str(error)
+    )
+
+
+class LogSink(object):
+    """
+    Structured log of what the functions did, written on a background
+    thread.
+
+    The calling thread only filters a record by level, samples it, and
+    queues it; a writer thread formats queued records and writes them in
+    batches, so logging does not hold up the calls. Records below WARNING
+    are kept at sample_rate; warnings and errors are always kept. When the
+    queue is full, records are dropped and counted rather than blocking.
+    Records still queued when the interpreter exits are written first.
+
+    Text lines read: time level event key=value ...
+
+    :param stream: file to write to, sys.stdout at the time of writing when
+        None.
+    :param level: (int) – lowest level logged, e.g. logging.INFO.
+    :param sample_rate: (float) – fraction of records below WARNING kept.
+    :param json_lines: (bool) – write one JSON object per record instead of
+        text.
+    :param max_queued: (int) – records held before new ones are dropped.
+    """
+
+    def __init__(self, stream=None, level=logging.INFO, sample_rate=1.0,
+                 json_lines=False, max_queued=10000):
+        self.stream = stream
+        self.level = level
+        self.sample_rate = sample_rate
+        self.json_lines = json_lines
+        self.dropped = 0
+        self.sampled_out = 0
+        self._queue = queue.Queue(max_queued)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def emit(self, level, event, **fields):
+        """
+        Queues a record.
+
+        :param level: (int) – e.g. logging.INFO.
+        :param event: (str) – what happened, e.g. the function name.
+        :param fields: values of the record. They are formatted on the
+            writer thread.
+        :return: True if the record was queued
+        """
+        if level < self.level:
+            return False
+        if level < logging.WARNING and self.sample_rate < 1.0 \
+                and random.random() >= self.sample_rate:
+            with self._lock:
+                self.sampled_out += 1
+            return False
+        fields['time'] = time.time()
+        fields['level'] = level
+        fields['event'] = event
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(fields)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def flush(self):
+        """
+        Waits until every queued record has been written.
+        """
+        if self._thread is not None:
+            self._queue.join()
+
+    def format(self, record):
+        """
+        Formats a record as one line.
+
+        :param record: (dict) – fields of the record.
+        :return: str
+        """
+        record = dict(record)
+        stamp = time.strftime(
+            '%Y-%m-%dT%H:%M:%S', time.gmtime(record.pop('time'))
+        )
+        level = logging.getLevelName(record.pop('level'))
+        event = record.pop('event')
+        if self.json_lines:
+            record.update(time=stamp, level=level, event=event)
+            return json.dumps(record, default=str, sort_keys=True) + '\n'
+        return ' '.join(
+            [stamp, level, event] +
+            ['{}={}'.format(k, str(v).replace('\n', ' '))
+             for k, v in sorted(record.items()) if v is not None]
+        ) + '\n'
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name='LogSink')
+                thread.daemon = True
+                thread.start()
+                self._thread = thread
+                atexit.register(self.flush)
+
+    def _run(self):
+        """
+        Body of the writer thread.
+        """
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                stream = self.stream or sys.stdout
+                stream.write(''.join(self.format(r) for r in batch))
+                stream.flush()
+            except Exception:
+                with self._lock:
+                    self.dropped += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+log_sink = LogSink()
+
+
+# Inventory Operations
+# Resource types that can be listed for a whole subscription, and the ones
+# that can only be listed per resource group.
+_LIST_ALL_TYPES = (
+    'virtual_networks',
+    'route_tables',
+    'network_security_groups',
+    'public_ip_addresses',
+    'network_interfaces',
+    'express_route_circuits',
+)
+_LIST_BY_GROUP_TYPES = (
+    'local_network_gateways',
+    'virtual_network_gateways',
+    'virtual_network_gateway_connections',
+)
+
+# Child resources that the list calls return inside their parent, as
+# (model attribute, JSON property, resource type) triples.
+_CHILD_RESOURCES = {
+    'virtual_networks': (
+        ('subnets', 'subnets', 'subnets'),
+        ('virtual_network_peerings', 'virtualNetworkPeerings',
+         'virtual_network_peerings'),
+    ),
+    'route_tables': (
+        ('routes', 'routes', 'routes'),
+    ),
+    'express_route_circuits': (
+        ('authorizations', 'authorizations',
+         'express_route_circuit_authorizations'),
+        ('peerings', 'peerings', 'express_route_circuit_peerings'),
+    ),
+}
+_CHILD_PARENTS = {
+    child[2]: parent
+    for parent, children in _CHILD_RESOURCES.items()
+    for child in children
+}
+
+
+class Inventory(object):
+    """
+    Snapshot of the resources of a subscription, indexed by resource ID.
+
+    :param subscription_id: (str) – subscription the snapshot belongs to.
+    """
+
+    def __init__(self, subscription_id):
+        self.subscription_id = subscription_id
+        self.taken_at = time.time()
+        self._by_id = {}
+        self._by_type = collections.defaultdict(list)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def add(self, resource_type, resource):
+        """
+        Adds a resource and the child resources embedded in it.
+
+        :param resource_type: (str) – _RESOURCE_PATHS key of the resource.
+        :param resource: the resource model, or a RawResource.
+        """
+        self._index(resource_type, resource.id, resource)
+        children = _CHILD_RESOURCES.get(resource_type, ())
+        if children and isinstance(resource, RawResource):
+            # Parsed for the children's IDs only, and not kept, so the
+            # snapshot holds JSON bytes until a resource is read.
+            properties = json.loads(resource.content).get('properties') or {}
+            for _, name, child_type in children:
+                for index, child in enumerate(properties.get(name) or ()):
+                    self._index(child_type, child['id'], RawResource(
+                        parent=resource, path=('properties', name, index)
+                    ))
+            return
+        for attribute, _, child_type in children:
+            for child in getattr(resource, attribute, None) or ():
+                self.add(child_type, child)
+
+    def _index(self, resource_type, resource_id, resource):
+        """
+        Adds a resource to the indexes, without its children.
+
+        :param resource_type: (str) – _RESOURCE_PATHS key of the resource.
+        :param resource_id: (str) – ARM ID of the resource.
+        :param resource: the resource model, or a RawResource.
+        """
+        key = resource_id.lower()
+        self._by_id[key] = resource
+        self._by_type[resource_type].append(key)
+
+    def get(self, resource_type, *names):
+        """
+        Looks a resource up by the same names its get function takes, e.g.
+        inventory.get('subnets', 'rg', 'vnet01', 'GatewaySubnet').
+
+        :param resource_type: (str) – _RESOURCE_PATHS key of the resource.
+        :param names: (str) – resource group name, then resource names.
+        :return: the resource, or None if it was not in the subscription
+        """
+        return self._by_id.get('/subscriptions/{}/{}'.format(
+            self.subscription_id,
+            _RESOURCE_PATHS[resource_type].format(*names)
+        ).lower())
+
+    def list(self, resource_type, resource_group_name=None):
+        """
+        Lists the resources of one type.
+
+        :param resource_type: (str) – _RESOURCE_PATHS key of the resources.
+        :param resource_group_name: (str) – only list this resource group.
+        :return: list of resources
+        """
+        keys = self._by_type.get(resource_type, [])
+        if resource_group_name is not None:
+            prefix = '/subscriptions/{}/resourcegroups/{}'.format(
+                self.subscription_id, resource_group_name
+            ).lower()
+            keys = [key for key in keys
+                    if key == prefix or key.startswith(prefix + '/')]
+        return [self._by_id[key] for key in keys]
+
+    def prime(self, cache):
+        """
+        Loads every resource of the snapshot into a ReadCache.
+
+        :param cache: (ReadCache) – cache to fill.
+        """
+        for resource_id, resource in self._by_id.items():
+            cache.put(resource_id, resource)
+
+
+def _list_resources(resource_type, method, *args):
+    """
+    Runs one list call of take_inventory and reads all of its pages.
+
+    :param resource_type: (str) – _RESOURCE_PATHS key being listed.
+    :param method: (callable) – SDK list, list_all, or get method.
+    :param args: positional arguments for method.
+    :return: (resource type, list of resources) tuple
+    """
+    result = method(*args)
+    if method.__name__ == 'get':
+        return resource_type, [result]
+    return resource_type, list(result)
+
+
+def _list_json(resource_type, method, *args):
+    """
+    Runs one list call of take_inventory like _list_resources, but sends
+    the requests itself and returns the resources as RawResource objects.
+
+    Each page is parsed once to find its items and nextLink, but no model
+    is built.
+
+    :param resource_type: (str) – _RESOURCE_PATHS key being listed.
+    :param method: (callable) – SDK list, list_all, or get method.
+    :param args: positional arguments for method.
+    :return: (resource type, list of RawResource) tuple
+    """
+    if method.__name__ == 'get':
+        return resource_type, [_read_json(method, *args)]
+
+    operations = method.__self__
+    path = _RESOURCE_PATHS[resource_type].rsplit('/', 1)[0]
+    if method.__name__ == 'list_all':
+        path = 'providers/' + path.split('/providers/', 1)[1]
+    url = operations._client.format_url('/subscriptions/{}/{}'.format(
+        parse.quote(operations.config.subscription_id, safe=''),
+        path.format(*[parse.quote(arg, safe='') for arg in args])
+    ))
+    query = {'api-version': _api_version(operations)}
+
+    resources = []
+    while url:
+        page = json.loads(_send_json(operations, url, query).content)
+        # Each item is kept as compact JSON, which takes a fraction of the
+        # memory of the parsed dicts.
+        resources.extend(
+            RawResource(
+                json.dumps(item, separators=(',', ':')).encode('utf-8'),
+                item.get('id')
+            )
+            for item in page.get('value') or ()
+        )
+        # nextLink already carries the api-version and skip token.
+        url = page.get('nextLink')
+        query = {}
+    return resource_type, resources
+
+
+def take_inventory(
+        resource_group_names=None,
+        max_workers=8,
+        client=None,
+        raw=None,
+        resource_types=None
+):
+    """
+    Loads every resource this module manages with paged list calls.
+
+    Virtual networks, route tables, NSGs, public IPs, NICs and circuits
+    are listed once for the whole subscription, gateways, local network
+    gateways and connections once per resource group. Subnets, peerings,
+    routes, and circuit authorizations and peerings come embedded in their
+    parents. The calls run in parallel. If the global read_cache is set it
+    is primed with the snapshot, so the get functions are served from it.
+
+    With raw='json' the snapshot holds RawResource objects instead of
+    models, which takes a fraction of the CPU time and memory for large
+    subscriptions. Such a snapshot does not prime the read cache.
+
+    :param resource_group_names: (list) – only inventory these resource
+        groups. All resource groups of the subscription by default.
+    :param max_workers: (int) – maximum number of list calls in flight.
+    :param client: (ClientHandle) – clients to use instead of the global
+        network_client and resource_client.
+    :param raw: (str) – 'json' to skip deserializing the resources.
+    :param resource_types: (list) – only list these resource types, e.g.
+        ['network_security_groups', 'route_tables']. Child types are listed
+        with their parents. Resource groups are always listed.
+    :return: Inventory
+    :raises: CloudError
+    """
+    list_all_types = _LIST_ALL_TYPES
+    list_by_group_types = _LIST_BY_GROUP_TYPES
+    if resource_types is not None:
+        wanted = set(_CHILD_PARENTS.get(t, t) for t in resource_types)
+        list_all_types = tuple(t for t in list_all_types if t in wanted)
+        list_by_group_types = tuple(
+            t for t in list_by_group_types if t in wanted
+        )
+    networks = _network(client)
+    resources = _resource(client)
+    inventory = Inventory(networks.config.subscription_id)
+    span = tracer.start_span('take_inventory') if tracer is not None else None
+    list_resources = _list_json if raw == 'json' else _list_resources
+
+    jobs = []
+    if resource_group_names is None:
+        groups = list_resources(
+            'resource_groups', resources.resource_groups.list
+        )[1]
+        for group in groups:
+            inventory.add('resource_groups', group)
+        resource_group_names = [
+            group['name'] if raw == 'json' else group.name
+            for group in groups
+        ]
+        for resource_type in list_all_types:
+            jobs.append((
+                resource_type,
+                getattr(networks, resource_type).list_all
+            ))
+        list_by_group = list_by_group_types
+    else:
+        for name in resource_group_names:
+            jobs.append((
+                'resource_groups', resources.resource_groups.get, name
+            ))
+        list_by_group = list_all_types + list_by_group_types
+
+    for name in resource_group_names:
+        for resource_type in list_by_group:
+            jobs.append((
+                resource_type,
+                getattr(networks, resource_type).list,
+                name
+            ))
+
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = []
+        for job in jobs:
+            call = list_resources
+            if span is not None:
+                call = tracer.wrap(
+                    list_resources,
+                    '{}.list'.format(job[0]),
+                    {'cumulus.resource_type': job[0]}
+                )
+            pending.append(executor.submit(call, *job))
+        for future in pending:
+            resource_type, resources = future.result()
+            for resource in resources:
+                inventory.add(resource_type, resource)
+
+    if span is not None:
+        span.attributes['cumulus.resources'] = len(inventory)
+        tracer.finish(span)
+    if read_cache is not None and raw != 'json':
+        inventory.prime(read_cache)
+    return inventory
+
+
+# Journal
+# Item a journaled bulk run is sending on this thread, as (journal, key,
+# digest), so _send_operation can record where to poll it.
+_journal_item = threading.local()
+
+
+def _response(
+        method,
+        url,
+        status,
+        reason,
+        headers,
+        content
+):
+    """
+    Builds a requests.Response without sending anything, so CloudError,
+    ClientRawResponse, LongRunningOperation, and the SDK deserializers take
+    it as they would a real one.
+
+    :param method: (str) – HTTP method of the request.
+    :param url: (str) – request URL.
+    :param status: (int) – HTTP status.
+    :param reason: (str) – HTTP reason phrase.
+    :param headers: (dict) – response headers.
+    :param content: (bytes) – response body.
+    :return: requests.Response
+    """
+    response = models.Response()
+    response.status_code = status
+    response.reason = reason
+    response.headers = structures.CaseInsensitiveDict(headers)
+    response._content = content
+    response.encoding = 'utf-8'
+    response.url = url
+    response.request = models.Request(method, url).prepare()
+    return response
+
+
+# Bulk Apply Operations
+BulkResult = collections.namedtuple(
+    'BulkResult',
+    ['operation', 'args', 'kwargs', 'result', 'error', 'elapsed']
+)
+
+
+def _timed_call(operation, args, kwargs):
+    """
+    Runs one bulk item and wraps its outcome in a BulkResult.
+
+    :param operation: (callable) – function from this module to call.
+    :param args: (tuple) – positional arguments for the operation.
+    :param kwargs: (dict) – keyword arguments for the operation.
+    :return: BulkResult
+    """
+    start = time.monotonic()
+    try:
+        result = operation(*args, **kwargs)
+        error = None
+    except Exception as e:
+        result = None
+        error = e
+    return BulkResult(
+        operation.__name__,
+        args,
+        kwargs,
+        result,
+        error,
+        time.monotonic() - start
+    )
+
+
+# Child resource types whose writes Resource Manager takes one at a time
+# per parent, answering others with AnotherOperationInProgress, and the
+# parent types whose own writes take the same lock.
+_SERIALIZED_CHILDREN = frozenset([
+    'subnets',
+    'routes',
+    'virtual_network_peerings',
+    'express_route_circuit_authorizations',
+    'express_route_circuit_peerings',
+])
+_SERIALIZED_PARENTS = frozenset([
+    'virtual_networks',
+    'route_tables',
+    'express_route_circuits',
+])
+
+
+def _parent_key(operation, args, kwargs):
+    """
+    Returns the key of the parent resource a call has to wait its turn on.
+
+    :param operation: (callable) – function from this module.
+    :param args: (tuple) – positional arguments of the call.
+    :param kwargs: (dict) – keyword arguments of the call.
+    :return: (subscription, parent path) tuple, or None for calls that can
+        run at any time
+    """
+    if not operation.__name__.startswith(_WRITE_FUNCTIONS):
+        return None
+    resource_type = _resource_type(operation)
+    if resource_type in _SERIALIZED_CHILDREN:
+        path = _resource_path(operation, args).rsplit('/', 2)[0]
+    elif resource_type in _SERIALIZED_PARENTS:
+        path = _resource_path(operation, args)
+    else:
+        return None
+    return getattr(kwargs.get('client'), 'subscription_id', None), path
+
+
+class ParentScheduler(object):
+    """
+    Thread pool that runs the writes under one parent resource one at a
+    time, in the order they were submitted, and everything else in
+    parallel.
+
+    Writes to subnets, routes, peerings, and circuit authorizations and
+    peerings, and to the vnet, route table, or circuit they belong to, are
+    queued per parent; only the oldest of each queue is on the pool at a
+    time, so two parents never wait on each other. A write made with
+    wait=False holds its parent until its OperationHandle is done.
+
+    :param max_workers: (int) – maximum number of calls in flight at once.
+    """
+
+    def __init__(self, max_workers=8):
+        self._executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._queues = {}
+        self._queued = 0
+        self._lock = threading.Lock()
+        self._drained = threading.Condition(self._lock)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def submit(self, call, operation, args, kwargs):
+        """
+        Schedules a call.
+
+        :param call: (callable) – call(operation, args, kwargs) to run, such
+            as _timed_call.
+        :param operation: (callable) – function from this module.
+        :param args: (tuple) – positional arguments for the operation.
+        :param kwargs: (dict) – keyword arguments for the operation.
+        :return: concurrent.futures.Future of what call returns
+        """
+        key = _parent_key(operation, args, kwargs)
+        if key is None:
+            return self._executor.submit(call, operation, args, kwargs)
+        future = futures.Future()
+        task = (future, call, operation, args, kwargs)
+        with self._lock:
+            self._queued += 1
+            queue = self._queues.get(key)
+            if queue is not None:
+                queue.append(task)
+                return future
+            self._queues[key] = collections.deque()
+        self._start(key, task)
+        return future
+
+    def shutdown(self, wait=True):
+        """
+        Stops the pool once every queued call has run.
+
+        :param wait: (bool) – wait for the calls to finish.
+        """
+        if wait:
+            with self._lock:
+                while self._queued:
+                    self._drained.wait()
+        self._executor.shutdown(wait)
+
+    def _start(self, key, task):
+        future, call, operation, args, kwargs = task
+        running = self._executor.submit(call, operation, args, kwargs)
+        running.add_done_callback(
+            functools.partial(self._finished, key, future)
+        )
+
+    def _finished(self, key, future, running):
+        """
+        Passes on the outcome of a queued call, and starts the next call
+        under its parent once the write is done.
+        """
+        error = running.exception()
+        result = None if error is not None else running.result()
+        handle = getattr(result, 'result', result)
+        if isinstance(handle, OperationHandle) and not handle.done():
+            handle.add_done_callback(lambda _: self._next(key))
+        else:
+            self._next(key)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _next(self, key):
+        with self._lock:
+            self._queued -= 1
+            queue = self._queues[key]
+            if queue:
+                task = queue.popleft()
+            else:
+                del self._queues[key]
+                task = None
+            self._drained.notify_all()
+        if task is not None:
+            self._start(key, task)
+
+
+def bulk_apply(
+        items,
+        max_workers=8,
+        journal=None
+):
+    """
+    Runs many create_update, get, or delete calls concurrently.
+
+    Each item is submitted to a thread pool of at most max_workers threads,
+    so a batch takes roughly as long as its slowest items instead of the sum
+    of all of them. Writes under the same parent resource, such as the
+    subnets of one vnet, run one at a time in item order through a
+    ParentScheduler. Results come back in the same order as items.
+
+    :param items: (list) – (operation, args) or (operation, args, kwargs)
+        tuples, where operation is one of the functions in this module, e.g.
+        (create_update_public_ip_addresses, ('rg', 'pip01', parameters)).
+    :param max_workers: (int) – maximum number of calls in flight at once.
+    :param journal: (cumulus_journal.Journal) – journal to record the
+        create_update and delete items in, and to skip or resume them from
+        when it comes from an earlier run.
+    :return: list of BulkResult(operation, args, kwargs, result, error,
+        elapsed). result is what the function returned, error is any
+        exception it raised, and elapsed is its wall time in seconds.
+    """
+    span = tracer.start_span('bulk_apply') if tracer is not None else None
+    run = _timed_call
+    if journal is not None:
+        run = journal.call
+
+    with ParentScheduler(max_workers=max_workers) as scheduler:
+        pending = []
+        for index, item in enumerate(items):
+            operation, args = item[0], tuple(item[1])
+            kwargs = dict(item[2]) if len(item) > 2 else {}
+            call = run
+            if span is not None:
+                call = tracer.wrap(
+                    run,
+                    operation.__name__,
+                    {'cumulus.item': index}
+                )
+            pending.append(scheduler.submit(call, operation, args, kwargs))
+
+        results = [future.result() for future in pending]
+
+    if span is not None:
+        span.attributes['cumulus.items'] = len(results)
+        tracer.finish(span)
+    return results
+
+
+# Topology Operations
+class DependencyFailed(Exception):
+    """
+    Raised in place of a topology item whose dependencies did not deploy.
+    """
+
+
+# ARM resource path of each resource type below /subscriptions/{id}/. The
+# fields are the wrapper's positional arguments in order.
+_RESOURCE_PATHS = {
+    'resource_groups': 'resourceGroups/{0}',
+    'virtual_networks':
+        'resourceGroups/{0}/providers/Microsoft.Network/virtualNetworks/{1}',
+    'subnets':
+        'resourceGroups/{0}/providers/Microsoft.Network/virtualNetworks/{1}'
+        '/subnets/{2}',
+    'route_tables':
+        'resourceGroups/{0}/providers/Microsoft.Network/routeTables/{1}',
+    'routes':
+        'resourceGroups/{0}/providers/Microsoft.Network/routeTables/{1}'
+        '/routes/{2}',
+    'virtual_network_peerings':
+        'resourceGroups/{0}/providers/Microsoft.Network/virtualNetworks/{1}'
+        '/virtualNetworkPeerings/{2}',
+    'local_network_gateways':
+        'resourceGroups/{0}/providers/Microsoft.Network'
+        '/localNetworkGateways/{1}',
+    'public_ip_addresses':
+        'resourceGroups/{0}/providers/Microsoft.Network/publicIPAddresses/{1}',
+    'virtual_network_gateways':
+        'resourceGroups/{0}/providers/Microsoft.Network'
+        '/virtualNetworkGateways/{1}',
+    'virtual_network_gateway_connections':
+        'resourceGroups/{0}/providers/Microsoft.Network/connections/{1}',
+    'network_interfaces':
+        'resourceGroups/{0}/providers/Microsoft.Network/networkInterfaces/{1}',
+    'network_security_groups':
+        'resourceGroups/{0}/providers/Microsoft.Network'
+        '/networkSecurityGroups/{1}',
+    'express_route_circuits':
+        'resourceGroups/{0}/providers/Microsoft.Network'
+        '/expressRouteCircuits/{1}',
+    'express_route_circuit_authorizations':
+        'resourceGroups/{0}/providers/Microsoft.Network'
+        '/expressRouteCircuits/{1}/authorizations/{2}',
+    'express_route_circuit_peerings':
+        'resourceGroups/{0}/providers/Microsoft.Network'
+        '/expressRouteCircuits/{1}/peerings/{2}',
+}
+
+_ARM_ID = re.compile(r'/subscriptions/[^/]+/(resourceGroups/.+)', re.I)
+
+
+# Prefixes of the names of the functions that write a resource.
+# merge_subnets writes the virtual network it merges the subnets into.
+_WRITE_FUNCTIONS = ('create_update_', 'delete_', 'merge_subnets')
+
+
+def _resource_type(operation):
+    """
+    Returns the _RESOURCE_PATHS key of a create_update, get, or delete
+    function, or of merge_subnets, which writes a virtual network.
+
+    :param operation: (callable) – function from this module.
+    :return: str
+    """
+    if operation.__name__ == 'merge_subnets':
+        return 'virtual_networks'
+    name = operation.__name__.split('_', 1)[1]
+    if name.startswith('update_'):
+        name = name[len('update_'):]
+    if name == 'resource_group':
+        return 'resource_groups'
+    return name.replace('circuits_authorizations', 'circuit_authorizations')
+
+
+def _resource_path(operation, args):
+    """
+    Builds the lower-cased ARM path (without the subscription) of the
+    resource a wrapper call acts on.
+
+    :param operation: (callable) – function from this module.
+    :param args: (tuple) – positional arguments of the call.
+    :return: str
+    """
+    return _RESOURCE_PATHS[_resource_type(operation)].format(*args).lower()
+
+
+def _referenced_paths(value, found=None):
+    """
+    Collects the lower-cased ARM paths of every resource ID referenced
+    anywhere inside a parameters object.
+
+    :param value: (Model, dict, list, or str) – parameters to search.
+    :param found: (set) – set to add the paths to.
+    :return: set of str
+    """
+    if found is None:
+        found = set()
+    if isinstance(value, str):
+        match = _ARM_ID.match(value)
+        if match:
+            found.add(match.group(1).rstrip('/').lower())
+    elif isinstance(value, dict):
+        for item in value.values():
+            _referenced_paths(item, found)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _referenced_paths(item, found)
+    elif hasattr(value, '__dict__'):
+        for item in vars(value).values():
+            _referenced_paths(item, found)
+    return found
+
+
+def _topology_graph(items):
+    """
+    Works out which topology items each item has to wait for.
+
+    An item depends on the items that create its resource group, its parent
+    resource (the vnet of a subnet, the route table of a route, ...), every
+    resource its parameters reference by ID, and any earlier item for the
+    same resource.
+
+    :param items: (list) – (operation, args) or (operation, args, kwargs)
+        tuples of create_update functions.
+    :return: list with the set of item indexes each item depends on
+    :raises: ValueError if an item is not a create_update call or the
+        dependencies form a cycle
+    """
+    paths = []
+    owners = {}
+    for index, item in enumerate(items):
+        if not item[0].__name__.startswith('create_update_'):
+            raise ValueError(
+                '{} is not a create_update function'.format(item[0].__name__)
+            )
+        path = _resource_path(item[0], tuple(item[1]))
+        paths.append(path)
+        owners.setdefault(path, []).append(index)
+
+    depends_on = []
+    for index, item in enumerate(items):
+        wanted = _referenced_paths(
+            list(item[1]) + list(item[2].values() if len(item) > 2 else [])
+        )
+        wanted.discard(paths[index])
+        segments = paths[index].split('/')
+        for end in range(2, len(segments), 2):
+            wanted.add('/'.join(segments[:end]))
+
+        deps = set()
+        for path in wanted:
+            # A reference to an undeclared child (e.g. a subnet created as
+            # part of its vnet) waits on the closest declared ancestor.
+            while path and path not in owners:
+                path = path.rsplit('/', 2)[0] if path.count('/') > 1 else ''
+            if path and path != paths[index]:
+                deps.update(owners[path])
+        deps.update(i for i in owners[paths[index]] if i < index)
+        depends_on.append(deps)
+
+    _topology_layers(depends_on)
+    return depends_on
+
+
+def _topology_layers(depends_on):
+    """
+    Groups item indexes into layers that only depend on earlier layers.
+
+    :param depends_on: (list) – set of item indexes each item depends on.
+    :return: list of lists of item indexes
+    :raises: ValueError if the dependencies form a cycle
+    """
+    remaining = dict(enumerate(depends_on))
+    layers = []
+    done = set()
+    while remaining:
+        layer = sorted(i for i, deps in remaining.items() if deps <= done)
+        if not layer:
+            raise ValueError(
+                'Topology has a dependency cycle between items {}'.format(
+                    sorted(remaining))
+            )
+        layers.append(layer)
+        done.update(layer)
+        for i in layer:
+            del remaining[i]
+    return layers
+
+
+def plan_topology(
+        items
+):
+    """
+    Shows the order deploy_topology would create a topology in.
+
+    :param items: (list) – (operation, args) or (operation, args, kwargs)
+        tuples of create_update functions, in any order.
+    :return: list of layers, each a list of the items that can run in
+        parallel once all earlier layers are done
+    :raises: ValueError
+    """
+    layers = _topology_layers(_topology_graph(items))
+    return [[items[i] for i in layer] for layer in layers]
+
+
+def deploy_topology(
+        items,
+        max_workers=8,
+        journal=None
+):
+    """
+    Creates a whole topology, running every item as soon as the items it
+    depends on have finished.
+
+    Dependencies are worked out from the calls themselves: resource group
+    -> virtual network -> subnets -> gateways -> connections and so on, plus
+    any resource referenced by ID in the parameters (route tables and NSGs
+    on subnets, public IPs on gateways, gateways on connections). The run
+    takes about as long as its critical path rather than the sum of its
+    items. Items whose dependencies failed are not attempted. An item made
+    with wait=False has finished when its OperationHandle is done, not when
+    the call returns. Writes under the same parent resource run one at a
+    time, in the order they become ready, through a ParentScheduler.
+
+    :param items: (list) – (operation, args) or (operation, args, kwargs)
+        tuples of create_update functions, in any order.
+    :param max_workers: (int) – maximum number of calls in flight at once.
+    :param journal: (cumulus_journal.Journal) – journal to record the items
+        in, and to skip or resume them from when it comes from an earlier
+        run.
+    :return: list of BulkResult in the same order as items. Skipped items
+        have a DependencyFailed error.
+    :raises: ValueError
+    """
+    depends_on = _topology_graph(items)
+    run = _timed_call
+    if journal is not None:
+        run = journal.call
+    waiting = dict(enumerate(depends_on))
+    results = [None] * len(items)
+    failed = set()
+    span = None
+    if tracer is not None:
+        span = tracer.start_span(
+            'deploy_topology', attributes={'cumulus.items': len(items)}
+        )
+
+    with ParentScheduler(max_workers=max_workers) as scheduler:
+        running = {}
+        # Results of wait=False items whose operations are still running.
+        held = {}
+        while waiting or running:
+            for index, deps in sorted(waiting.items()):
+                if deps & failed:
+                    item = items[index]
+                    results[index] = BulkResult(
+                        item[0].__name__,
+                        tuple(item[1]),
+                        dict(item[2]) if len(item) > 2 else {},
+                        None,
+                        DependencyFailed(
+                            'items {} did not deploy'.format(
+                                sorted(deps & failed))
+                        ),
+                        0.0
+                    )
+                    failed.add(index)
+                    del waiting[index]
+                elif all(results[i] is not None for i in deps):
+                    item = items[index]
+                    call = run
+                    if span is not None:
+                        call = tracer.wrap(
+                            run,
+                            item[0].__name__,
+                            {
+                                'cumulus.item': index,
+                                'cumulus.depends_on': ','.join(
+                                    str(i) for i in sorted(deps)
+                                ),
+                            }
+                        )
+                    future = scheduler.submit(
+                        call,
+                        item[0],
+                        tuple(item[1]),
+                        dict(item[2]) if len(item) > 2 else {}
+                    )
+                    running[future] = index
+                    del waiting[index]
+
+            if not running:
+                continue
+            finished, _ = futures.wait(
+                running, return_when=futures.FIRST_COMPLETED
+            )
+            for future in finished:
+                index = running.pop(future)
+                if isinstance(future, OperationHandle):
+                    result = held.pop(index)
+                else:
+                    result = future.result()
+                    handle = result.result
+                    if isinstance(handle, OperationHandle) \
+                            and not handle.done():
+                        held[index] = result
+                        running[handle] = index
+                        continue
+                results[index] = result
+                # The wrappers log and swallow CloudError, returning None.
+                if result.error or result.result is None or (
+                        isinstance(result.result, OperationHandle)
+                        and result.result.exception() is not None):
+                    failed.add(index)
+
+    if span is not None:
+        span.attributes['cumulus.failed'] = len(failed)
+        tracer.finish(span)
+    return results
 
 
 # END OF CUMULUS.PY
\ No newline at end of file
@@ -0,0 +1,728 @@
+#!/usr/bin/python3
+#
+# fake_arm.py
+#
+###############################################################################
+# Local stand-in for the Microsoft.Resources and Microsoft.Network endpoints
+# that cumulus_v05.py calls, so the module can be load tested and profiled
+# without a live subscription.
+#
+# Resource groups and every network resource type cumulus_v05 manages can be
+# created, read, listed, and deleted. Writes are long running operations with
+# Azure-AsyncOperation and Location headers, resources carry etags and honor
+# If-None-Match and If-Match, and responses carry the
+# x-ms-ratelimit-remaining headers. Latency, operation duration, 5xx errors,
+# and 429 throttling can be injected. Children written inside a parent
+# (subnets in a vnet, routes in a route table) are stored as children and
+# deleted by a PUT of the parent that leaves them out, and concurrent writes
+# under one parent fail with AnotherOperationInProgress the way ARM does.
+#
+# Run standalone:
+#     python3 fake_arm.py --port 8080 --lro-seconds 2 --latency 0.01
+#
+# Or from Python:
+#     server = fake_arm.FakeArmServer(lro_seconds=0.5)
+#     server.start()
+#     cumulus_v05.network_client = server.network_client()
+###############################################################################
+
+import argparse
+import collections
+import json
+import random
+import re
+import socketserver
+import threading
+import time
+import uuid
+from http import server as http_server
+from urllib import parse
+
+DEFAULT_SUBSCRIPTION = '00000000-0000-0000-0000-000000000000'
+
+# Child collections that a parent's PUT and GET carry inline, by parent
+# type. The JSON property and the URL segment have the same name.
+_INLINE_CHILDREN = {
+    'virtualnetworks': ('subnets', 'virtualNetworkPeerings'),
+    'routetables': ('routes',),
+    'expressroutecircuits': ('authorizations', 'peerings'),
+    'networksecuritygroups': ('securityRules',),
+}
+
+_NETWORK = r'/subscriptions/(?P<sub>[^/]+)'
+_GROUP = _NETWORK + r'/resourcegroups/(?P<rg>[^/]+)'
+_ROUTES = [
+    ('operation', re.compile(
+        _NETWORK + r'/providers/microsoft\.network/locations/[^/]+'
+        r'/(?P<kind>operations|operationresults)/(?P<op>[^/]+)$')),
+    ('groups', re.compile(_NETWORK + r'/resourcegroups$')),
+    ('group', re.compile(_GROUP + r'$')),
+    ('list_all', re.compile(
+        _NETWORK + r'/providers/microsoft\.network/(?P<type>[^/]+)$')),
+    ('collection', re.compile(
+        _GROUP + r'/providers/microsoft\.network/(?P<type>[^/]+)'
+        r'(?:/(?P<parent>[^/]+)/(?P<child_type>[^/]+))?$')),
+    ('resource', re.compile(
+        _GROUP + r'/providers/microsoft\.network/(?P<type>[^/]+)'
+        r'/(?P<name>[^/]+)(?:/(?P<child_type>[^/]+)/(?P<child>[^/]+))?$')),
+]
+
+
+class _Operation(object):
+    """
+    A long running PUT or DELETE in progress.
+
+    :param kind: (str) – 'put' or 'delete'.
+    :param key: (str) – lower-cased ID of the resource being written.
+    :param done_at: (float) – monotonic time the operation finishes.
+    :param fail: (bool) – whether the operation ends in Failed.
+    """
+
+    def __init__(self, kind, key, done_at, fail=False):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.key = key
+        self.done_at = done_at
+        self.fail = fail
+        self.status = 'InProgress'
+
+
+class FakeArm(object):
+    """
+    In-memory Resource Manager state and request handling, independent of
+    the HTTP server.
+
+    :param latency: (float) – seconds added to every response.
+    :param lro_seconds: (float) – how long PUTs and DELETEs stay in
+        progress. 0 completes them in the initial response.
+    :param retry_after: (int) – Retry-After sent on in-progress operations,
+        or None to send none.
+    :param error_rate: (float) – fraction of requests answered with 500.
+    :param throttle_rate: (float) – fraction of requests answered with 429.
+    :param failure_rate: (float) – fraction of long running operations that
+        end in Failed.
+    :param read_limit: (int) – reads allowed per subscription per window.
+    :param write_limit: (int) – writes allowed per subscription per window.
+    :param limit_window: (float) – length of the rate limit window, seconds.
+    :param parent_conflicts: (bool) – reject writes under a parent that has
+        a write in progress with 429 AnotherOperationInProgress.
+    :param page_size: (int) – items per page of list responses.
+
+    requests counts the requests answered by method, and handle_seconds the
+    time spent answering them, injected latency included.
+    """
+
+    def __init__(self, latency=0.0, lro_seconds=0.0, retry_after=None,
+                 error_rate=0.0, throttle_rate=0.0, failure_rate=0.0,
+                 read_limit=12000, write_limit=1200, limit_window=3600,
+                 parent_conflicts=True, page_size=100):
+        self.latency = latency
+        self.lro_seconds = lro_seconds
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.failure_rate = failure_rate
+        self.read_limit = read_limit
+        self.write_limit = write_limit
+        self.limit_window = limit_window
+        self.parent_conflicts = parent_conflicts
+        self.page_size = page_size
+        self.base_url = 'http://127.0.0.1'
+        self.requests = collections.Counter()
+        self.handle_seconds = 0.0
+        self._resources = collections.OrderedDict()
+        self._children = collections.defaultdict(collections.OrderedDict)
+        self._operations = {}
+        self._busy = {}
+        self._budgets = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._resources)
+
+    # Request entry point
+
+    def handle(self, method, url, headers, body):
+        """
+        Answers one request.
+
+        :param method: (str) – HTTP method.
+        :param url: (str) – request path and query.
+        :param headers: (dict) – request headers, lower-cased names.
+        :param body: (bytes) – request body.
+        :return: (status, headers dict, body dict or None) tuple
+        """
+        start = time.perf_counter()
+        try:
+            return self._handle(method, url, headers, body)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.handle_seconds += elapsed
+
+    def _handle(self, method, url, headers, body):
+        if self.latency:
+            time.sleep(self.latency)
+        path, _, query = url.partition('?')
+        path = parse.unquote(path).rstrip('/')
+        query = parse.parse_qs(query)
+
+        with self._lock:
+            self.requests[method] += 1
+            route, match = self._route(path)
+            if route == 'operation':
+                self.requests['POLL'] += 1
+                return self._operation_status(match)
+
+            roll = random.random()
+            if roll < self.throttle_rate:
+                return 429, {'Retry-After': '1'}, _error(
+                    'TooManyRequests', 'Injected throttling.')
+            if roll < self.throttle_rate + self.error_rate:
+                return 500, {}, _error(
+                    'InternalServerError', 'Injected server error.')
+
+            sub = match.group('sub') if match else DEFAULT_SUBSCRIPTION
+            kind = 'reads' if method == 'GET' else 'writes'
+            remaining, reset = self._spend(sub, kind)
+            limit_headers = {
+                'x-ms-ratelimit-remaining-subscription-' + kind:
+                    str(max(remaining, 0))
+            }
+            if remaining < 0:
+                limit_headers['Retry-After'] = str(int(reset) + 1)
+                return 429, limit_headers, _error(
+                    'SubscriptionRequestsThrottled',
+                    'Number of {} requests for subscription {} exceeded '
+                    'the limit.'.format(kind[:-1], sub))
+
+            if match is None:
+                status, out_headers, out = 404, {}, _error(
+                    'InvalidResourceType', 'No route for ' + path)
+            else:
+                status, out_headers, out = self._dispatch(
+                    route, match, method, path, query, headers, body)
+            out_headers.update(limit_headers)
+            return status, out_headers, out
+
+    def _route(self, path):
+        for name, pattern in _ROUTES:
+            match = pattern.match(path.lower())
+            if match:
+                return name, match
+        return None, None
+
+    def _dispatch(self, route, match, method, path, query, headers, body):
+        if route == 'groups' and method == 'GET':
+            return self._list(
+                [k for k, v in self._resources.items()
+                 if v['type'] == 'Microsoft.Resources/resourceGroups'
+                 and k.startswith(path.lower() + '/')],
+                path, query)
+        if route == 'list_all' and method == 'GET':
+            sub = '/subscriptions/' + match.group('sub') + '/'
+            suffix = '/providers/microsoft.network/' + match.group('type')
+            keys = [k for k in self._resources if k.startswith(sub)
+                    and k.rsplit('/', 1)[0].endswith(suffix)]
+            return self._list(keys, path, query)
+        if route == 'collection' and method == 'GET':
+            if match.group('parent'):
+                parent = path.lower().rsplit('/', 1)[0]
+                if parent not in self._resources:
+                    return _not_found(path)
+                return self._list(list(self._children[parent]), path, query)
+            group = _group_key(match)
+            if group not in self._resources:
+                return _group_not_found(match)
+            prefix = path.lower() + '/'
+            return self._list(
+                [k for k in self._resources
+                 if k.startswith(prefix) and '/' not in k[len(prefix):]],
+                path, query)
+        if route in ('group', 'resource'):
+            key = path.lower()
+            if method == 'GET':
+                return self._get(key, headers)
+            if 'if-match' in headers and method in ('PUT', 'DELETE'):
+                failed = self._precondition(key, headers['if-match'])
+                if failed is not None:
+                    return failed
+            if method == 'PUT':
+                return self._put(route, match, key, path, body)
+            if method == 'DELETE':
+                return self._delete(route, match, key)
+        return 405, {}, _error('MethodNotAllowed', method + ' ' + path)
+
+    # Rate limits
+
+    def _spend(self, sub, kind):
+        """
+        Takes one request from a subscription's read or write budget.
+
+        :return: (requests remaining, seconds until the window resets)
+        """
+        now = time.monotonic()
+        key = (sub, kind)
+        limit = self.read_limit if kind == 'reads' else self.write_limit
+        start, used = self._budgets.get(key, (now, 0))
+        if now - start >= self.limit_window:
+            start, used = now, 0
+        used += 1
+        self._budgets[key] = (start, used)
+        return limit - used, self.limit_window - (now - start)
+
+    # Resources
+
+    def _render(self, key):
+        """
+        Returns the JSON of a resource with its inline children.
+        """
+        self._settle_key(key)
+        resource = self._resources.get(key)
+        if resource is None:
+            return None
+        out = dict(resource)
+        out['properties'] = dict(resource.get('properties') or {})
+        type_name = key.split('/')[-2]
+        for collection in _INLINE_CHILDREN.get(type_name, ()):
+            out['properties'][collection] = [
+                self._render(child)
+                for child in self._children[key]
+                if child.split('/')[-2] == collection.lower()
+                and child in self._resources
+            ]
+        return out
+
+    def _get(self, key, headers):
+        resource = self._render(key)
+        if resource is None:
+            return _not_found(key)
+        if headers.get('if-none-match') == resource['etag']:
+            return 304, {'ETag': resource['etag']}, None
+        return 200, {'ETag': resource['etag']}, resource
+
+    def _precondition(self, key, etag):
+        """
+        Checks the If-Match header of a write.
+
+        :return: a 412 response if the resource does not match, else None
+        """
+        resource = self._render(key)
+        if resource is not None and etag in ('*', resource['etag']):
+            return None
+        return 412, {}, _error(
+            'PreconditionFailed',
+            'The If-Match header {} does not match resource {}.'.format(
+                etag, key))
+
+    def _list(self, keys, path, query):
+        skip = int(query.get('$skiptoken', ['0'])[0])
+        page = keys[skip:skip + self.page_size]
+        out = {'value': [self._render(k) for k in page]}
+        out['value'] = [v for v in out['value'] if v is not None]
+        if skip + self.page_size < len(keys):
+            out['nextLink'] = '{}{}?api-version=fake&$skiptoken={}'.format(
+                self.base_url, path, skip + self.page_size)
+        return 200, {}, out
+
+    def _parent_key(self, route, match, key):
+        if route == 'group':
+            return None
+        if match.group('child'):
+            return key.rsplit('/', 2)[0]
+        return _group_key(match)
+
+    def _busy_parent(self, key):
+        """
+        Returns the write in progress on a resource or its parents, if any.
+        """
+        while key.count('/') > 4:
+            op_id = self._busy.get(key)
+            if op_id is not None:
+                self._settle(self._operations[op_id])
+                if self._busy.get(key) == op_id:
+                    return self._operations[op_id]
+            key = key.rsplit('/', 2)[0]
+        return None
+
+    def _put(self, route, match, key, path, body):
+        try:
+            payload = json.loads(body.decode('utf-8') or '{}')
+        except ValueError:
+            return 400, {}, _error('InvalidRequestContent', 'Bad JSON body')
+
+        parent = self._parent_key(route, match, key)
+        if route == 'group':
+            created = key not in self._resources
+            self._resources[key] = {
+                'id': path,
+                'name': path.rsplit('/', 1)[1],
+                'type': 'Microsoft.Resources/resourceGroups',
+                'location': payload.get('location'),
+                'tags': payload.get('tags'),
+                'properties': {'provisioningState': 'Succeeded'},
+                'etag': _etag(),
+            }
+            return (201 if created else 200), {}, self._render(key)
+
+        if _group_key(match) not in self._resources:
+            return _group_not_found(match)
+        if parent not in self._resources:
+            return _not_found(parent)
+        if self.parent_conflicts:
+            busy = self._busy_parent(key)
+            if busy is not None:
+                return 429, {'Retry-After': '1'}, _error(
+                    'AnotherOperationInProgress',
+                    'Another operation on this or dependent resource is in '
+                    'progress.')
+
+        created = key not in self._resources
+        state = 'Updating' if self.lro_seconds > 0 else 'Succeeded'
+        self._store(key, path, payload, state)
+        if parent.count('/') > 4:
+            self._children[parent][key] = None
+            self._resources[parent]['etag'] = _etag()
+
+        type_name = key.split('/')[-2]
+        properties = payload.get('properties') or {}
+        for collection in _INLINE_CHILDREN.get(type_name, ()):
+            # A PUT replaces the resource: children it leaves out are
+            # deleted.
+            wanted = {}
+            for child in properties.get(collection) or []:
+                child_path = '{}/{}/{}'.format(
+                    path, collection, child.get('name'))
+                wanted[child_path.lower()] = child_path
+                self._store(child_path.lower(), child_path, child, state)
+                self._children[key][child_path.lower()] = None
+            for child in list(self._children[key]):
+                if child.split('/')[-2] == collection.lower() \
+                        and child not in wanted:
+                    self._remove(child)
+
+        headers = {}
+        if self.lro_seconds > 0:
+            headers = self._start(
+                'put', key, match.group('sub'), self._busy_key(parent, key))
+        return (201 if created else 200), headers, self._render(key)
+
+    def _store(self, key, path, payload, state):
+        existing = self._resources.get(key, {})
+        properties = dict(payload.get('properties') or {})
+        for collection in _INLINE_CHILDREN.get(key.split('/')[-2], ()):
+            properties.pop(collection, None)
+        properties['provisioningState'] = state
+        properties.setdefault(
+            'resourceGuid',
+            existing.get('properties', {}).get('resourceGuid')
+            or str(uuid.uuid4()))
+        segments = path.split('/')
+        self._resources[key] = {
+            'id': path,
+            'name': segments[-1],
+            'type': 'Microsoft.Network/' + '/'.join(segments[7::2]),
+            'location': payload.get('location'),
+            'tags': payload.get('tags'),
+            'properties': properties,
+            'etag': _etag(),
+        }
+        if self._resources[key]['location'] is None:
+            del self._resources[key]['location']
+            del self._resources[key]['tags']
+
+    def _busy_key(self, parent, key):
+        return parent if parent.count('/') > 4 else key
+
+    def _delete(self, route, match, key):
+        if key not in self._resources:
+            if route == 'group':
+                return _group_not_found(match)
+            return 204, {}, None
+        parent = self._parent_key(route, match, key)
+        if self.parent_conflicts and route != 'group':
+            busy = self._busy_parent(key)
+            if busy is not None:
+                return 429, {'Retry-After': '1'}, _error(
+                    'AnotherOperationInProgress',
+                    'Another operation on this or dependent resource is in '
+                    'progress.')
+        if self.lro_seconds <= 0:
+            self._remove(key)
+            return 200, {}, None
+        self._resources[key]['properties']['provisioningState'] = 'Deleting'
+        busy_key = key if route == 'group' else self._busy_key(parent, key)
+        return 202, self._start('delete', key, match.group('sub'),
+                                busy_key), None
+
+    def _remove(self, key):
+        for child_key in [k for k in self._resources
+                          if k.startswith(key + '/')]:
+            self._resources.pop(child_key, None)
+            self._children.pop(child_key, None)
+        self._resources.pop(key, None)
+        self._children.pop(key, None)
+        parent = key.rsplit('/', 2)[0]
+        if key in self._children.get(parent, {}):
+            del self._children[parent][key]
+            if parent in self._resources:
+                self._resources[parent]['etag'] = _etag()
+
+    # Long running operations
+
+    def _start(self, kind, key, sub, busy_key):
+        operation = _Operation(
+            kind,
+            key,
+            time.monotonic() + self.lro_seconds,
+            fail=random.random() < self.failure_rate
+        )
+        self._operations[operation.id] = operation
+        self._busy[busy_key] = operation.id
+        operation.busy_key = busy_key
+        base = '{}/subscriptions/{}/providers/Microsoft.Network/locations/' \
+               'fake'.format(self.base_url, sub)
+        headers = {
+            'Azure-AsyncOperation': '{}/operations/{}?api-version=fake'.format(
+                base, operation.id),
+        }
+        if kind == 'delete':
+            headers['Location'] = '{}/operationresults/{}?api-version=fake' \
+                .format(base, operation.id)
+        if self.retry_after is not None:
+            headers['Retry-After'] = str(self.retry_after)
+        return headers
+
+    def _settle(self, operation):
+        """
+        Finishes an operation whose time has come.
+        """
+        if operation.status != 'InProgress' \
+                or time.monotonic() < operation.done_at:
+            return
+        operation.status = 'Failed' if operation.fail else 'Succeeded'
+        if self._busy.get(operation.busy_key) == operation.id:
+            del self._busy[operation.busy_key]
+        if operation.kind == 'delete' and not operation.fail:
+            self._remove(operation.key)
+            return
+        resource = self._resources.get(operation.key)
+        if resource is None:
+            return
+        state = operation.status if operation.kind == 'put' else 'Failed'
+        resource['properties']['provisioningState'] = state
+        for child in self._children.get(operation.key, ()):
+            if child in self._resources:
+                self._resources[child]['properties'][
+                    'provisioningState'] = state
+
+    def _settle_key(self, key):
+        op_id = self._busy.get(key)
+        if op_id is None:
+            parent = key.rsplit('/', 2)[0]
+            op_id = self._busy.get(parent)
+        if op_id is not None:
+            self._settle(self._operations[op_id])
+
+    def _operation_status(self, match):
+        operation = self._operations.get(match.group('op'))
+        if operation is None:
+            return _not_found(match.group('op'))
+        self._settle(operation)
+        headers = {}
+        if operation.status == 'InProgress' and self.retry_after is not None:
+            headers['Retry-After'] = str(self.retry_after)
+        if match.group('kind') == 'operations':
+            body = {'status': operation.status}
+            if operation.status == 'Failed':
+                body['error'] = {'code': 'InternalServerError',
+                                 'message': 'Injected operation failure.'}
+            return 200, headers, body
+        if operation.status == 'InProgress':
+            headers['Location'] = '{}/subscriptions/{}/providers/' \
+                'Microsoft.Network/locations/fake/operationresults/{}' \
+                '?api-version=fake'.format(
+                    self.base_url, match.group('sub'), operation.id)
+            return 202, headers, None
+        if operation.status == 'Failed':
+            return 500, headers, _error(
+                'InternalServerError', 'Injected operation failure.')
+        return 204, headers, None
+
+
+def _etag():
+    return 'W/"{}"'.format(uuid.uuid4())
+
+
+def _error(code, message):
+    return {'error': {'code': code, 'message': message}}
+
+
+def _group_key(match):
+    return '/subscriptions/{}/resourcegroups/{}'.format(
+        match.group('sub'), match.group('rg'))
+
+
+def _not_found(key):
+    return 404, {}, _error(
+        'NotFound', 'Resource {} was not found.'.format(key))
+
+
+def _group_not_found(match):
+    return 404, {}, _error(
+        'ResourceGroupNotFound',
+        "Resource group '{}' could not be found.".format(match.group('rg')))
+
+
+class _RequestHandler(http_server.BaseHTTPRequestHandler):
+    """
+    Translates HTTP requests into FakeArm.handle calls.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _answer(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        status, out_headers, out = self.server.arm.handle(
+            self.command, self.path, headers, body)
+        data = json.dumps(out).encode('utf-8') if out is not None else b''
+        self.send_response(status)
+        for name, value in out_headers.items():
+            self.send_header(name, value)
+        self.send_header('x-ms-request-id', str(uuid.uuid4()))
+        if data:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_PUT = do_DELETE = do_PATCH = do_POST = _answer
+
+
+class _ThreadingServer(socketserver.ThreadingMixIn, http_server.HTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class FakeArmServer(object):
+    """
+    Serves a FakeArm over HTTP on a background thread.
+
+    :param host: (str) – address to listen on.
+    :param port: (int) – port to listen on, 0 for any free port.
+    :param kwargs: options for FakeArm (latency, lro_seconds, ...).
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, **kwargs):
+        self.arm = FakeArm(**kwargs)
+        self._server = _ThreadingServer((host, port), _RequestHandler)
+        self._server.arm = self.arm
+        self._thread = None
+        self.base_url = 'http://{}:{}'.format(*self._server.server_address)
+        self.arm.base_url = self.base_url
+
+    def start(self):
+        """
+        Starts serving.
+
+        :return: base URL of the server
+        """
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name='FakeArmServer')
+        self._thread.daemon = True
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        """
+        Stops serving and closes the socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def cloud(self):
+        """
+        Returns an msrestazure Cloud whose Resource Manager is this server.
+
+        :return: msrestazure.azure_cloud.Cloud
+        """
+        from msrestazure import azure_cloud
+        return azure_cloud.Cloud(
+            'FakeArm',
+            endpoints=azure_cloud.CloudEndpoints(
+                resource_manager=self.base_url)
+        )
+
+    @staticmethod
+    def credentials():
+        """
+        Returns credentials the server accepts. It does not check tokens.
+
+        :return: msrest.authentication.BasicTokenAuthentication
+        """
+        from msrest.authentication import BasicTokenAuthentication
+        return BasicTokenAuthentication({'access_token': 'fake'})
+
+    def network_client(self, subscription_id=DEFAULT_SUBSCRIPTION):
+        """
+        Returns a NetworkManagementClient pointed at the server.
+        """
+        from azure.mgmt.network import NetworkManagementClient
+        return NetworkManagementClient(
+            self.credentials(), subscription_id, base_url=self.base_url)
+
+    def resource_client(self, subscription_id=DEFAULT_SUBSCRIPTION):
+        """
+        Returns a ResourceManagementClient pointed at the server.
+        """
+        from azure.mgmt.resource import ResourceManagementClient
+        return ResourceManagementClient(
+            self.credentials(), subscription_id, base_url=self.base_url)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve a fake ARM network endpoint.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--lro-seconds', type=float, default=1.0)
+    parser.add_argument('--retry-after', type=int, default=None)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--read-limit', type=int, default=12000)
+    parser.add_argument('--write-limit', type=int, default=1200)
+    args = parser.parse_args()
+
+    fake = FakeArmServer(
+        args.host,
+        args.port,
+        latency=args.latency,
+        lro_seconds=args.lro_seconds,
+        retry_after=args.retry_after,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        failure_rate=args.failure_rate,
+        read_limit=args.read_limit,
+        write_limit=args.write_limit
+    )
+    print('Serving fake ARM on ' + fake.base_url)
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == '__main__':
+    main()
+
+# END OF FAKE_ARM.PY
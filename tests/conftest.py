@@ -0,0 +1,77 @@
+#
+# conftest.py
+#
+###############################################################################
+# Fixtures shared by the tests: a fake_arm server on a free port, with the
+# global clients of cumulus_v05 pointed at it and every optional feature
+# (read cache, retry policy, journal, ...) put back as it was afterwards.
+###############################################################################
+
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cumulus_polling  # noqa: E402
+import cumulus_v05 as cumulus  # noqa: E402
+import fake_arm  # noqa: E402
+
+_GLOBALS = (
+    'network_client',
+    'resource_client',
+    'default_client',
+    'rate_limiter',
+    'retry_policy',
+    'poll_loop',
+    'read_cache',
+    'change_detector',
+    'metrics',
+    'tracer',
+    'log_sink',
+)
+
+
+@pytest.fixture
+def make_arm(monkeypatch):
+    """
+    Returns a function that starts a fake_arm server with the given FakeArm
+    options, points cumulus_v05 at it, and creates resource group rg.
+    """
+    servers = []
+    for name in _GLOBALS:
+        monkeypatch.setattr(cumulus, name, getattr(cumulus, name))
+    for name in list(cumulus_polling.POLLING_PROFILES):
+        monkeypatch.setitem(
+            cumulus_polling.POLLING_PROFILES,
+            name,
+            cumulus_polling.PollingPolicy(0.05, 0.1)
+        )
+
+    def make(**kwargs):
+        kwargs.setdefault('lro_seconds', 0.2)
+        server = fake_arm.FakeArmServer(**kwargs)
+        server.start()
+        servers.append(server)
+        cumulus.network_client = server.network_client()
+        cumulus.resource_client = server.resource_client()
+        cumulus.log_sink = cumulus.LogSink(stream=io.StringIO())
+        from azure.mgmt.resource.resources.models import ResourceGroup
+        cumulus.create_update_resource_group(
+            'rg', ResourceGroup(location='eastus')
+        )
+        return server
+
+    yield make
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def arm(make_arm):
+    """
+    A fake_arm server whose long running operations take 0.2 seconds.
+    """
+    return make_arm()
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from azure.mgmt.network.models import AddressSpace, Subnet, VirtualNetwork
+
+import cumulus_metrics
+import cumulus_rate_limit
+import cumulus_retry
+import cumulus_tracing
+import cumulus_v05 as cumulus
+
+pytest.importorskip('aiohttp')
+import cumulus_aio  # noqa: E402
+
+
+def _vnet(prefix='10.0.0.0/16'):
+    return VirtualNetwork(
+        location='eastus',
+        address_space=AddressSpace(address_prefixes=[prefix])
+    )
+
+
+def test_calls_work_on_successive_event_loops(arm):
+    vnet = asyncio.run(
+        cumulus_aio.create_update_virtual_networks('rg', 'vnet', _vnet())
+    )
+    clients = list(cumulus_aio._loop_clients.values())
+
+    again = asyncio.run(cumulus_aio.get_virtual_networks('rg', 'vnet'))
+
+    assert vnet.name == again.name == 'vnet'
+    assert all(client._session is None for client in clients)
+
+
+def test_explicit_client(arm):
+    async def run():
+        async with cumulus_aio.AsyncClient() as client:
+            await cumulus_aio.create_update_virtual_networks(
+                'rg', 'vnet', _vnet(), client=client
+            )
+            subnet = await cumulus_aio.create_update_subnets(
+                'rg', 'vnet', 'a', Subnet(address_prefix='10.0.0.0/24'),
+                client=client
+            )
+            return subnet, client
+
+    subnet, client = asyncio.run(run())
+
+    assert subnet.address_prefix == '10.0.0.0/24'
+    assert client._session is None
+    assert cumulus.get_subnets('rg', 'vnet', 'a').name == 'a'
+
+
+def test_failed_calls_return_none(arm):
+    assert asyncio.run(cumulus_aio.get_virtual_networks('rg', 'none')) \
+        is None
+
+
+def test_bulk_apply(arm):
+    items = [
+        (cumulus_aio.create_update_subnets,
+         ('rg', 'vnet', 's{}'.format(i),
+          Subnet(address_prefix='10.0.{}.0/24'.format(i))))
+        for i in range(6)
+    ]
+    cumulus.create_update_virtual_networks('rg', 'vnet', _vnet())
+
+    results = asyncio.run(cumulus_aio.bulk_apply(items))
+
+    assert all(r.error is None and r.result is not None for r in results)
+    assert len(cumulus.get_virtual_networks('rg', 'vnet').subnets) == 6
+
+
+def test_writes_refresh_the_read_cache(arm):
+    cumulus.create_update_virtual_networks('rg', 'vnet', _vnet())
+    cumulus.read_cache = cumulus.ReadCache()
+    cumulus.get_virtual_networks('rg', 'vnet')
+
+    asyncio.run(cumulus_aio.create_update_subnets(
+        'rg', 'vnet', 'a', Subnet(address_prefix='10.0.0.0/24')
+    ))
+
+    vnet = cumulus.get_virtual_networks('rg', 'vnet')
+    assert [s.name for s in vnet.subnets] == ['a']
+
+
+def test_retry_policy_applies(make_arm):
+    arm = make_arm()
+    cumulus.retry_policy = cumulus_retry.RetryPolicy(
+        attempts=10, base=0.01, maximum=0.02, budget=100
+    )
+    cumulus.create_update_virtual_networks('rg', 'vnet', _vnet())
+    arm.arm.error_rate = 0.3
+
+    async def run():
+        return await asyncio.gather(*[
+            cumulus_aio.get_virtual_networks('rg', 'vnet')
+            for _ in range(20)
+        ])
+
+    assert all(v is not None for v in asyncio.run(run()))
+    assert cumulus.retry_policy.stats()['retries']
+
+
+def test_rate_limiter_metrics_and_tracer_apply(arm, tmp_path):
+    cumulus.rate_limiter = cumulus_rate_limit.RateLimiter()
+    cumulus.metrics = cumulus_metrics.Metrics()
+    cumulus.tracer = cumulus_tracing.Tracer(str(tmp_path / 'spans'))
+
+    asyncio.run(
+        cumulus_aio.create_update_virtual_networks('rg', 'vnet', _vnet())
+    )
+    cumulus.tracer.flush()
+
+    stats = cumulus.rate_limiter.stats()
+    assert any(key.endswith('writes') for key in stats)
+    histogram = cumulus.metrics.histogram(
+        'operation_seconds', 'virtual_networks', 'create_or_update'
+    )
+    assert histogram is not None
+    spans = (tmp_path / 'spans').read_text()
+    assert 'virtual_networks.create_or_update' in spans
+    assert 'HTTP PUT' in spans
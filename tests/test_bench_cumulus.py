@@ -0,0 +1,68 @@
+import io
+
+import pytest
+
+import bench_cumulus
+import cumulus_v05 as cumulus
+
+
+@pytest.fixture
+def bench(make_arm):
+    cumulus.log_sink = cumulus.LogSink(stream=io.StringIO())
+    bench = bench_cumulus.Bench('loopback')
+    bench.setup()
+    yield bench
+    bench.close()
+
+
+def test_every_resource_type_has_all_three_functions():
+    funcs = bench_cumulus.wrappers()
+
+    assert set(funcs) == set(cumulus._RESOURCE_PATHS)
+    assert all(set(f) == {'create', 'get', 'delete'} for f in funcs.values())
+
+
+def test_percentile_is_nearest_rank():
+    latencies = [float(i) for i in range(1, 101)]
+
+    assert bench_cumulus.percentile(latencies, 50) == 50.0
+    assert bench_cumulus.percentile(latencies, 99) == 99.0
+    assert bench_cumulus.percentile(latencies, 100) == 100.0
+    assert bench_cumulus.percentile([], 50) == 0.0
+
+
+def test_compare_flags_slower_runs_of_the_same_size():
+    base = {'calls': 10, 'ops_per_sec': 100.0, 'p99_ms': 10.0}
+    results = {
+        'same': dict(base),
+        'slower': dict(base, ops_per_sec=80.0),
+        'later': dict(base, p99_ms=12.0),
+        'resized': dict(base, calls=20, ops_per_sec=1.0),
+    }
+    baseline = {key: base for key in results}
+
+    regressions = bench_cumulus.compare(results, baseline, tolerance=0.1)
+
+    assert [r.split(':')[0] for r in regressions] == ['later', 'slower']
+
+
+def test_bench_type_creates_reads_and_deletes(bench):
+    funcs = bench_cumulus.wrappers()['route_tables']
+
+    rows = bench.bench_type('route_tables', funcs, 3, [1, 2])
+
+    assert [(r['operation'], r['workers']) for r in rows] == [
+        (f.__name__, n)
+        for n in (1, 2)
+        for f in (funcs['create'], funcs['get'], funcs['delete'])
+    ]
+    assert all(r['calls'] == 3 and r['errors'] == 0 for r in rows)
+
+
+def test_breakdown_has_no_poller_part_for_reads(bench):
+    funcs = bench_cumulus.wrappers()['route_tables']
+
+    rows = bench.breakdown('route_tables', funcs, 2)
+
+    assert [r['poller_ms'] is None for r in rows] == [False, True, False]
+    assert all(r['total_ms'] > 0 for r in rows)
@@ -0,0 +1,58 @@
+import time
+
+from azure.mgmt.network.models import PublicIPAddress
+
+import cumulus_v05 as cumulus
+
+
+def _ips(count):
+    return [
+        (
+            cumulus.create_update_public_ip_addresses,
+            ('rg', 'ip{}'.format(i), PublicIPAddress(location='eastus'))
+        )
+        for i in range(count)
+    ]
+
+
+def test_results_come_back_in_item_order(arm):
+    results = cumulus.bulk_apply(_ips(8), max_workers=4)
+
+    names = ['ip{}'.format(i) for i in range(8)]
+    assert [r.args[1] for r in results] == names
+    assert [r.result.result().name for r in results] == names
+    assert all(r.error is None and r.elapsed > 0 for r in results)
+
+
+def test_items_run_concurrently(arm):
+    start = time.monotonic()
+    cumulus.bulk_apply(_ips(8), max_workers=8)
+
+    # One at a time, the operations would take 8 * 0.2 seconds at least.
+    assert time.monotonic() - start < 1.0
+
+
+def test_gets_and_deletes_mix_with_writes(arm):
+    cumulus.bulk_apply(_ips(2))
+    items = [
+        (cumulus.get_public_ip_addresses, ('rg', 'ip0')),
+        (cumulus.delete_public_ip_addresses, ('rg', 'ip1')),
+    ]
+
+    results = cumulus.bulk_apply(items)
+
+    assert results[0].result.name == 'ip0'
+    assert results[1].result.done()
+    assert cumulus.get_public_ip_addresses('rg', 'ip1') is None
+
+
+def test_errors_are_returned_not_raised(arm):
+    items = _ips(1) + [
+        (cumulus.merge_subnets, ('rg', 'vnet', [object()])),
+    ]
+
+    results = cumulus.bulk_apply(items)
+
+    assert results[0].error is None
+    assert isinstance(results[1].error, ValueError)
+    assert results[1].result is None
@@ -0,0 +1,126 @@
+from azure.mgmt.network.models import (
+    AddressSpace,
+    NetworkSecurityGroup,
+    Route,
+    RouteTable,
+    SecurityRule,
+    Subnet,
+    VirtualNetwork,
+)
+
+import cumulus_v05 as cumulus
+
+
+def _nsg(description='allow web', access='Allow', location='eastus'):
+    return NetworkSecurityGroup(
+        location=location,
+        security_rules=[SecurityRule(
+            name='web',
+            description=description,
+            protocol='Tcp',
+            source_port_range='*',
+            destination_port_range='443',
+            source_address_prefix='*',
+            destination_address_prefix='*',
+            access=access,
+            priority=100,
+            direction='Inbound'
+        )]
+    )
+
+
+def test_unchanged_writes_are_skipped(arm):
+    cumulus.create_update_network_security_groups('rg', 'nsg', _nsg())
+    cumulus.change_detector = cumulus.ChangeDetector()
+    puts = arm.arm.requests['PUT']
+
+    nsg = cumulus.create_update_network_security_groups(
+        'rg', 'nsg', _nsg(access='allow', location='East US')
+    ).result()
+
+    assert nsg.name == 'nsg'
+    assert arm.arm.requests['PUT'] == puts
+    assert cumulus.change_detector.stats() == {'skipped': 1, 'sent': 0}
+
+
+def test_case_changes_in_free_text_are_written(arm):
+    cumulus.create_update_network_security_groups('rg', 'nsg', _nsg())
+    cumulus.change_detector = cumulus.ChangeDetector()
+
+    cumulus.create_update_network_security_groups(
+        'rg', 'nsg', _nsg(description='Allow Web')
+    )
+
+    rule = cumulus.get_network_security_groups('rg', 'nsg').security_rules[0]
+    assert rule.description == 'Allow Web'
+
+
+def test_edited_result_of_a_cached_get_is_written(arm):
+    cumulus.create_update_route_tables(
+        'rg', 'rt', RouteTable(location='eastus')
+    )
+    cumulus.read_cache = cumulus.ReadCache()
+    cumulus.change_detector = cumulus.ChangeDetector()
+
+    table = cumulus.get_route_tables('rg', 'rt')
+    table.tags = {'owner': 'network'}
+    cumulus.create_update_route_tables('rg', 'rt', table)
+
+    cumulus.read_cache = None
+    assert cumulus.get_route_tables('rg', 'rt').tags == {'owner': 'network'}
+
+
+def test_new_resources_are_written(arm):
+    cumulus.change_detector = cumulus.ChangeDetector()
+
+    cumulus.create_update_route_tables(
+        'rg', 'rt', RouteTable(location='eastus')
+    )
+
+    assert cumulus.get_route_tables('rg', 'rt') is not None
+    assert cumulus.change_detector.stats() == {'skipped': 0, 'sent': 1}
+
+
+def test_differences_lists_the_changed_properties():
+    detector = cumulus.ChangeDetector()
+    current = RouteTable(location='eastus', tags={'a': 'b'})
+
+    assert detector.differences(
+        RouteTable(location='West US', tags={}), current
+    ) == ['location', 'tags']
+    assert detector.differences(RouteTable(location='East US'), current) \
+        == []
+
+
+def test_left_out_children_count_as_a_difference():
+    detector = cumulus.ChangeDetector()
+    current = RouteTable(
+        location='eastus',
+        routes=[Route(name='default', address_prefix='0.0.0.0/0',
+                      next_hop_type='Internet')]
+    )
+
+    assert detector.differences(RouteTable(location='eastus'), current) \
+        == ['properties.routes']
+    assert detector.differences(RouteTable(location='eastus', routes=[]),
+                                current) == ['properties.routes']
+
+
+def test_drifted_children_are_put_back(arm):
+    def vnet(subnets):
+        return VirtualNetwork(
+            location='eastus',
+            address_space=AddressSpace(address_prefixes=['10.0.0.0/16']),
+            subnets=subnets
+        )
+
+    cumulus.create_update_virtual_networks('rg', 'vnet', vnet(None))
+    cumulus.create_update_subnets(
+        'rg', 'vnet', 'drift', Subnet(address_prefix='10.0.1.0/24')
+    )
+    cumulus.change_detector = cumulus.ChangeDetector()
+
+    cumulus.create_update_virtual_networks('rg', 'vnet', vnet(None))
+
+    assert cumulus.change_detector.stats() == {'skipped': 0, 'sent': 1}
+    assert cumulus.get_virtual_networks('rg', 'vnet').subnets == []
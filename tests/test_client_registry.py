@@ -0,0 +1,80 @@
+import threading
+
+from azure.mgmt.network.models import RouteTable
+from azure.mgmt.resource.resources.models import ResourceGroup
+
+import cumulus_v05 as cumulus
+
+_OTHER = '11111111-1111-1111-1111-111111111111'
+
+
+def test_one_handle_per_cloud_subscription_and_credentials(arm):
+    registry = cumulus.ClientRegistry()
+    credentials = arm.credentials()
+    cloud = arm.cloud()
+
+    handle = registry.get(credentials, _OTHER, cloud)
+
+    assert registry.get(credentials, _OTHER, cloud) is handle
+    assert registry.get(credentials, 'another', cloud) is not handle
+    assert registry.get(arm.credentials(), _OTHER, cloud) is not handle
+    assert len(registry) == 3
+    registry.clear()
+    assert len(registry) == 0
+
+
+def test_clients_are_built_once_across_threads(arm):
+    handle = cumulus.ClientRegistry().get(
+        arm.credentials(), _OTHER, arm.cloud()
+    )
+    clients = []
+    barrier = threading.Barrier(8)
+
+    def build():
+        barrier.wait()
+        clients.append(handle.network)
+
+    threads = [threading.Thread(target=build) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(clients) == 8 and all(c is handle.network for c in clients)
+    assert handle.network.config.subscription_id == _OTHER
+    assert handle.resource.config.base_url == arm.base_url
+
+
+def test_calls_go_to_the_handle_they_are_given(arm):
+    handle = cumulus.ClientRegistry().get(
+        arm.credentials(), _OTHER, arm.cloud()
+    )
+    cumulus.create_update_resource_group(
+        'rg', ResourceGroup(location='eastus'), client=handle
+    )
+
+    cumulus.create_update_route_tables(
+        'rg', 'rt', RouteTable(location='eastus'), client=handle
+    )
+
+    assert cumulus.get_route_tables('rg', 'rt', client=handle).name == 'rt'
+    assert cumulus.get_route_tables('rg', 'rt') is None
+
+
+def test_default_client_stands_in_for_the_globals(arm):
+    cumulus.default_client = cumulus.ClientRegistry().get(
+        arm.credentials(), _OTHER, arm.cloud()
+    )
+    cumulus.network_client = None
+    cumulus.resource_client = None
+
+    cumulus.create_update_resource_group(
+        'rg', ResourceGroup(location='eastus')
+    )
+    cumulus.create_update_route_tables(
+        'rg', 'rt', RouteTable(location='eastus')
+    )
+
+    assert cumulus.get_route_tables(
+        'rg', 'rt', client=cumulus.default_client
+    ).name == 'rt'
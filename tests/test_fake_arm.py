@@ -0,0 +1,120 @@
+import json
+import time
+
+import fake_arm
+
+_GROUP = '/subscriptions/{}/resourceGroups/rg'.format(
+    fake_arm.DEFAULT_SUBSCRIPTION
+)
+_VNET = _GROUP + '/providers/Microsoft.Network/virtualNetworks/vnet'
+
+
+def _put(arm, path, body, headers=None):
+    return arm.handle(
+        'PUT', path + '?api-version=fake', headers or {},
+        json.dumps(body).encode('utf-8')
+    )
+
+
+def _get(arm, path, headers=None):
+    return arm.handle('GET', path + '?api-version=fake', headers or {}, b'')
+
+
+def _vnet(arm, subnets=('a',)):
+    return _put(arm, _VNET, {
+        'location': 'eastus',
+        'properties': {
+            'subnets': [
+                {'name': name, 'properties': {'addressPrefix': '10.0.0.0/24'}}
+                for name in subnets
+            ],
+        },
+    })
+
+
+def _arm(**kwargs):
+    arm = fake_arm.FakeArm(**kwargs)
+    _put(arm, _GROUP, {'location': 'eastus'})
+    return arm
+
+
+def test_writes_are_long_running_operations():
+    arm = _arm(lro_seconds=0.1)
+
+    status, headers, body = _vnet(arm)
+
+    assert status == 201
+    assert body['properties']['provisioningState'] == 'Updating'
+    operation = headers['Azure-AsyncOperation'].split(arm.base_url, 1)[1]
+    assert _get(arm, operation)[2] == {'status': 'InProgress'}
+    time.sleep(0.1)
+    assert _get(arm, operation)[2] == {'status': 'Succeeded'}
+    assert _get(arm, _VNET)[2]['properties']['provisioningState'] \
+        == 'Succeeded'
+
+
+def test_children_are_stored_and_rendered_inline():
+    arm = _arm()
+    _vnet(arm, subnets=('a', 'b'))
+
+    subnets = _get(arm, _VNET)[2]['properties']['subnets']
+
+    assert [s['name'] for s in subnets] == ['a', 'b']
+    assert _get(arm, _VNET + '/subnets/b')[0] == 200
+    _vnet(arm, subnets=('b',))
+    assert _get(arm, _VNET + '/subnets/a')[0] == 404
+
+
+def test_a_put_that_leaves_out_children_deletes_them():
+    arm = _arm()
+    _vnet(arm, subnets=('a', 'b'))
+
+    _put(arm, _VNET, {'location': 'eastus', 'properties': {}})
+
+    assert _get(arm, _VNET)[2]['properties']['subnets'] == []
+    assert _get(arm, _VNET + '/subnets/a')[0] == 404
+
+
+def test_etags_answer_conditional_requests():
+    arm = _arm()
+    etag = _vnet(arm)[2]['etag']
+
+    assert _get(arm, _VNET, {'if-none-match': etag})[0] == 304
+    assert _put(arm, _VNET, {}, {'if-match': 'W/"stale"'})[0] == 412
+    assert _put(arm, _VNET, {'location': 'eastus'}, {'if-match': etag})[0] \
+        == 200
+
+
+def test_writes_under_a_busy_parent_are_refused():
+    arm = _arm(lro_seconds=10)
+    _vnet(arm)
+
+    status, headers, body = _put(
+        arm, _VNET + '/subnets/c', {'properties': {}}
+    )
+
+    assert status == 429
+    assert body['error']['code'] == 'AnotherOperationInProgress'
+
+
+def test_lists_are_paged():
+    arm = _arm(page_size=2)
+    _vnet(arm, subnets=('a', 'b', 'c'))
+
+    page = _get(arm, _VNET + '/subnets')[2]
+    following = page['nextLink'].split(arm.base_url, 1)[1]
+
+    assert [s['name'] for s in page['value']] == ['a', 'b']
+    rest = arm.handle('GET', following, {}, b'')[2]
+    assert [s['name'] for s in rest['value']] == ['c']
+
+
+def test_requests_spend_the_subscription_budget():
+    arm = _arm(read_limit=2)
+
+    answers = [_get(arm, _GROUP) for _ in range(3)]
+
+    assert [a[1]['x-ms-ratelimit-remaining-subscription-reads']
+            for a in answers] == ['1', '0', '0']
+    assert [a[0] for a in answers] == [200, 200, 429]
+    assert 'Retry-After' in answers[2][1]
@@ -0,0 +1,54 @@
+from azure.mgmt.network.models import RouteTable
+
+import cumulus_fan_out
+import cumulus_v05 as cumulus
+import fake_arm
+
+_OTHER = '11111111-1111-1111-1111-111111111111'
+
+
+def _missing_route_table(client, region):
+    return client.network.route_tables.get('rg', 'missing')
+
+
+def test_inventory_of_every_subscription_and_region(arm):
+    for name, location in (('east', 'eastus'), ('west', 'westus')):
+        cumulus.create_update_route_tables(
+            'rg', name, RouteTable(location=location)
+        )
+    job = cumulus_fan_out.InventoryJob(resource_types=['route_tables'])
+
+    results = list(cumulus_fan_out.fan_out(
+        job,
+        [fake_arm.DEFAULT_SUBSCRIPTION, _OTHER],
+        arm.credentials(),
+        regions=['eastus', 'West US'],
+        cloud=arm.cloud(),
+        max_workers=2
+    ))
+
+    found = {
+        (r.subscription_id, r.region):
+            [table.name for table in r.result['route_tables']]
+        for r in results
+    }
+    assert found == {
+        (fake_arm.DEFAULT_SUBSCRIPTION, 'eastus'): ['east'],
+        (fake_arm.DEFAULT_SUBSCRIPTION, 'West US'): ['west'],
+        (_OTHER, 'eastus'): [],
+        (_OTHER, 'West US'): [],
+    }
+    assert all(r.error is None for r in results)
+
+
+def test_job_errors_come_back_with_their_status_code(arm):
+    result, = cumulus_fan_out.fan_out(
+        _missing_route_table,
+        [fake_arm.DEFAULT_SUBSCRIPTION],
+        arm.credentials(),
+        cloud=arm.cloud(),
+        max_workers=1
+    )
+
+    assert result.result is None
+    assert result.error.status_code == 404
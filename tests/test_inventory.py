@@ -0,0 +1,86 @@
+from azure.mgmt.network.models import (
+    AddressSpace,
+    PublicIPAddress,
+    RouteTable,
+    Subnet,
+    VirtualNetwork,
+)
+from azure.mgmt.resource.resources.models import ResourceGroup
+
+import cumulus_v05 as cumulus
+
+
+def _topology(groups=('rg',)):
+    for group in groups:
+        cumulus.create_update_resource_group(
+            group, ResourceGroup(location='eastus')
+        )
+        cumulus.create_update_virtual_networks(
+            group,
+            'vnet',
+            VirtualNetwork(
+                location='eastus',
+                address_space=AddressSpace(address_prefixes=['10.0.0.0/16']),
+                subnets=[
+                    Subnet(name='a', address_prefix='10.0.0.0/24'),
+                    Subnet(name='b', address_prefix='10.0.1.0/24'),
+                ]
+            )
+        )
+        for i in range(5):
+            cumulus.create_update_public_ip_addresses(
+                group, 'ip{}'.format(i), PublicIPAddress(location='eastus')
+            )
+        cumulus.create_update_route_tables(
+            group, 'rt', RouteTable(location='eastus')
+        )
+
+
+def test_snapshot_holds_every_resource_and_embedded_child(make_arm):
+    make_arm(page_size=2)
+    _topology()
+
+    inventory = cumulus.take_inventory()
+
+    assert inventory.get('virtual_networks', 'rg', 'vnet').name == 'vnet'
+    assert inventory.get('subnets', 'rg', 'vnet', 'b').address_prefix \
+        == '10.0.1.0/24'
+    assert len(inventory.list('public_ip_addresses')) == 5
+    assert inventory.get('route_tables', 'rg', 'missing') is None
+
+
+def test_one_list_call_per_type_instead_of_a_get_each(arm):
+    _topology()
+    gets = arm.arm.requests['GET']
+
+    cumulus.take_inventory(max_workers=1)
+
+    # The resource groups, then each type once for the subscription or
+    # once for the one group, however many resources there are.
+    assert arm.arm.requests['GET'] - gets == 1 \
+        + len(cumulus._LIST_ALL_TYPES) + len(cumulus._LIST_BY_GROUP_TYPES)
+
+
+def test_resource_groups_and_types_narrow_the_snapshot(arm):
+    _topology(('rg', 'other'))
+
+    inventory = cumulus.take_inventory(
+        resource_group_names=['other'], resource_types=['subnets']
+    )
+
+    assert [s.name for s in inventory.list('subnets')] == ['a', 'b']
+    assert inventory.list('public_ip_addresses') == []
+    assert inventory.list('virtual_networks', 'rg') == []
+
+
+def test_it_primes_the_read_cache(arm):
+    _topology()
+    cumulus.read_cache = cumulus.ReadCache()
+    cumulus.take_inventory()
+    gets = arm.arm.requests['GET']
+
+    vnet = cumulus.get_virtual_networks('rg', 'vnet')
+    subnet = cumulus.get_subnets('rg', 'vnet', 'a')
+
+    assert (vnet.name, subnet.name) == ('vnet', 'a')
+    assert arm.arm.requests['GET'] == gets
@@ -0,0 +1,120 @@
+import json
+
+from azure.mgmt.network.models import PublicIPAddress, RouteTable
+
+import cumulus_journal
+import cumulus_retry
+import cumulus_v05 as cumulus
+
+
+def _ips(count):
+    return [
+        (
+            cumulus.create_update_public_ip_addresses,
+            ('rg', 'ip{}'.format(i), PublicIPAddress(location='eastus'))
+        )
+        for i in range(count)
+    ]
+
+
+def test_done_items_are_skipped(arm, tmp_path):
+    path = str(tmp_path / 'journal')
+    cumulus.bulk_apply(_ips(4), journal=cumulus_journal.Journal(path))
+    puts = arm.arm.requests['PUT']
+
+    journal = cumulus_journal.Journal(path)
+    results = cumulus.bulk_apply(_ips(4), journal=journal)
+
+    assert arm.arm.requests['PUT'] == puts
+    assert [r.result['state'] for r in results] == ['done'] * 4
+
+
+def test_changed_items_are_sent_again(arm, tmp_path):
+    path = str(tmp_path / 'journal')
+    cumulus.bulk_apply(_ips(1), journal=cumulus_journal.Journal(path))
+    puts = arm.arm.requests['PUT']
+
+    item = (
+        cumulus.create_update_public_ip_addresses,
+        ('rg', 'ip0', PublicIPAddress(location='eastus', tags={'a': 'b'}))
+    )
+    cumulus.bulk_apply([item], journal=cumulus_journal.Journal(path))
+
+    assert arm.arm.requests['PUT'] == puts + 1
+
+
+def test_submitted_items_are_resumed_without_a_put(
+        arm, tmp_path, monkeypatch):
+    path = str(tmp_path / 'journal')
+    # Lose the outcome of every item, as a crash right after the service
+    # accepted them would.
+    with monkeypatch.context() as patch:
+        patch.setattr(cumulus_journal.Journal, 'finished', lambda *args: None)
+        items = [(f, a, {'wait': False}) for f, a in _ips(4)]
+        cumulus.bulk_apply(items, journal=cumulus_journal.Journal(path))
+    puts = arm.arm.requests['PUT']
+
+    journal = cumulus_journal.Journal(path)
+    assert len(journal.entries('submitted')) == 4
+    results = cumulus.bulk_apply(_ips(4), journal=journal)
+
+    assert arm.arm.requests['PUT'] == puts
+    assert all(r.result is not None and r.error is None for r in results)
+    assert len(cumulus_journal.Journal(path).entries('done')) == 4
+
+
+def test_failed_delete_is_sent_again(arm, tmp_path):
+    cumulus.create_update_route_tables(
+        'rg', 'rt', RouteTable(location='eastus')
+    )
+    path = str(tmp_path / 'journal')
+    item = [(cumulus.delete_route_tables, ('rg', 'rt'))]
+
+    arm.arm.failure_rate = 1.0
+    cumulus.bulk_apply(item, journal=cumulus_journal.Journal(path))
+    assert [e['state'] for e in cumulus_journal.Journal(path).entries()] \
+        == ['failed']
+
+    arm.arm.failure_rate = 0.0
+    deletes = arm.arm.requests['DELETE']
+    cumulus.bulk_apply(item, journal=cumulus_journal.Journal(path))
+
+    assert arm.arm.requests['DELETE'] == deletes + 1
+    entries = cumulus_journal.Journal(path).entries()
+    assert [e['state'] for e in entries] == ['done']
+    assert cumulus.get_route_tables('rg', 'rt') is None
+
+
+def test_restarted_operations_are_journaled(arm, tmp_path, monkeypatch):
+    cumulus.retry_policy = cumulus_retry.RetryPolicy(base=0.01, maximum=0.05)
+    path = str(tmp_path / 'journal')
+    polls = []
+    submitted = cumulus_journal.Journal.submitted
+
+    def recording(journal, key, digest, model, handle):
+        # The first operation fails; the one the restart sends does not.
+        arm.arm.failure_rate = 0.0
+        polls.append(cumulus_journal._poll_urls(handle))
+        submitted(journal, key, digest, model, handle)
+
+    monkeypatch.setattr(cumulus_journal.Journal, 'submitted', recording)
+    arm.arm.failure_rate = 1.0
+    cumulus.bulk_apply(_ips(1), journal=cumulus_journal.Journal(path))
+
+    assert len(polls) == 2 and polls[0] != polls[1]
+    with open(path) as journal:
+        records = [json.loads(line) for line in journal]
+    assert [r['state'] for r in records] \
+        == ['intent', 'submitted', 'submitted', 'done']
+    assert records[2]['poll'] == polls[1]
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = str(tmp_path / 'journal')
+    journal = cumulus_journal.Journal(path)
+    journal.record('a', 'done', 'x')
+    journal.close()
+    with open(path, 'a') as f:
+        f.write('{"key": "b", "sta')
+
+    assert [e['key'] for e in cumulus_journal.Journal(path).entries()] == ['a']
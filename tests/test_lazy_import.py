@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+
+import cumulus_v05 as cumulus
+
+_HEAVY = ('msrest', 'msrestazure', 'requests', 'azure.mgmt.network')
+
+
+def _loaded_after(*lines):
+    """
+    Runs lines in a fresh interpreter after importing cumulus_v05, and
+    returns which of the heavy packages it had loaded by then.
+    """
+    script = '\n'.join(
+        [
+            'import json',
+            'import sys',
+            'sys.path.insert(0, {!r})'.format(
+                os.path.dirname(cumulus.__file__)
+            ),
+            'import cumulus_v05',
+        ] + list(lines) + [
+            'print(json.dumps([m for m in {!r} if m in sys.modules]))'.format(
+                _HEAVY
+            ),
+        ]
+    )
+    output = subprocess.check_output([sys.executable, '-c', script])
+    return json.loads(output.decode('utf-8'))
+
+
+def test_importing_loads_none_of_the_sdk():
+    assert _loaded_after() == []
+
+
+def test_importing_the_infrastructure_loads_none_of_the_sdk():
+    modules = (
+        'cumulus_credentials', 'cumulus_fan_out', 'cumulus_journal',
+        'cumulus_metrics', 'cumulus_polling', 'cumulus_rate_limit',
+        'cumulus_retry', 'cumulus_tracing', 'cumulus_transport',
+    )
+
+    assert _loaded_after(*('import ' + m for m in modules)) == []
+
+
+def test_client_handles_load_the_sdk_on_first_use():
+    setup = (
+        "handle = cumulus_v05.ClientHandle(object(), 'subscription')",
+        'cumulus_v05.default_client = handle',
+    )
+
+    assert _loaded_after(*setup) == []
+    assert set(_loaded_after(*setup + ('handle.network',))) == set(_HEAVY)
+
+
+def test_lazy_modules_keep_what_they_import():
+    lazy = cumulus._LazyModule('json')
+
+    assert lazy.dumps is json.dumps
+    assert 'dumps' in vars(lazy)
@@ -0,0 +1,87 @@
+import io
+import json
+import logging
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+
+import cumulus_v05 as cumulus
+
+
+def test_queued_records_are_written_at_exit(tmp_path):
+    path = str(tmp_path / 'log')
+    script = textwrap.dedent('''
+        import logging
+        import sys
+        sys.path.insert(0, {root!r})
+        import cumulus_v05 as cumulus
+        sink = cumulus.LogSink(stream=open({path!r}, 'w'))
+        for i in range(5000):
+            sink.emit(logging.INFO, 'record', i=i)
+    ''').format(root=os.path.dirname(cumulus.__file__), path=path)
+
+    subprocess.check_call([sys.executable, '-c', script])
+
+    with open(path) as log:
+        assert len(log.readlines()) == 5000
+
+
+def _sink(**kwargs):
+    return cumulus.LogSink(stream=io.StringIO(), **kwargs)
+
+
+def test_records_below_the_level_are_not_queued():
+    sink = _sink(level=logging.WARNING)
+
+    assert not sink.emit(logging.INFO, 'skipped')
+    assert sink.emit(logging.ERROR, 'kept', status=500)
+    sink.flush()
+
+    line, = sink.stream.getvalue().splitlines()
+    assert line.split()[1:] == ['ERROR', 'kept', 'status=500']
+
+
+def test_only_records_below_warning_are_sampled():
+    sink = _sink(sample_rate=0.0)
+
+    for _ in range(10):
+        sink.emit(logging.INFO, 'sampled')
+    sink.emit(logging.WARNING, 'kept')
+    sink.flush()
+
+    assert sink.sampled_out == 10
+    assert len(sink.stream.getvalue().splitlines()) == 1
+
+
+def test_json_lines():
+    sink = _sink(json_lines=True)
+
+    sink.emit(logging.INFO, 'event', id='/x', missing=None)
+    sink.flush()
+
+    record = json.loads(sink.stream.getvalue())
+    assert (record['level'], record['event'], record['id']) \
+        == ('INFO', 'event', '/x')
+
+
+def test_a_full_queue_drops_records_instead_of_blocking():
+    stream = io.StringIO()
+    written = threading.Event()
+    write = stream.write
+
+    def slow_write(text):
+        written.wait()
+        return write(text)
+
+    stream.write = slow_write
+    sink = cumulus.LogSink(stream=stream, max_queued=5)
+
+    kept = sum(sink.emit(logging.INFO, 'r', i=i) for i in range(50))
+    written.set()
+    sink.flush()
+
+    assert kept + sink.dropped == 50
+    assert sink.dropped > 0
+    assert len(stream.getvalue().splitlines()) == kept
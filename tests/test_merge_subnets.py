@@ -0,0 +1,103 @@
+from azure.mgmt.network.models import AddressSpace, Subnet, VirtualNetwork
+
+import cumulus_journal
+import cumulus_v05 as cumulus
+
+
+def _vnet():
+    cumulus.create_update_virtual_networks(
+        'rg',
+        'vnet',
+        VirtualNetwork(
+            location='eastus',
+            address_space=AddressSpace(address_prefixes=['10.0.0.0/16']),
+            subnets=[Subnet(name='keep', address_prefix='10.0.255.0/24')]
+        )
+    )
+
+
+def _subnets(count, start=0):
+    return [
+        Subnet(name='s{}'.format(i), address_prefix='10.0.{}.0/24'.format(i))
+        for i in range(start, start + count)
+    ]
+
+
+def _names():
+    vnet = cumulus.get_virtual_networks('rg', 'vnet')
+    return {subnet.name for subnet in vnet.subnets}
+
+
+def test_subnets_are_merged_with_one_put(arm):
+    _vnet()
+    puts = arm.arm.requests['PUT']
+
+    cumulus.merge_subnets('rg', 'vnet', _subnets(10))
+
+    assert arm.arm.requests['PUT'] == puts + 1
+    assert _names() == {'keep'} | {'s{}'.format(i) for i in range(10)}
+
+
+def test_a_write_in_between_is_merged_again(arm, monkeypatch):
+    _vnet()
+    read = cumulus._read
+    raced = []
+
+    def racing(method, *args, **kwargs):
+        result = read(method, *args, **kwargs)
+        if not raced:
+            raced.append(True)
+            cumulus.create_update_subnets(
+                'rg', 'vnet', 'racer', Subnet(address_prefix='10.0.200.0/24')
+            )
+        return result
+
+    monkeypatch.setattr(cumulus, '_read', racing)
+    puts = arm.arm.requests['PUT']
+    cumulus.merge_subnets('rg', 'vnet', _subnets(1))
+
+    # The racer's PUT, the PUT that failed with 412, and the one that won.
+    assert arm.arm.requests['PUT'] == puts + 3
+    assert _names() == {'keep', 'racer', 's0'}
+
+
+def test_bulk_apply_serializes_it_with_subnet_writes(arm):
+    _vnet()
+    items = [(cumulus.merge_subnets, ('rg', 'vnet', _subnets(4)))]
+    items += [
+        (cumulus.create_update_subnets, ('rg', 'vnet', subnet.name, subnet))
+        for subnet in _subnets(4, start=4)
+    ]
+    puts = arm.arm.requests['PUT']
+
+    results = cumulus.bulk_apply(items, max_workers=8)
+
+    assert all(r.result is not None and r.error is None for r in results)
+    # Run side by side, the subnet writes would be refused while the vnet
+    # is being written, and the merge would fail on their etag changes.
+    assert arm.arm.requests['PUT'] == puts + 5
+    assert _names() == {'keep'} | {'s{}'.format(i) for i in range(8)}
+
+
+def test_it_is_journaled(arm, tmp_path):
+    _vnet()
+    path = str(tmp_path / 'journal')
+    items = [(cumulus.merge_subnets, ('rg', 'vnet', _subnets(4)))]
+    cumulus.bulk_apply(items, journal=cumulus_journal.Journal(path))
+    puts = arm.arm.requests['PUT']
+
+    journal = cumulus_journal.Journal(path)
+    results = cumulus.bulk_apply(items, journal=journal)
+
+    assert len(journal.entries('done')) == 1
+    assert arm.arm.requests['PUT'] == puts
+    assert results[0].result['state'] == 'done'
+
+
+def test_parameters_come_in_the_order_of_the_other_wrappers(arm):
+    _vnet()
+    headers = {'x-ms-client-request-id': 'merge'}
+
+    handle = cumulus.merge_subnets('rg', 'vnet', _subnets(1), headers, True)
+
+    assert handle.result().response.status_code == 200
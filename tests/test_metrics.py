@@ -0,0 +1,78 @@
+import json
+
+from azure.mgmt.network.models import RouteTable
+
+import cumulus_metrics
+import cumulus_v05 as cumulus
+
+
+def _histograms(name):
+    return {
+        (h['resource_type'], h['operation']): h
+        for h in cumulus.metrics.to_dict()['histograms']
+        if h['name'] == name
+    }
+
+
+def test_histogram_percentiles_are_within_its_precision():
+    histogram = cumulus_metrics.Histogram(unit=1e-6)
+    for i in range(1, 1001):
+        histogram.record(i / 1000.0)
+
+    assert histogram.count == 1000
+    assert (histogram.min, histogram.max) == (0.001, 1.0)
+    for p, exact in ((50, 0.5), (90, 0.9), (99, 0.99)):
+        assert exact <= histogram.percentile(p) <= exact * 1.016
+    assert len(histogram.buckets()) < 1000
+
+
+def test_every_call_and_operation_is_timed(arm):
+    cumulus.metrics = cumulus_metrics.Metrics()
+
+    cumulus.create_update_route_tables(
+        'rg', 'rt', RouteTable(location='eastus')
+    )
+    cumulus.get_route_tables('rg', 'rt')
+
+    requests = _histograms('request_seconds')
+    assert requests[('route_tables', 'create_or_update')]['count'] == 1
+    assert requests[('route_tables', 'get')]['count'] == 1
+    operations = _histograms('operation_seconds')
+    assert operations[('route_tables', 'create_or_update')]['min'] >= 0.2
+    polls = _histograms('polls')[('route_tables', 'create_or_update')]
+    assert polls['max'] >= 1
+
+
+def test_errors_are_counted_by_class_and_status(arm):
+    cumulus.metrics = cumulus_metrics.Metrics()
+    arm.arm.failure_rate = 1.0
+
+    cumulus.create_update_route_tables(
+        'rg', 'rt', RouteTable(location='eastus')
+    )
+    cumulus.get_route_tables('rg', 'missing')
+
+    errors = {
+        (e['operation'], e['status']): e['count']
+        for e in cumulus.metrics.to_dict()['errors']
+    }
+    assert errors[('get', '404')] == 1
+    assert sum(errors.values()) == 2
+
+
+def test_nothing_is_recorded_without_metrics(arm):
+    cumulus.get_route_tables('rg', 'missing')
+
+    assert cumulus.metrics is None
+
+
+def test_export_is_json(arm):
+    cumulus.metrics = cumulus_metrics.Metrics()
+    cumulus.get_route_tables('rg', 'missing')
+
+    exported = json.loads(cumulus.metrics.to_json())
+
+    assert exported['errors'][0]['count'] == 1
+    cumulus.metrics.reset()
+    assert cumulus.metrics.to_dict() == {'histograms': [], 'errors': []}
+
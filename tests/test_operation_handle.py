@@ -0,0 +1,77 @@
+import pytest
+from azure.mgmt.network.models import RouteTable
+
+import cumulus_v05 as cumulus
+
+
+def _route_table(**kwargs):
+    return cumulus.create_update_route_tables(
+        'rg', 'rt', RouteTable(location='eastus'), **kwargs
+    )
+
+
+def test_wait_false_returns_before_the_operation_ends(arm):
+    handle = _route_table(wait=False)
+
+    assert not handle.done()
+    assert handle.status() != 'Succeeded'
+    assert handle.result(timeout=5).name == 'rt'
+    assert handle.status() == 'Succeeded'
+
+
+def test_callbacks_run_even_when_added_after_the_end(arm):
+    handle = _route_table(wait=False)
+    handle.wait()
+    called = []
+
+    handle.add_done_callback(called.append)
+
+    assert called == [handle]
+
+
+def test_deletes_return_a_handle_too(arm):
+    _route_table()
+
+    handle = cumulus.delete_route_tables('rg', 'rt', wait=False)
+    handle.wait()
+
+    assert handle.result() is None
+    assert cumulus.get_route_tables('rg', 'rt') is None
+
+
+def test_failed_operations_raise_from_the_handle(arm):
+    arm.arm.failure_rate = 1.0
+    handle = _route_table(wait=False)
+
+    with pytest.raises(cumulus.azure_exceptions.CloudError):
+        handle.wait()
+    assert isinstance(
+        handle.exception(), cumulus.azure_exceptions.CloudError
+    )
+
+
+class _FinishedPoller(object):
+    """
+    AzureOperationPoller of an operation that ended with its initial
+    response, which refuses done callbacks the way the SDK's does.
+    """
+
+    def __init__(self, error):
+        self.error = error
+        self._response = None
+
+    def add_done_callback(self, func):
+        raise ValueError('Process is complete.')
+
+    def result(self, timeout=None):
+        raise self.error
+
+
+def test_operations_that_failed_at_once_fail_the_handle():
+    error = RuntimeError('failed')
+
+    handle = cumulus.OperationHandle(_FinishedPoller(error))
+
+    assert handle.exception() is error
+    with pytest.raises(RuntimeError):
+        handle.result()
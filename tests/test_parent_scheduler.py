@@ -0,0 +1,85 @@
+import threading
+import time
+
+from azure.mgmt.network.models import AddressSpace, Subnet, VirtualNetwork
+
+import cumulus_v05 as cumulus
+
+
+def _recorder():
+    """
+    Returns a call for ParentScheduler.submit that notes when each subnet
+    write starts and ends, and the list it notes them in.
+    """
+    events = []
+    lock = threading.Lock()
+
+    def call(operation, args, kwargs):
+        with lock:
+            events.append(('start', args[1], args[2]))
+        time.sleep(0.05)
+        with lock:
+            events.append(('end', args[1], args[2]))
+        return args[2]
+
+    return call, events
+
+
+def _subnet_args(vnet, name):
+    return ('rg', vnet, name, Subnet(address_prefix='10.0.0.0/24'))
+
+
+def test_writes_under_one_parent_run_one_at_a_time_in_order():
+    call, events = _recorder()
+
+    with cumulus.ParentScheduler(max_workers=4) as scheduler:
+        results = [
+            scheduler.submit(
+                call, cumulus.create_update_subnets,
+                _subnet_args('vnet', name), {}
+            )
+            for name in 'abcd'
+        ]
+
+    assert [future.result() for future in results] == list('abcd')
+    assert events == [
+        (event, 'vnet', name) for name in 'abcd' for event in ('start', 'end')
+    ]
+
+
+def test_writes_under_different_parents_run_side_by_side():
+    call, events = _recorder()
+
+    with cumulus.ParentScheduler(max_workers=4) as scheduler:
+        for vnet in ('one', 'two'):
+            scheduler.submit(
+                call, cumulus.create_update_subnets,
+                _subnet_args(vnet, 'a'), {}
+            )
+
+    assert [event for event, _, _ in events] \
+        == ['start', 'start', 'end', 'end']
+
+
+def test_subnet_writes_are_not_refused_by_their_vnet(arm):
+    cumulus.create_update_virtual_networks(
+        'rg',
+        'vnet',
+        VirtualNetwork(
+            location='eastus',
+            address_space=AddressSpace(address_prefixes=['10.0.0.0/16'])
+        )
+    )
+    items = [
+        (cumulus.create_update_subnets,
+         ('rg', 'vnet', 's{}'.format(i),
+          Subnet(address_prefix='10.0.{}.0/24'.format(i))))
+        for i in range(6)
+    ]
+    puts = arm.arm.requests['PUT']
+
+    results = cumulus.bulk_apply(items, max_workers=6)
+
+    assert all(r.error is None for r in results)
+    # No write was refused with AnotherOperationInProgress and retried.
+    assert arm.arm.requests['PUT'] == puts + len(items)
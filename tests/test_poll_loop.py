@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+from azure.mgmt.network.models import PublicIPAddress
+
+import cumulus_polling
+import cumulus_v05 as cumulus
+
+
+def _ips(count, **kwargs):
+    return [
+        cumulus.create_update_public_ip_addresses(
+            'rg',
+            'ip{}'.format(i),
+            PublicIPAddress(location='eastus'),
+            wait=False,
+            **kwargs
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def poll_loop(arm):
+    cumulus.poll_loop = cumulus_polling.PollLoop(max_polls_per_second=50)
+    yield cumulus.poll_loop
+    cumulus.poll_loop.stop()
+
+
+def _poll_loops():
+    return [t.name for t in threading.enumerate()].count('PollLoop')
+
+
+def test_one_thread_polls_every_operation(arm, poll_loop):
+    before = _poll_loops()
+
+    handles = _ips(20)
+
+    # The SDK would start one AzureOperationPoller thread per operation.
+    assert all(h.poller is None for h in handles)
+    assert _poll_loops() == before + 1
+    assert [h.result(timeout=10).name for h in handles] \
+        == ['ip{}'.format(i) for i in range(20)]
+    assert len(poll_loop) == 0
+
+
+def test_status_requests_are_capped(make_arm, poll_loop):
+    arm = make_arm(lro_seconds=1.0)
+    poll_loop.max_polls_per_second = 10
+    polls = arm.arm.requests['POLL']
+    start = time.monotonic()
+
+    for handle in _ips(20):
+        handle.wait()
+
+    elapsed = time.monotonic() - start
+    assert arm.arm.requests['POLL'] - polls <= 10 * elapsed + 1
+
+
+def test_failed_operations_resolve_with_an_error(arm, poll_loop):
+    arm.arm.failure_rate = 1.0
+
+    handle = _ips(1)[0]
+
+    with pytest.raises(cumulus.azure_exceptions.CloudError):
+        handle.wait(timeout=10)
+
+
+def test_raw_resolves_to_the_final_response(arm, poll_loop):
+    handle = _ips(1, raw=True)[0]
+
+    result = handle.result(timeout=10)
+
+    assert isinstance(result, cumulus.pipeline.ClientRawResponse)
+    assert result.output.name == 'ip0'
+    assert result.response.status_code == 200
@@ -0,0 +1,111 @@
+import email.utils
+import multiprocessing
+
+from azure.mgmt.network.models import RouteTable
+
+import cumulus_polling
+import cumulus_v05 as cumulus
+
+
+class _Response(object):
+
+    def __init__(self, headers):
+        self.headers = headers
+
+
+def test_waits_grow_up_to_the_maximum():
+    policy = cumulus_polling.PollingPolicy(1, 10, jitter=0)
+
+    assert [policy.delay(n) for n in range(5)] == [1, 2, 4, 8, 10]
+
+
+def test_jitter_only_shortens_the_wait():
+    policy = cumulus_polling.PollingPolicy(4, 10, jitter=0.25)
+
+    delays = [policy.delay(0) for _ in range(100)]
+
+    assert all(3 <= d <= 4 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_retry_after_can_only_lengthen_the_wait():
+    policy = cumulus_polling.PollingPolicy(4, 10, jitter=0)
+
+    assert policy.delay(0, retry_after=30) == 30
+    assert policy.delay(0, retry_after=1) == 4
+
+
+def test_each_resource_type_has_its_own_policy(arm):
+    network = cumulus.network_client
+
+    assert cumulus_polling.polling_policy(network.routes) \
+        is cumulus_polling.POLLING_PROFILES['routes']
+    assert cumulus_polling.polling_policy(network.virtual_network_gateways) \
+        is cumulus_polling.POLLING_PROFILES['virtual_network_gateways']
+    assert cumulus_polling.polling_policy(network.usages) \
+        is cumulus_polling.DEFAULT_POLLING_POLICY
+
+
+def test_retry_after_reads_seconds_and_dates():
+    date = email.utils.formatdate(usegmt=True)
+
+    assert cumulus.retry_after(_Response({'retry-after': '7'})) == 7.0
+    assert 0 <= cumulus.retry_after(_Response({'retry-after': date})) <= 1
+    assert cumulus.retry_after(_Response({'retry-after': 'soon'})) is None
+    assert cumulus.retry_after(_Response({})) is None
+    assert cumulus.retry_after(None) is None
+
+
+def test_slow_types_are_polled_less_often(make_arm, monkeypatch):
+    arm = make_arm(lro_seconds=1.0)
+
+    def polls(name):
+        before = arm.arm.requests['POLL']
+        cumulus.create_update_route_tables(
+            'rg', name, RouteTable(location='eastus')
+        )
+        return arm.arm.requests['POLL'] - before
+
+    fast = polls('fast')
+    monkeypatch.setitem(
+        cumulus_polling.POLLING_PROFILES,
+        'route_tables',
+        cumulus_polling.PollingPolicy(0.5, 1)
+    )
+    slow = polls('slow')
+
+    assert slow < fast
+
+
+def test_every_wrapper_backs_off_without_a_poll_loop(make_arm, monkeypatch):
+    arm = make_arm(lro_seconds=1.5)
+    monkeypatch.setitem(
+        cumulus_polling.POLLING_PROFILES, 'route_tables',
+        cumulus_polling.PollingPolicy(0.05, 0.8, jitter=0)
+    )
+    polls = arm.arm.requests['POLL']
+
+    handle = cumulus.create_update_route_tables(
+        'rg', 'rt', RouteTable(location='eastus')
+    )
+
+    assert cumulus.poll_loop is None
+    assert handle.poller is None
+    # Waits of 0.05, 0.1, 0.2, 0.4, 0.8, 0.8: polling every 0.05 seconds
+    # would have taken 30 checks.
+    assert arm.arm.requests['POLL'] - polls <= 7
+
+
+def _create_route_table(name):
+    return cumulus.create_update_route_tables(
+        'rg', name, RouteTable(location='eastus')
+    ).result(timeout=10).name
+
+
+def test_forked_processes_poll_with_their_own_loop(arm):
+    _create_route_table('parent')
+
+    with multiprocessing.get_context('fork').Pool(1) as pool:
+        name = pool.apply(_create_route_table, ('child',))
+
+    assert name == 'child'
@@ -0,0 +1,95 @@
+import time
+
+import cumulus_rate_limit
+import cumulus_v05 as cumulus
+import fake_arm
+
+_URL = 'https://management.azure.com/subscriptions/{}/resourceGroups/rg' \
+    .format(fake_arm.DEFAULT_SUBSCRIPTION)
+
+
+class _Response(object):
+
+    def __init__(self, status_code=200, **headers):
+        self.status_code = status_code
+        self.headers = {k.replace('_', '-'): v for k, v in headers.items()}
+
+
+def _reads(limiter):
+    return limiter.stats()[fake_arm.DEFAULT_SUBSCRIPTION + ' reads']
+
+
+def test_requests_outside_a_subscription_are_not_paced():
+    limiter = cumulus_rate_limit.RateLimiter()
+
+    assert limiter.acquire('GET', 'https://login.example/token') is None
+    assert limiter.try_acquire('GET', 'https://login.example/token') \
+        == (None, 0)
+    assert limiter.stats() == {}
+
+
+def test_requests_wait_for_a_token_once_the_bucket_is_empty():
+    limiter = cumulus_rate_limit.RateLimiter(reads=10, window=1)
+    for _ in range(10):
+        limiter.release(limiter.acquire('GET', _URL))
+
+    start = time.monotonic()
+    limiter.release(limiter.acquire('GET', _URL))
+
+    assert time.monotonic() - start >= 0.05
+    assert _reads(limiter)['waits'] == 1
+
+
+def test_reads_and_writes_have_separate_buckets():
+    limiter = cumulus_rate_limit.RateLimiter(reads=1, writes=1, window=3600)
+    limiter.release(limiter.acquire('GET', _URL))
+
+    bucket, delay = limiter.try_acquire('PUT', _URL)
+
+    assert bucket is not None and delay == 0
+    assert limiter.try_acquire('GET', _URL)[0] is None
+
+
+def test_the_bucket_follows_the_remaining_count_arm_reports():
+    limiter = cumulus_rate_limit.RateLimiter(reads=100, window=3600)
+    held = limiter.acquire('GET', _URL)
+    bucket = limiter.acquire('GET', _URL)
+
+    limiter.release(bucket, _Response(
+        x_ms_ratelimit_remaining_subscription_reads='40'
+    ))
+
+    stats = _reads(limiter)
+    assert stats['remaining'] == 40
+    assert 39 <= stats['tokens'] < 39.1
+    assert stats['in_flight'] == 1
+    limiter.release(held)
+
+
+def test_a_429_blocks_the_bucket_until_retry_after():
+    limiter = cumulus_rate_limit.RateLimiter()
+    bucket = limiter.acquire('GET', _URL)
+
+    limiter.release(bucket, _Response(429, retry_after='2'))
+
+    bucket, delay = limiter.try_acquire('GET', _URL)
+    assert bucket is None and 1.9 < delay <= 2
+    assert _reads(limiter)['throttled'] == 1
+
+
+def test_the_reserve_is_left_for_other_clients():
+    limiter = cumulus_rate_limit.RateLimiter(reads=3, window=3600, reserve=2)
+
+    assert limiter.try_acquire('GET', _URL)[0] is not None
+    assert limiter.try_acquire('GET', _URL)[0] is None
+
+
+def test_attached_clients_are_paced(arm):
+    cumulus.rate_limiter = cumulus_rate_limit.RateLimiter()
+
+    cumulus.get_resource_group('rg')
+    cumulus.get_resource_group('rg')
+
+    stats = _reads(cumulus.rate_limiter)
+    assert stats['remaining'] == arm.arm.read_limit - 2
+    assert stats['in_flight'] == 0
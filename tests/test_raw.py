@@ -0,0 +1,67 @@
+from azure.mgmt.network.models import AddressSpace, Subnet, VirtualNetwork
+
+import cumulus_v05 as cumulus
+
+
+def _vnet(**kwargs):
+    return cumulus.create_update_virtual_networks(
+        'rg',
+        'vnet',
+        VirtualNetwork(
+            location='eastus',
+            address_space=AddressSpace(address_prefixes=['10.0.0.0/16']),
+            subnets=[Subnet(name='a', address_prefix='10.0.0.0/24')]
+        ),
+        **kwargs
+    )
+
+
+def test_raw_writes_resolve_to_the_final_response(arm):
+    result = _vnet(raw=True).result()
+
+    assert isinstance(result, cumulus.pipeline.ClientRawResponse)
+    assert result.output.provisioning_state == 'Succeeded'
+    assert result.response.json()['properties']['provisioningState'] \
+        == 'Succeeded'
+
+
+def test_custom_headers_reach_the_service(arm):
+    _vnet()
+
+    result = _vnet(custom_headers={'If-Match': 'W/"stale"'})
+
+    # The wrappers log and swallow the 412 Precondition Failed.
+    assert result is None
+
+
+def test_json_reads_skip_the_models(arm):
+    _vnet()
+
+    vnet = cumulus.get_virtual_networks('rg', 'vnet', raw='json')
+
+    assert isinstance(vnet, cumulus.RawResource)
+    assert vnet.id.endswith('/virtualNetworks/vnet')
+    assert vnet['properties']['subnets'][0]['name'] == 'a'
+    assert cumulus.get_virtual_networks('rg', 'missing', raw='json') is None
+
+
+def test_json_reads_are_not_cached(arm):
+    _vnet()
+    cumulus.read_cache = cumulus.ReadCache()
+    cumulus.get_virtual_networks('rg', 'vnet', raw='json')
+    gets = arm.arm.requests['GET']
+
+    cumulus.get_virtual_networks('rg', 'vnet', raw='json')
+
+    assert arm.arm.requests['GET'] == gets + 1
+
+
+def test_json_inventory_holds_views_of_embedded_children(arm):
+    _vnet()
+
+    inventory = cumulus.take_inventory(raw='json')
+
+    subnet = inventory.get('subnets', 'rg', 'vnet', 'a')
+    assert isinstance(subnet, cumulus.RawResource)
+    assert subnet['properties']['addressPrefix'] == '10.0.0.0/24'
+    assert subnet.id.lower().endswith('/subnets/a')
@@ -0,0 +1,65 @@
+from azure.mgmt.network.models import AddressSpace, Subnet, VirtualNetwork
+
+import cumulus_v05 as cumulus
+
+
+def _vnet(arm):
+    cumulus.create_update_virtual_networks(
+        'rg',
+        'vnet',
+        VirtualNetwork(
+            location='eastus',
+            address_space=AddressSpace(address_prefixes=['10.0.0.0/16']),
+            subnets=[Subnet(name='a', address_prefix='10.0.0.0/24')]
+        )
+    )
+
+
+def test_hits_are_served_without_a_request(arm):
+    _vnet(arm)
+    cumulus.read_cache = cumulus.ReadCache()
+    cumulus.get_virtual_networks('rg', 'vnet')
+    gets = arm.arm.requests['GET']
+
+    vnet = cumulus.get_virtual_networks('rg', 'vnet')
+
+    assert vnet.name == 'vnet'
+    assert arm.arm.requests['GET'] == gets
+    assert cumulus.read_cache.hits == 1
+
+
+def test_changing_a_result_does_not_change_the_cache(arm):
+    _vnet(arm)
+    cumulus.read_cache = cumulus.ReadCache()
+    first = cumulus.get_virtual_networks('rg', 'vnet')
+    first.subnets = []
+    second = cumulus.get_virtual_networks('rg', 'vnet')
+    second.subnets[0].address_prefix = '10.0.9.0/24'
+
+    third = cumulus.get_virtual_networks('rg', 'vnet')
+
+    assert [s.address_prefix for s in third.subnets] == ['10.0.0.0/24']
+
+
+def test_expired_entries_are_revalidated_by_etag(arm):
+    _vnet(arm)
+    cumulus.read_cache = cumulus.ReadCache(ttl=0)
+    cumulus.get_virtual_networks('rg', 'vnet')
+
+    vnet = cumulus.get_virtual_networks('rg', 'vnet')
+
+    assert vnet.name == 'vnet'
+    assert cumulus.read_cache.revalidations == 1
+
+
+def test_child_writes_drop_the_parent(arm):
+    _vnet(arm)
+    cumulus.read_cache = cumulus.ReadCache()
+    cumulus.get_virtual_networks('rg', 'vnet')
+
+    cumulus.create_update_subnets(
+        'rg', 'vnet', 'b', Subnet(address_prefix='10.0.1.0/24')
+    )
+    vnet = cumulus.get_virtual_networks('rg', 'vnet')
+
+    assert sorted(s.name for s in vnet.subnets) == ['a', 'b']
@@ -0,0 +1,118 @@
+import itertools
+import time
+
+import pytest
+from azure.mgmt.network.models import PublicIPAddress
+
+import cumulus_retry
+import cumulus_v05 as cumulus
+import fake_arm
+
+
+def _ip(name='ip'):
+    return cumulus.create_update_public_ip_addresses(
+        'rg', name, PublicIPAddress(location='eastus')
+    )
+
+
+class _Rolls(object):
+    """
+    Stands in for the random module of fake_arm: the first two requests
+    are answered with 500, and the rest are not.
+    """
+
+    def __init__(self):
+        rolls = itertools.chain([0.0, 0.0], itertools.repeat(0.9))
+        self.random = rolls.__next__
+
+
+def test_failed_requests_are_retried(arm, monkeypatch):
+    arm.arm.error_rate = 0.5
+    monkeypatch.setattr(fake_arm, 'random', _Rolls())
+    cumulus.retry_policy = cumulus_retry.RetryPolicy(base=0.01, maximum=0.05)
+
+    results = [_ip('ip{}'.format(i)) for i in range(10)]
+
+    assert all(result is not None for result in results)
+    assert cumulus.retry_policy.stats()['retries']['transient'] == 2
+
+
+def test_sdk_retries_come_back_when_it_is_unset(arm):
+    policy = cumulus.network_client.config.retry_policy.policy
+    statuses = policy.status_forcelist
+    cumulus.retry_policy = cumulus_retry.RetryPolicy()
+    _ip()
+    assert not policy.status_forcelist
+    assert not policy.respect_retry_after_header
+
+    cumulus.retry_policy = None
+    _ip()
+
+    assert policy.status_forcelist == statuses
+    assert policy.respect_retry_after_header
+
+
+def test_detach_restores_what_attach_turned_off(arm):
+    client = cumulus.network_client
+    policy = client.config.retry_policy.policy
+    statuses = policy.status_forcelist
+    retry_policy = cumulus_retry.RetryPolicy()
+    retry_policy.attach(client)
+    retry_policy.attach(client)
+
+    retry_policy.detach(client)
+
+    assert policy.status_forcelist == statuses
+    assert policy.respect_retry_after_header
+
+
+def test_calls_give_up_after_their_attempts(arm):
+    cumulus.retry_policy = cumulus_retry.RetryPolicy(
+        attempts=3, base=0.01, maximum=0.05
+    )
+    arm.arm.error_rate = 1.0
+    gets = arm.arm.requests['GET']
+
+    assert cumulus.get_route_tables('rg', 'rt') is None
+
+    assert arm.arm.requests['GET'] - gets == 3
+    assert cumulus.retry_policy.stats()['exhausted'] == 1
+
+
+def test_an_empty_budget_stops_the_retries(arm):
+    cumulus.retry_policy = cumulus_retry.RetryPolicy(
+        base=0.01, maximum=0.05, budget=2, budget_ratio=0
+    )
+    arm.arm.error_rate = 1.0
+    gets = arm.arm.requests['GET']
+
+    cumulus.get_route_tables('rg', 'a')
+    cumulus.get_route_tables('rg', 'b')
+
+    assert arm.arm.requests['GET'] - gets == 4
+    stats = cumulus.retry_policy.stats()
+    assert (stats['denied'], stats['budget']) == (2, 0)
+
+
+def test_permanent_errors_are_not_retried(arm):
+    cumulus.retry_policy = cumulus_retry.RetryPolicy(base=0.01, maximum=0.05)
+    gets = arm.arm.requests['GET']
+
+    assert cumulus.get_route_tables('rg', 'missing') is None
+
+    assert arm.arm.requests['GET'] - gets == 1
+    assert cumulus.retry_policy.stats()['retries'] == {}
+
+
+def test_retries_wait_at_least_retry_after(make_arm):
+    arm = make_arm(throttle_rate=0.5)
+    cumulus.retry_policy = cumulus_retry.RetryPolicy(base=0.01, maximum=0.05)
+    arm.arm.throttle_rate = 0.5
+    start = time.monotonic()
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(fake_arm, 'random', _Rolls())
+        _ip()
+
+    assert time.monotonic() - start >= 2
+    assert cumulus.retry_policy.stats()['retries'] == {'throttled': 2}
@@ -0,0 +1,104 @@
+import os
+import stat
+import subprocess
+import sys
+import time
+
+import cumulus_credentials
+import cumulus_v05 as cumulus
+
+
+def _token(ttl=3600, value='token'):
+    return {'access_token': value, 'expires_on': time.time() + ttl}
+
+
+class _Fetch(object):
+    """
+    Stands in for Azure AD, handing out numbered tokens.
+    """
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return _token(self.ttl, 'token{}'.format(self.calls))
+
+
+def test_tokens_are_fetched_once_and_then_read(tmp_path):
+    cache = cumulus_credentials.TokenCache(str(tmp_path))
+    fetch = _Fetch()
+
+    first = cache.get('name', 'secret', fetch)
+    other = cumulus_credentials.TokenCache(str(tmp_path))
+    again = other.get('name', 'secret', fetch)
+
+    assert fetch.calls == 1
+    assert again['access_token'] == first['access_token'] == 'token1'
+    assert (cache.fetches, cache.hits) == (1, 0)
+
+
+def test_stale_tokens_are_fetched_again(tmp_path):
+    cache = cumulus_credentials.TokenCache(str(tmp_path))
+    fetch = _Fetch(ttl=30)
+
+    cache.get('name', 'secret', fetch)
+    token = cache.get('name', 'secret', fetch)
+
+    assert fetch.calls == 2
+    assert token['access_token'] == 'token2'
+
+
+def test_files_are_private_and_bound_to_the_secret(tmp_path):
+    cache = cumulus_credentials.TokenCache(str(tmp_path))
+    fetch = _Fetch()
+    cache.get('name', 'secret', fetch)
+
+    path, = [os.path.join(str(tmp_path), f) for f in os.listdir(str(tmp_path))
+             if not f.endswith('.lock')]
+    with open(path, 'rb') as f:
+        assert b'token1' not in f.read()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert cache.get('name', 'other secret', fetch)['access_token'] \
+        == 'token2'
+
+
+def test_processes_share_the_cache(tmp_path):
+    cache = cumulus_credentials.TokenCache(str(tmp_path))
+    cache.get('name', 'secret', _Fetch())
+    script = '\n'.join([
+        'import sys',
+        'sys.path.insert(0, {!r})'.format(os.path.dirname(cumulus.__file__)),
+        'import cumulus_credentials',
+        'def fetch():',
+        '    raise SystemExit("fetched")',
+        'cache = cumulus_credentials.TokenCache({!r})'.format(str(tmp_path)),
+        'print(cache.get("name", "secret", fetch)["access_token"])',
+    ])
+
+    output = subprocess.check_output([sys.executable, '-c', script])
+
+    assert output.decode('utf-8').strip() == 'token1'
+
+
+def test_credentials_fetch_on_first_request_only(tmp_path, monkeypatch):
+    fetch = _Fetch()
+    monkeypatch.setattr(
+        cumulus_credentials.CachedServicePrincipalCredentials, '_fetch',
+        lambda self: fetch()
+    )
+
+    credentials = cumulus_credentials.CachedServicePrincipalCredentials(
+        'client',
+        'secret',
+        'tenant',
+        cache=cumulus_credentials.TokenCache(str(tmp_path))
+    )
+    assert fetch.calls == 0
+    session = credentials.signed_session()
+    credentials.signed_session()
+    credentials.close()
+
+    assert fetch.calls == 1
+    assert session.headers['Authorization'] == 'Bearer token1'
@@ -0,0 +1,120 @@
+import functools
+
+from azure.mgmt.network.models import (
+    AddressSpace,
+    RouteTable,
+    Subnet,
+    VirtualNetwork,
+)
+
+import cumulus_v05 as cumulus
+
+_RT_ID = (
+    '/subscriptions/00000000-0000-0000-0000-000000000000/resourceGroups/rg'
+    '/providers/Microsoft.Network/routeTables/rt'
+)
+
+
+def _vnet_item():
+    return (
+        cumulus.create_update_virtual_networks,
+        (
+            'rg',
+            'vnet',
+            VirtualNetwork(
+                location='eastus',
+                address_space=AddressSpace(address_prefixes=['10.0.0.0/16'])
+            )
+        )
+    )
+
+
+def _subnet_item(name, route_table=False, operation=None):
+    subnet = Subnet(address_prefix='10.0.{}.0/24'.format(len(name)))
+    if route_table:
+        subnet.route_table = RouteTable(id=_RT_ID)
+    return (
+        operation or cumulus.create_update_subnets,
+        ('rg', 'vnet', name, subnet)
+    )
+
+
+def _route_table_states():
+    """
+    Returns a create_update_subnets that notes the provisioning state of
+    route table rt when it is called, and the list it notes them in.
+    """
+    states = []
+
+    @functools.wraps(cumulus.create_update_subnets)
+    def create_update_subnets(*args, **kwargs):
+        states.append(
+            cumulus.get_route_tables('rg', 'rt').provisioning_state
+        )
+        return cumulus.create_update_subnets(*args, **kwargs)
+
+    return create_update_subnets, states
+
+
+def test_items_wait_for_what_they_reference():
+    items = [
+        _subnet_item('a', route_table=True),
+        (cumulus.create_update_route_tables,
+         ('rg', 'rt', RouteTable(location='eastus'))),
+        _vnet_item(),
+    ]
+
+    layers = cumulus.plan_topology(items)
+
+    assert [[item[0] for item in layer] for layer in layers] == [
+        [cumulus.create_update_route_tables,
+         cumulus.create_update_virtual_networks],
+        [cumulus.create_update_subnets],
+    ]
+
+
+def test_dependents_of_a_failed_item_are_not_attempted(arm):
+    arm.arm.failure_rate = 1.0
+    items = [_vnet_item(), _subnet_item('a')]
+    puts = arm.arm.requests['PUT']
+
+    results = cumulus.deploy_topology(items)
+
+    assert results[0].result is None
+    assert isinstance(results[1].error, cumulus.DependencyFailed)
+    assert arm.arm.requests['PUT'] == puts + 1
+
+
+def test_wait_false_items_finish_before_their_dependents(arm):
+    cumulus.create_update_virtual_networks(*_vnet_item()[1])
+    operation, states = _route_table_states()
+    items = [
+        (cumulus.create_update_route_tables,
+         ('rg', 'rt', RouteTable(location='eastus')),
+         {'wait': False}),
+        _subnet_item('a', route_table=True, operation=operation),
+    ]
+
+    results = cumulus.deploy_topology(items)
+
+    assert states == ['Succeeded']
+    assert results[0].result.done()
+    assert results[1].result is not None
+
+
+def test_failed_wait_false_items_fail_their_dependents(arm):
+    cumulus.create_update_virtual_networks(*_vnet_item()[1])
+    arm.arm.failure_rate = 1.0
+    operation, states = _route_table_states()
+    items = [
+        (cumulus.create_update_route_tables,
+         ('rg', 'rt', RouteTable(location='eastus')),
+         {'wait': False}),
+        _subnet_item('a', route_table=True, operation=operation),
+    ]
+
+    results = cumulus.deploy_topology(items)
+
+    assert results[0].result.exception() is not None
+    assert isinstance(results[1].error, cumulus.DependencyFailed)
+    assert states == []
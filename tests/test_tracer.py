@@ -0,0 +1,83 @@
+import json
+
+from azure.mgmt.network.models import PublicIPAddress, RouteTable
+
+import cumulus_tracing
+import cumulus_v05 as cumulus
+
+
+def _spans(path):
+    cumulus.tracer.flush()
+    spans = []
+    with open(path) as f:
+        for line in f:
+            for resource in json.loads(line)['resourceSpans']:
+                for scope in resource['scopeSpans']:
+                    spans.extend(scope['spans'])
+    return spans
+
+
+def test_operations_are_traced_as_request_and_polls(arm, tmp_path):
+    path = str(tmp_path / 'trace')
+    cumulus.tracer = cumulus_tracing.Tracer(path)
+
+    cumulus.create_update_route_tables(
+        'rg', 'rt', RouteTable(location='eastus')
+    )
+
+    spans = _spans(path)
+    by_id = {span['spanId']: span for span in spans}
+    call, = [s for s in spans if s['name'] == 'route_tables.create_or_update']
+    assert call['parentSpanId'] == ''
+    assert len({span['traceId'] for span in spans}) == 1
+    children = [s for s in spans if s['parentSpanId'] == call['spanId']]
+    assert children[0]['name'] == 'HTTP PUT'
+    polls = [s for s in children if s['name'] == 'poll']
+    assert polls
+    for span in spans:
+        if span['name'] == 'HTTP GET':
+            assert by_id[span['parentSpanId']]['name'] == 'poll'
+
+
+def test_failed_calls_carry_an_error_status(arm, tmp_path):
+    path = str(tmp_path / 'trace')
+    cumulus.tracer = cumulus_tracing.Tracer(path)
+
+    cumulus.get_route_tables('rg', 'missing')
+
+    call, = [s for s in _spans(path) if s['name'] == 'route_tables.get']
+    assert call['status']['code'] == 2
+
+
+def test_bulk_items_are_linked_to_their_run(arm, tmp_path):
+    path = str(tmp_path / 'trace')
+    cumulus.tracer = cumulus_tracing.Tracer(path)
+    items = [
+        (cumulus.create_update_public_ip_addresses,
+         ('rg', 'ip{}'.format(i), PublicIPAddress(location='eastus')))
+        for i in range(3)
+    ]
+
+    cumulus.bulk_apply(items)
+
+    spans = _spans(path)
+    run, = [s for s in spans if s['name'] == 'bulk_apply']
+    items = [s for s in spans
+             if s['name'] == 'create_update_public_ip_addresses']
+    assert len(items) == 3
+    assert all(s['parentSpanId'] == run['spanId'] for s in items)
+    assert {s['traceId'] for s in spans} == {run['traceId']}
+
+
+def test_nothing_is_traced_once_the_tracer_is_unset(arm, tmp_path):
+    path = str(tmp_path / 'trace')
+    cumulus.tracer = cumulus_tracing.Tracer(path)
+    cumulus.get_route_tables('rg', 'missing')
+    traced = len(_spans(path))
+    old, cumulus.tracer = cumulus.tracer, None
+
+    for _ in range(5):
+        cumulus.get_route_tables('rg', 'missing')
+
+    cumulus.tracer = old
+    assert len(_spans(path)) == traced
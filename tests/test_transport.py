@@ -0,0 +1,49 @@
+from azure.mgmt.network.models import RouteTable
+
+import cumulus_transport
+import cumulus_v05 as cumulus
+
+
+def _route_tables(count, **kwargs):
+    for i in range(count):
+        cumulus.create_update_route_tables(
+            'rg', 'rt{}'.format(i), RouteTable(location='eastus'), **kwargs
+        )
+        cumulus.get_route_tables('rg', 'rt{}'.format(i), **kwargs)
+
+
+def test_attached_clients_reuse_connections(arm):
+    transport = cumulus_transport.Transport()
+    transport.attach(cumulus.network_client, cumulus.resource_client)
+
+    _route_tables(5)
+
+    stats = transport.stats()
+    assert stats['requests'] >= 10
+    assert stats['connections'] < stats['requests']
+    assert stats['reused'] == stats['requests'] - stats['connections']
+    assert list(stats['hosts']) == [arm.base_url]
+    transport.close()
+
+
+def test_handles_of_a_registry_share_its_transport(arm):
+    transport = cumulus_transport.Transport()
+    registry = cumulus.ClientRegistry(transport=transport)
+    handle = registry.get(
+        arm.credentials(), cumulus.network_client.config.subscription_id,
+        arm.cloud()
+    )
+
+    _route_tables(3, client=handle)
+
+    assert transport.stats()['reused'] > 0
+    transport.close()
+
+
+def test_keep_alive_off_leaves_the_pool_unused(arm):
+    transport = cumulus_transport.Transport(keep_alive=False)
+    transport.attach(cumulus.network_client)
+
+    _route_tables(2)
+
+    assert transport.stats()['requests'] == 0